@@ -0,0 +1,137 @@
+"""
+PyWebGen Assets - Third-party static files shipped with the package
+
+pywebgen/vendor/ holds the files base.html would otherwise load from CDNs,
+and vendor/manifest.json pins each one to its source URL and SHA-256. The
+generated engine/bundle.py lists the same files, rendered from this
+manifest. `pywebgen new` verifies the packaged copies and hard-links (or
+copies) them into resources/public/vendor, so generating and running a
+project needs no network.
+
+Maintainers update the packaged copies with `pywebgen assets --refresh`,
+which downloads every file concurrently and rewrites the pinned hashes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.request import urlopen
+
+
+VENDOR_ROOT = Path(__file__).parent / "vendor"
+MANIFEST_PATH = VENDOR_ROOT / "manifest.json"
+DOWNLOAD_TIMEOUT = 30
+WORKERS = 8
+
+
+class VendorError(Exception):
+    pass
+
+
+def load_manifest() -> dict[str, dict]:
+    """Relative path -> {"url": ..., "sha256": ...} for every vendored file."""
+    return json.loads(MANIFEST_PATH.read_text())
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _download(url: str, target: Path) -> None:
+    with urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        data = response.read()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".part")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(target)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link when source and target share a filesystem, copy otherwise."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _install_one(name: str, entry: dict, vendor_dir: Path, fetch: bool) -> Optional[str]:
+    """Install one file; returns a problem description, or None when it is in place and verified."""
+    source = VENDOR_ROOT / name
+    target = vendor_dir / name
+    expected = entry["sha256"]
+    
+    if source.is_file():
+        if file_sha256(source) == expected:
+            _link_or_copy(source, target)
+            return None
+        problem = f"{name}: packaged copy does not match its pinned hash"
+    else:
+        problem = f"{name}: not shipped with this pywebgen build"
+    
+    if not fetch:
+        return problem
+    
+    try:
+        _download(entry["url"], target)
+    except Exception as e:
+        return f"{problem}; download from {entry['url']} failed: {e}"
+    if file_sha256(target) != expected:
+        target.unlink()
+        return f"{problem}; downloaded copy does not match its pinned hash either"
+    return None
+
+
+def install_vendor_assets(project_path: Path, fetch: bool = False) -> list[str]:
+    """Install every vendored file into project_path/resources/public/vendor.
+    
+    A file is installed only once its SHA-256 matches the pin. Verification
+    (and, with fetch=True, downloads of files that fail it) runs on a thread
+    pool. Returns one line per file that could not be installed and
+    verified; an empty list means everything is in place.
+    """
+    vendor_dir = project_path / "resources/public/vendor"
+    manifest = load_manifest()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = pool.map(
+            lambda item: _install_one(item[0], item[1], vendor_dir, fetch), sorted(manifest.items())
+        )
+        return [problem for problem in results if problem]
+
+
+def refresh_vendor_assets(log: Callable = print) -> dict[str, dict]:
+    """Download every file into the package and pin the new hashes.
+    
+    Raises VendorError listing every failure.
+    """
+    manifest = load_manifest()
+    log(f"Downloading {len(manifest)} vendor file(s)...")
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        futures = {
+            name: pool.submit(_download, entry["url"], VENDOR_ROOT / name)
+            for name, entry in manifest.items()
+        }
+    
+    failures = []
+    for name, future in sorted(futures.items()):
+        error = future.exception()
+        if error:
+            failures.append(f"{name} ({manifest[name]['url']}): {error}")
+        else:
+            manifest[name]["sha256"] = file_sha256(VENDOR_ROOT / name)
+    
+    # Pin whatever did download, so the packaged copies and hashes never drift apart
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    if failures:
+        raise VendorError("Could not download:\n  " + "\n  ".join(failures))
+    return manifest
@@ -3,6 +3,8 @@ PyWebGen CLI - Command Line Interface
 
 Usage:
     pywebgen new <project_name> [--path .]   # Create standalone project
+    pywebgen new <project_name> --fetch-assets  # Also download vendor files that fail verification
+    pywebgen assets [--refresh]              # Check (or re-download) the packaged vendor files
     pywebgen --help                          # Show help
 
 Inside generated project:
@@ -46,7 +48,11 @@ def cli():
 @cli.command()
 @click.argument("project_name")
 @click.option("--path", default=".", help="Path where to create the project")
-def new(project_name: str, path: str):
+@click.option(
+    "--fetch-assets", is_flag=True,
+    help="Download vendor files the package does not ship or cannot verify",
+)
+def new(project_name: str, path: str, fetch_assets: bool):
     """Create a new standalone PyWebGen project"""
     from pywebgen.generator import create_project
     
@@ -57,7 +63,7 @@ def new(project_name: str, path: str):
     
     console.print(Panel(f"Creating PyWebGen project: {project_name}", style="bold blue"))
     
-    create_project(project_name, project_path)
+    create_project(project_name, project_path, fetch_assets)
     
     console.print(f"\n[green]✓ Project created successfully![/green]\n")
     console.print("Quick Start:")
@@ -75,6 +81,41 @@ def new(project_name: str, path: str):
     console.print("  - system@example.com / system (System level)")
 
 
+@cli.command()
+@click.option(
+    "--refresh", is_flag=True, help="Download every vendor file into the package and pin new hashes"
+)
+def assets(refresh: bool):
+    """Check the vendored static files shipped with pywebgen"""
+    from pywebgen.assets import (
+        VENDOR_ROOT, VendorError, file_sha256, load_manifest, refresh_vendor_assets,
+    )
+    
+    if refresh:
+        try:
+            refresh_vendor_assets(log=console.print)
+        except VendorError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            sys.exit(1)
+    
+    table = Table(title="Vendored assets")
+    table.add_column("File")
+    table.add_column("Status")
+    failed = False
+    for name, entry in sorted(load_manifest().items()):
+        path = VENDOR_ROOT / name
+        if not path.is_file():
+            status, failed = "[red]missing[/red]", True
+        elif file_sha256(path) != entry["sha256"]:
+            status, failed = "[red]hash mismatch[/red]", True
+        else:
+            status = "[green]ok[/green]"
+        table.add_row(name, status)
+    console.print(table)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     cli()
 
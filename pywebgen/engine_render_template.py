@@ -9,10 +9,17 @@ Matches the Clojure tabgrid implementation:
 5. Subgrids with DataTables for filter/sort
 """
 from typing import Optional
-import random
+
+from flask_login import current_user
+from markupsafe import escape
 
 from engine import EntityConfigManager
-from engine.query import list_records, get_record
+from engine.assets import asset_url
+from engine.events import enabled as events_enabled
+from engine.query import list_records, get_record, get_subgrid_data
+from engine.serialize import dumps
+from engine.thumbnails import thumb_url
+from engine.uploads import chunk_size, chunked_enabled
 
 
 def render_field(field, value=None) -> str:
@@ -132,20 +139,22 @@ def render_field(field, value=None) -> str:
     if field_type == "file":
         preview = ""
         if value:
-            cache_buster = random.randint(1, 10000)
             preview = f'''
             <div class="mb-2">
-                <img src="/uploads/{value}?v={cache_buster}" 
+                <img src="{thumb_url(value, 240)}" loading="lazy" 
                      alt="{value}" style="max-width: 100%; height: auto;">
                 <div class="text-muted small mt-1">{value}</div>
             </div>
             '''
         
+        # Files bigger than one chunk are sent ahead through /admin/uploads (tabgrid.js)
+        chunked = f' data-chunk-size="{chunk_size()}"' if chunked_enabled() else ""
         return f'''
         <div class="mb-3">
             <label class="form-label fw-semibold" for="{field_id}">{field_label}{required_star}</label>
             {preview}
-            <input type="file" class="form-control form-control-lg" id="{field_id}" name="{field_id}" accept="image/*">
+            <input type="file" class="form-control form-control-lg" id="{field_id}"
+                   name="{field_id}" accept="image/*"{chunked}>
         </div>
         '''
     
@@ -191,6 +200,37 @@ def render_form(entity: str, row: Optional[dict] = None, csrf_token: str = "", p
     '''
 
 
+def render_import_form(entity: str, csrf_token: str = "") -> str:
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return "<div class='alert alert-danger'>Entity not found</div>"
+    
+    columns = ", ".join(f.id for f in cfg.get_form_fields() if f.id != "id")
+    
+    return f'''
+    <form method="POST" action="/admin/{entity}/import" enctype="multipart/form-data"
+          class="needs-validation import-form" novalidate>
+        <input type="hidden" name="csrf_token" value="{csrf_token}">
+        <div class="mb-3">
+            <label class="form-label fw-semibold" for="import-file">CSV</label>
+            <input type="file" class="form-control form-control-lg" id="import-file" name="file"
+                   accept=".csv,text/csv" required>
+            <div class="form-text">{columns}</div>
+        </div>
+        <div class="import-status"></div>
+        <div class="d-flex gap-2 justify-content-end mt-4">
+            <button type="submit" class="btn btn-primary btn-lg fw-semibold shadow-sm rounded">
+                <i class="bi bi-upload me-2"></i>Import
+            </button>
+            <button type="button" data-bs-dismiss="modal" class="btn btn-outline-secondary
+                    btn-lg fw-semibold shadow-sm rounded cancel-btn">
+                <i class="bi bi-x-lg me-2"></i>Cancel
+            </button>
+        </div>
+    </form>
+    '''
+
+
 def render_subgrid_table(entity: str, parent_entity: str, subgrid, selected_id: Optional[int]) -> str:
     """Render a subgrid placeholder that will be loaded via AJAX."""
     sg_name = subgrid.entity.replace("_", "-").lower()
@@ -232,19 +272,17 @@ def render_parent_detail_vertical(entity: str, row: Optional[dict], actions: dic
         field_label = field.label
         
         if field.type == "file" and value:
-            display_value = f'<img src="/uploads/{value}" alt="{value}" style="max-width:100px;max-height:100px;border-radius:8px;">'
+            display_value = (
+                f'<img src="{thumb_url(value, 100)}" loading="lazy" alt="{value}" '
+                'style="max-width:100px;max-height:100px;border-radius:8px;">'
+            )
         elif field.type == "file":
             display_value = '<span class="text-muted">-</span>'
         elif field.type == "select" or field.type == "radio":
             # Look up label from options
             display_value = "-"
             if value:
-                for opt in field.options:
-                    if str(opt.get("value", "")) == str(value):
-                        display_value = opt.get("label", value)
-                        break
-                else:
-                    display_value = value
+                display_value = field.option_labels.get(str(value), value)
         else:
             display_value = value or "-"
         
@@ -282,6 +320,51 @@ def render_parent_detail_vertical(entity: str, row: Optional[dict], actions: dic
     '''
 
 
+def field_labels(field) -> dict:
+    """Stored value -> label for option and foreign-key fields; empty for everything else."""
+    if field.option_labels:
+        return field.option_labels
+    if field.fk:
+        options = EntityConfigManager.get_fk_options(field.fk, field.fk_id or "id", field.fk_label)
+        return {opt["value"]: opt["label"] for opt in options}
+    return {}
+
+
+def render_cell(field, value, labels: dict) -> str:
+    """
+    Grid cell content: a thumbnail for files, the label for options and
+    foreign keys, else the escaped value.
+    """
+    if field.type == "file":
+        if not value:
+            return "-"
+        style = "max-width:60px;max-height:60px;border-radius:8px;object-fit:cover;"
+        return (
+            f'<img src="{thumb_url(value, 60)}" loading="lazy" alt="{escape(value)}" '
+            f'style="{style}">'
+        )
+    if value is None or value == "":
+        return "-"
+    return str(escape(labels.get(str(value), value)))
+
+
+def render_selector_row(row: dict, fields: list, labels: Optional[dict] = None) -> str:
+    """
+    One <tr> of the parent selector table; labels maps field id ->
+    field_labels(), computed when not given.
+    """
+    if labels is None:
+        labels = {field.id: field_labels(field) for field in fields}
+    button = (
+        '<button class="btn btn-success btn-sm select-parent-btn" '
+        f'data-parent-id="{row.get("id")}"><i class="bi bi-check-circle me-1"></i>Select</button>'
+    )
+    cells = f'<td>{button}</td>'
+    for field in fields:
+        cells += f'<td>{render_cell(field, row.get(field.id), labels[field.id])}</td>'
+    return f'<tr>{cells}</tr>'
+
+
 def render_parent_selector_modal(entity: str, all_rows: list, fields: list) -> str:
     """Render modal for selecting a parent record with DataTables."""
     cfg = EntityConfigManager.get(entity)
@@ -292,13 +375,9 @@ def render_parent_selector_modal(entity: str, all_rows: list, fields: list) -> s
     for field in fields:
         thead_cells += f'<th>{field.label}</th>'
     
-    tbody_rows = ""
-    for row in all_rows:
-        cells = f'<td><button class="btn btn-success btn-sm select-parent-btn" data-parent-id="{row.get("id")}"><i class="bi bi-check-circle me-1"></i>Select</button></td>'
-        for field in fields:
-            value = row.get(field.id, "-") or "-"
-            cells += f'<td>{value}</td>'
-        tbody_rows += f'<tr>{cells}</tr>'
+    labels = {field.id: field_labels(field) for field in fields}
+    tbody_rows = "".join(render_selector_row(row, fields, labels) for row in all_rows)
+    field_ids = ",".join(f.id for f in fields)
     
     return f'''
     <div class="modal fade" id="{modal_id}" tabindex="-1">
@@ -309,7 +388,8 @@ def render_parent_selector_modal(entity: str, all_rows: list, fields: list) -> s
                     <button type="button" class="btn-close btn-close-white" data-bs-dismiss="modal"></button>
                 </div>
                 <div class="modal-body p-0">
-                    <table id="{table_id}" class="table table-hover table-striped table-sm w-100">
+                    <table id="{table_id}" class="table table-hover table-striped table-sm w-100"
+                           data-fields="{field_ids}">
                         <thead class="table-light">
                             <tr>{thead_cells}</tr>
                         </thead>
@@ -325,244 +405,26 @@ def render_parent_selector_modal(entity: str, all_rows: list, fields: list) -> s
     '''
 
 
-def render_tabgrid_js(entity: str, selected_id: Optional[int], has_subgrids: bool) -> str:
-    """Render JavaScript for TabGrid functionality."""
-    modal_id = f"{entity}-select-parent-modal"
-    table_id = f"{entity}-select-table"
-    selected_id_str = str(selected_id) if selected_id else ""
-    
-    subgrid_js = ""
-    if has_subgrids:
-        subgrid_js = '''
-        // Define loadSubgridData function FIRST
-        window.loadSubgridData = function(pane) {
-            const subgridEntity = pane.dataset.subgridEntity;
-            const foreignKey = pane.dataset.foreignKey;
-            const parentId = pane.dataset.parentId;
-            
-            if (!parentId || parentId === '' || parentId === 'None') {
-                pane.querySelector('.subgrid-loading').innerHTML = '<div class="alert alert-warning">Please select a parent record first</div>';
-                return;
-            }
-            
-            const loadingDiv = pane.querySelector('.subgrid-loading');
-            const tableWrapper = pane.querySelector('.subgrid-table-wrapper');
-            
-            $.ajax({
-                url: '/admin/subgrid',
-                method: 'GET',
-                data: {
-                    entity: subgridEntity,
-                    parent_id: parentId,
-                    foreign_key: foreignKey
-                },
-                success: function(response) {
-                    if (loadingDiv) loadingDiv.style.display = 'none';
-                    if (tableWrapper) tableWrapper.style.display = 'block';
-                    
-                    const tableId = tableWrapper.querySelector('table').id;
-                    window.renderSubgridTable(tableId, response.rows, response.fields, response.field_types, response.field_options, subgridEntity, parentId);
-                    pane.dataset.loaded = 'true';
-                },
-                error: function(xhr, status, error) {
-                    console.error('loadSubgridData error:', error);
-                    if (loadingDiv) {
-                        loadingDiv.innerHTML = '<div class="alert alert-danger">Failed to load subgrid data: ' + error + '</div>';
-                    }
-                }
-            });
-        };
-        
-        window.renderSubgridTable = function(tableId, rows, fields, fieldTypes, fieldOptions, subgridEntity, parentId) {
-            const table = $('#' + tableId);
-            
-            if ($.fn.DataTable.isDataTable(table)) {
-                table.DataTable().destroy();
-            }
-            
-            // Build thead
-            let theadHtml = '<tr>';
-            for (const [fieldId, fieldLabel] of Object.entries(fields)) {
-                theadHtml += '<th>' + fieldLabel + '</th>';
-            }
-            theadHtml += '<th>Actions</th></tr>';
-            table.find('thead').html(theadHtml);
-            
-            const columns = [];
-            for (const [fieldId, fieldLabel] of Object.entries(fields)) {
-                const fieldType = fieldTypes[fieldId];
-                const options = fieldOptions[fieldId] || {};
-                
-                columns.push({ 
-                    data: fieldId,
-                    render: function(data, type, row) {
-                        if (type === 'display') {
-                            if (fieldType === 'file' || fieldId === 'imagen' || fieldId === 'image') {
-                                if (data) {
-                                    return '<img src="/uploads/' + data + '" style="max-width:50px;max-height:50px;border-radius:4px;">';
-                                }
-                                return '-';
-                            }
-                            if (fieldType === 'select' || fieldType === 'radio') {
-                                if (data && options[String(data)]) {
-                                    return options[String(data)];
-                                }
-                                return data || '-';
-                            }
-                            if (data === null || data === undefined) return '-';
-                            return data;
-                        }
-                        return data;
-                    }
-                });
-            }
-            columns.push({
-                data: null,
-                render: function(data, type, row) {
-                    const editUrl = '/admin/' + subgridEntity + '/edit-form/' + row.id + '?parent_entity=' + window.tabgridEntity + '&parent_id=' + parentId;
-                    const deleteUrl = '/admin/' + subgridEntity + '/delete/' + row.id + '?parent_entity=' + window.tabgridEntity + '&parent_id=' + parentId;
-                    return '<div class="btn-group btn-group-sm">' +
-                        '<a href="#" class="btn btn-warning btn-sm edit-record-btn" data-url="' + editUrl + '"><i class="bi bi-pencil"></i></a>' +
-                        '<a href="' + deleteUrl + '" class="btn btn-danger btn-sm delete-record-btn"><i class="bi bi-trash"></i></a>' +
-                        '</div>';
-                }
-            });
-            
-            var dtConfig = {
-                data: rows,
-                columns: columns,
-                responsive: true,
-                pageLength: 10,
-                dom: '<"row"<"col-sm-12 col-md-6"l><"col-sm-12 col-md-6"f>>Brtip',
-                buttons: [
-                    { extend: 'excel', className: 'btn btn-success btn-sm', text: '<i class="bi bi-file-earmark-excel"></i> Excel' },
-                    { extend: 'pdf', className: 'btn btn-danger btn-sm', text: '<i class="bi bi-file-earmark-pdf"></i> PDF' },
-                    { extend: 'print', className: 'btn btn-info btn-sm', text: '<i class="bi bi-printer"></i> Print' }
-                ]
-            };
-            if (typeof LOCALE !== 'undefined' && LOCALE !== 'en') {
-                var langMap = { 'es': 'es-ES', 'fr': 'fr-FR', 'de': 'de-DE', 'pt': 'pt-PT', 'it': 'it-IT' };
-                var langCode = langMap[LOCALE] || LOCALE;
-                dtConfig.language = { url: 'https://cdn.datatables.net/plug-ins/1.13.7/i18n/' + langCode + '.json' };
-            }
-            var dt = table.DataTable(dtConfig);
-            dt.buttons().container().appendTo('#' + tableId + '_wrapper .col-md-6:eq(0)');
-        };
-        
-        // Tab switching for subgrids - use Bootstrap's shown.bs.tab event
-        $(document).on('shown.bs.tab', '.nav-tabs .nav-link', function (e) {
-            const targetId = e.target.dataset.bsTarget || e.target.getAttribute('href');
-            const targetPane = document.querySelector(targetId);
-            
-            if (targetPane && targetPane.dataset.subgridEntity && targetPane.dataset.loaded !== 'true') {
-                window.loadSubgridData(targetPane);
-            }
-        });
-        
-        // Check for already active tabs on page load (after functions are defined)
-        $('.nav-tabs .nav-link.active').each(function() {
-            const targetId = this.dataset.bsTarget || this.getAttribute('href');
-            const targetPane = document.querySelector(targetId);
-            if (targetPane && targetPane.dataset.subgridEntity && targetPane.dataset.loaded !== 'true') {
-                window.loadSubgridData(targetPane);
-            }
-        });
-        
-        // Add subgrid button handler
-        $(document).on('click', '.add-subgrid-btn', function(e) {
-            e.preventDefault();
-            const subgridEntity = $(this).data('subgrid-entity');
-            const parentId = $(this).data('parent-id');
-            const url = '/admin/' + subgridEntity + '/add-form/' + parentId + '?parent_entity=' + window.tabgridEntity;
-            
-            var modal = $('#exampleModal');
-            modal.find('.modal-body').html('<div class="text-center py-5"><div class="spinner-border text-primary" role="status"></div></div>');
-            modal.find('.modal-title').text('New Record');
-            modal.modal('show');
-            $.get(url, function(html) {
-                modal.find('.modal-body').html(html);
-            }).fail(function() {
-                modal.find('.modal-body').html('<div class="alert alert-danger">Error loading form</div>');
-            });
-        });
-        '''
-    
-    return f'''
-    <script>
-    // Wait for jQuery to be loaded
-    (function() {{
-        function initTabgrid() {{
-            window.tabgridEntity = '{entity}';
-            window.tabgridSelectedId = '{selected_id_str}';
-            
-            // Initialize DataTable on parent selector modal
-            const table = $('#{table_id}');
-            if (table.length && !$.fn.DataTable.isDataTable(table)) {{
-                var dtConfig = {{
-                    responsive: true,
-                    pageLength: 10,
-                    order: [[1, 'asc']],
-                    dom: '<"row"<"col-sm-12 col-md-6"l><"col-sm-12 col-md-6"f>>Brtip',
-                    buttons: [
-                        {{ extend: 'excel', className: 'btn btn-success btn-sm', text: '<i class="bi bi-file-earmark-excel"></i> Excel' }},
-                        {{ extend: 'pdf', className: 'btn btn-danger btn-sm', text: '<i class="bi bi-file-earmark-pdf"></i> PDF' }},
-                        {{ extend: 'print', className: 'btn btn-info btn-sm', text: '<i class="bi bi-printer"></i> Print' }}
-                    ]
-                }};
-                if (typeof LOCALE !== 'undefined' && LOCALE !== 'en') {{
-                    var langMap = {{ 'es': 'es-ES', 'fr': 'fr-FR', 'de': 'de-DE', 'pt': 'pt-PT', 'it': 'it-IT' }};
-                    var langCode = langMap[LOCALE] || LOCALE;
-                    dtConfig.language = {{ url: 'https://cdn.datatables.net/plug-ins/1.13.7/i18n/' + langCode + '.json' }};
-                }}
-                var dt = table.DataTable(dtConfig);
-                dt.buttons().container().appendTo('#{table_id}_wrapper .col-md-6:eq(0)');
-            }}
-            
-            // Select parent button handler
-            $(document).on('click', '.select-parent-btn', function(e) {{
-                e.preventDefault();
-                e.stopPropagation();
-                const parentId = $(this).data('parent-id');
-                $('#{modal_id}').modal('hide');
-                window.location.href = '/admin/{entity}?id=' + parentId;
-            }});
-            
-            {subgrid_js}
-            
-            // Check for tab parameter in URL and auto-select that tab
-            const urlParams = new URLSearchParams(window.location.search);
-            const tabParam = urlParams.get('tab');
-            if (tabParam) {{
-                const tabLink = document.querySelector('[href="#tab-' + tabParam + '"]');
-                const targetPane = document.querySelector('#tab-' + tabParam);
-                if (tabLink && targetPane) {{
-                    // Show the tab
-                    $(tabLink).tab('show');
-                    // Manually load subgrid data if needed
-                    if (targetPane.dataset.subgridEntity && targetPane.dataset.loaded !== 'true') {{
-                        setTimeout(function() {{
-                            window.loadSubgridData(targetPane);
-                        }}, 100);
-                    }}
-                }}
-            }}
-        }}
-        
-        // Run when jQuery is ready
-        if (typeof $ === 'function') {{
-            $(initTabgrid);
-        }} else {{
-            document.addEventListener('DOMContentLoaded', function() {{
-                if (typeof $ === 'function') {{
-                    $(initTabgrid);
-                }} else {{
-                    console.error('jQuery not loaded');
-                }}
-            }});
-        }}
-    }})();
-    </script>
-    '''
+def render_subgrid_payload(subgrid, parent_id: int) -> str:
+    """Embed a subgrid's rows as JSON so the active tab renders without an AJAX call."""
+    sub_cfg = EntityConfigManager.get(subgrid.entity)
+    if not sub_cfg or current_user.level not in sub_cfg.rights:
+        return ""
+    
+    data = get_subgrid_data(
+        subgrid.entity,
+        parent_id=parent_id,
+        foreign_key=subgrid.foreign_key,
+        include_schema=True,
+        columnar=True,
+    )
+    payload = dumps(data).decode("utf-8").replace("<", "\\u003c")
+    return f'<script type="application/json" class="subgrid-data">{payload}</script>'
+
+
+def render_tabgrid_js() -> str:
+    """Script tag for the shared tabgrid module; each page configures it through data attributes."""
+    return f'<script src="{asset_url("js/tabgrid.js")}" defer></script>'
 
 
 def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_tab: str = "") -> str:
@@ -597,10 +459,15 @@ def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_t
     header_new_button = ""
     if actions.get("new"):
         new_url = f"/admin/{entity}/add-form"
+        import_url = f"/admin/{entity}/import"
         header_new_button = f'''
         <a href="{new_url}" class="btn btn-success new-record-btn" data-url="{new_url}">
             <i class="bi bi-plus-circle me-1"></i>New
         </a>
+        <a href="{import_url}" class="btn btn-outline-success new-record-btn"
+           data-url="{import_url}" data-title="Import">
+            <i class="bi bi-upload me-1"></i>Import
+        </a>
         '''
     
     header = f'''
@@ -621,6 +488,22 @@ def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_t
                     <button type="button" class="btn btn-outline-secondary" onclick="location.reload()">
                         <i class="bi bi-arrow-clockwise me-1"></i>Refresh
                     </button>
+                    <div class="btn-group">
+                        <button type="button" class="btn btn-outline-secondary dropdown-toggle"
+                                data-bs-toggle="dropdown">
+                            <i class="bi bi-download me-1"></i>Export
+                        </button>
+                        <ul class="dropdown-menu dropdown-menu-end">
+                            <li>
+                                <a class="dropdown-item" href="/admin/{entity}/export.csv">CSV</a>
+                            </li>
+                            <li>
+                                <a class="dropdown-item" href="/admin/{entity}/export.ndjson">
+                                    NDJSON
+                                </a>
+                            </li>
+                        </ul>
+                    </div>
                 </div>
             </div>
         </div>
@@ -631,9 +514,11 @@ def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_t
     
     if not has_subgrids:
         parent_detail = render_parent_detail_vertical(entity, selected_row, actions)
-        js = render_tabgrid_js(entity, selected_id, False)
+        js = render_tabgrid_js()
         return f'''
-        <div class="tabgrid-container" data-entity="{entity}" data-selected-parent-id="{selected_id or ""}">
+        <div class="tabgrid-container" data-entity="{entity}"
+             data-selected-parent-id="{selected_id or ""}" data-user-id="{current_user.id}"
+             data-live="{int(events_enabled())}">
             {header}
             {selector_modal}
             <div class="card shadow-sm">
@@ -668,12 +553,21 @@ def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_t
         tabs_nav += f'<li class="nav-item"><a class="nav-link {sub_active}" data-bs-toggle="tab" href="#tab-{subgrid.entity}"><i class="{subgrid.icon} me-2"></i>{subgrid.title}</a></li>'
         
         sub_table = render_subgrid_table(subgrid.entity, entity, subgrid, selected_id)
+        if sub_active and selected_id:
+            sub_table += render_subgrid_payload(subgrid, selected_id)
         add_button = f'''
         <div class="d-flex justify-content-between align-items-center mb-3">
             <h5 class="mb-0"><i class="{subgrid.icon} me-2"></i>{subgrid.title}</h5>
-            <button class="btn btn-sm btn-primary add-subgrid-btn" data-subgrid-entity="{subgrid.entity}" data-parent-id="{selected_id or ""}">
-                <i class="bi bi-plus-circle me-1"></i>New
-            </button>
+            <div>
+                <button class="btn btn-sm btn-outline-secondary refresh-subgrid-btn"
+                        data-subgrid-entity="{subgrid.entity}" title="Refresh">
+                    <i class="bi bi-arrow-clockwise"></i>
+                </button>
+                <button class="btn btn-sm btn-primary add-subgrid-btn"
+                        data-subgrid-entity="{subgrid.entity}" data-parent-id="{selected_id or ""}">
+                    <i class="bi bi-plus-circle me-1"></i>New
+                </button>
+            </div>
         </div>
         '''
         
@@ -688,10 +582,12 @@ def render_tabbed_view(entity: str, selected_id: Optional[int] = None, current_t
         </div>
         '''
     
-    js = render_tabgrid_js(entity, selected_id, True)
+    js = render_tabgrid_js()
     
     return f'''
-    <div class="tabgrid-container" data-entity="{entity}" data-selected-parent-id="{selected_id or ""}">
+    <div class="tabgrid-container" data-entity="{entity}"
+         data-selected-parent-id="{selected_id or ""}" data-user-id="{current_user.id}"
+         data-live="{int(events_enabled())}">
         {header}
         {selector_modal}
         <ul class="nav nav-tabs mb-3">{tabs_nav}</ul>
@@ -728,7 +624,11 @@ def render_grid(entity: str, rows: list, parent_id: Optional[int] = None, parent
             for field in fields:
                 value = row.get(field.id, "")
                 if field.type == "file" and value:
-                    cells += f'<td class="align-middle"><img src="/uploads/{value}" alt="{value}" style="max-width:60px;max-height:60px;border-radius:8px;object-fit:cover;"></td>'
+                    cells += (
+                        f'<td class="align-middle"><img src="{thumb_url(value, 60)}" '
+                        f'loading="lazy" alt="{value}" style="max-width:60px;max-height:60px;'
+                        'border-radius:8px;object-fit:cover;"></td>'
+                    )
                 elif field.type == "file":
                     cells += '<td class="align-middle text-muted">-</td>'
                 else:
@@ -806,7 +706,9 @@ def build_dashboard(title: str, rows: list, table_id: str, fields: dict) -> tupl
         </div>
         <div class="p-3 bg-white rounded-bottom">
             <div class="table-responsive">
-                <table id="{table_id}" class="table table-hover table-bordered table-striped table-sm align-middle display dataTable w-100">
+                <table id="{table_id}" data-dashboard-grid
+                       class="table table-hover table-bordered table-striped table-sm
+                              align-middle display dataTable w-100">
                     <thead class="table-light">
                         <tr>{thead_cells}</tr>
                     </thead>
@@ -817,29 +719,6 @@ def build_dashboard(title: str, rows: list, table_id: str, fields: dict) -> tupl
     </div>
     '''
     
-    javascript = f'''
-    <script>
-    $(function() {{
-        var dtConfig = {{
-            responsive: true,
-            pageLength: 25,
-            order: [[0, 'asc']],
-            dom: '<"row"<"col-sm-12 col-md-6"l><"col-sm-12 col-md-6"f>>Brtip',
-            buttons: [
-                {{ extend: 'excel', className: 'btn btn-success btn-sm', text: '<i class="bi bi-file-earmark-excel"></i> Excel' }},
-                {{ extend: 'pdf', className: 'btn btn-danger btn-sm', text: '<i class="bi bi-file-earmark-pdf"></i> PDF' }},
-                {{ extend: 'print', className: 'btn btn-info btn-sm', text: '<i class="bi bi-printer"></i> Print' }}
-            ]
-        }};
-        if (typeof LOCALE !== 'undefined' && LOCALE !== 'en') {{
-            var langMap = {{ 'es': 'es-ES', 'fr': 'fr-FR', 'de': 'de-DE', 'pt': 'pt-PT', 'it': 'it-IT' }};
-            var langCode = langMap[LOCALE] || LOCALE;
-            dtConfig.language = {{ url: 'https://cdn.datatables.net/plug-ins/1.13.7/i18n/' + langCode + '.json' }};
-        }}
-        var dt = $('#{table_id}').DataTable(dtConfig);
-        dt.buttons().container().appendTo('#{table_id}_wrapper .col-md-6:eq(0)');
-    }});
-    </script>
-    '''
+    javascript = render_tabgrid_js()
     
     return html, javascript
@@ -605,7 +605,7 @@ def _register_context_processors(app: Flask) -> None:
 # Continue with more templates...
 # Due to length, I'll write the rest to a file
 
-def create_project(project_name: str, project_path: Path) -> None:
+def create_project(project_name: str, project_path: Path, fetch_assets: bool = False) -> None:
     """Create a new standalone PyWebGen project."""
     from pywebgen.generator_templates2 import write_all_templates
     
@@ -641,6 +641,6 @@ def create_project(project_name: str, project_path: Path) -> None:
         (project_path / d).mkdir(parents=True, exist_ok=True)
     
     # Write all templates
-    write_all_templates(project_name, project_path)
+    write_all_templates(project_name, project_path, fetch_assets)
     
     print(f"Created project: {project_path}")
@@ -31,6 +31,15 @@ ipython>=8.0.0
 # mysqlclient>=2.2.0
 # psycopg2-binary>=2.9.0
 # pymysql  # Alternative MySQL driver
+
+# Optional: inotify/FSEvents-based hot reload (polling is used without it)
+# watchdog>=3.0.0
+
+# Optional: faster JSON for grid payloads
+# orjson>=3.9.0
+
+# Optional: WebP thumbnails of uploaded images (grids use the originals without it)
+# Pillow>=10.0.0
 """
 
 
@@ -40,6 +49,8 @@ def get_config_yaml(project_name: str) -> str:
   default_locale: es
   cookie_name: LS
   max_file_size_mb: 5
+  hot_reload: false            # Watch entity/i18n YAML and config.yaml and reload on change
+  hot_reload_interval: 1.0     # Seconds between polls when watchdog is not installed
 
 database:
   error_codes:
@@ -83,12 +94,71 @@ connections:
     db_pwd: ""
   default: sqlite
 
+export:
+  chunk_size: 1000
+
+import:
+  batch_size: 5000
+  error_dir: db/import_errors
+
+bulk:
+  batch_size: 500
+
+subgrid:
+  max_workers: 4
+
+# Delta sync for entities with a version_column
+sync:
+  skew_seconds: 5
+  tombstone_days: 7
+
+# Live change feed (/admin/events). Each open tabbed view holds a server thread
+# for up to max_age seconds: enable only behind a threaded or async server
+# (gunicorn --threads / gevent), never with sync workers
+events:
+  enabled: false
+  path: db/events.sqlite
+  poll_interval: 1.0
+  keepalive: 15
+  max_age: 300
+  retention_seconds: 300
+
 site_name: "{project_name}"
 company_name: "My Company"
 port: 5000
 uploads: "./uploads/"
 path: "/uploads/"
 max_upload_mb: 5
+
+# Who streams /uploads bytes: app (sendfile via wsgi.file_wrapper, Range support),
+# x-sendfile (Apache/lighttpd) or x-accel-redirect (nginx, internal location below)
+upload_serving:
+  mode: app
+  internal_prefix: /protected-uploads/
+
+# named: <table>_<id>.<ext>, rewritten on every upload. content: stored once as
+# cas/<aa>/<bb>/<sha256> and referenced as <sha256>.<ext>, shared by identical
+# files, cached forever; unreferenced files are removed gc_grace_seconds after
+# their last record goes
+upload_storage:
+  mode: named
+  gc_grace_seconds: 3600
+
+# Resumable uploads: files bigger than one chunk are sent to /admin/uploads in
+# pieces before the form posts (chunk_mb must stay below max_upload_mb)
+chunked_uploads:
+  enabled: true
+  chunk_mb: 1
+  max_mb: 200
+  expire_hours: 24
+
+# Downsized WebP copies of uploaded images, made in the background (needs Pillow)
+thumbnails:
+  enabled: true
+  sizes: [120, 240, 480]
+  quality: 80
+  workers: 2
+
 allowed_image_exts:
   - jpg
   - jpeg
@@ -167,6 +237,7 @@ success:
   deleted: "Deleted successfully"
   created: "Created successfully"
   updated: "Updated successfully"
+  imported: "Imported {inserted} record(s), {rejected} rejected"
 
 auth:
   login: "Login"
@@ -177,6 +248,21 @@ auth:
 
 grid:
   no_records: "No records found"
+  zero_records: "No matching records found"
+  info: "Showing _START_ to _END_ of _TOTAL_ entries"
+  info_empty: "Showing 0 to 0 of 0 entries"
+  info_filtered: "(filtered from _MAX_ total entries)"
+  length_menu: "Show _MENU_ entries"
+  loading_records: "Loading..."
+  processing: "Processing..."
+  search: "Search:"
+  sort_ascending: ": activate to sort column ascending"
+  sort_descending: ": activate to sort column descending"
+  paginate:
+    first: "First"
+    last: "Last"
+    next: "Next"
+    previous: "Previous"
 """
 
 ES_I18N = """common:
@@ -243,6 +329,7 @@ success:
   deleted: "Eliminado exitosamente"
   created: "Creado exitosamente"
   updated: "Actualizado exitosamente"
+  imported: "Se importaron {inserted} registro(s), {rejected} rechazado(s)"
 
 auth:
   login: "Iniciar Sesión"
@@ -253,6 +340,21 @@ auth:
 
 grid:
   no_records: "No se encontraron registros"
+  zero_records: "No se encontraron resultados"
+  info: "Mostrando _START_ a _END_ de _TOTAL_ registros"
+  info_empty: "Mostrando 0 a 0 de 0 registros"
+  info_filtered: "(filtrado de _MAX_ registros en total)"
+  length_menu: "Mostrar _MENU_ registros"
+  loading_records: "Cargando..."
+  processing: "Procesando..."
+  search: "Buscar:"
+  sort_ascending: ": activar para ordenar la columna ascendente"
+  sort_descending: ": activar para ordenar la columna descendente"
+  paginate:
+    first: "Primero"
+    last: "Último"
+    next: "Siguiente"
+    previous: "Anterior"
 """
 
 
@@ -269,13 +371,23 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 import yaml
-from flask import Flask, session
+from flask import Flask, g, has_request_context, session
+
+
+# libyaml's C loader is several times faster; fall back to the pure-Python one
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(path) -> Any:
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=YamlLoader)
 
 
 class Config:
     _instance: Optional["Config"] = None
     _config: dict[str, Any] = {}
     _base_path: Optional[Path] = None
+    _path: Optional[Path] = None
     
     def __new__(cls) -> "Config":
         if cls._instance is None:
@@ -287,14 +399,23 @@ class Config:
             config_path = os.environ.get("APP_CONFIG", "config.yaml")
         
         path = Path(config_path)
+        self._path = path
         if path.exists():
             self._base_path = path.parent.parent.resolve()
-            with open(path, "r") as f:
-                self._config = yaml.safe_load(f) or {}
+            self._config = load_yaml(path) or {}
         
         if app:
             self._load_flask_config(app)
     
+    def reload(self) -> None:
+        """Re-read the YAML file in place. Flask settings applied at startup are left alone."""
+        if self._path and self._path.exists():
+            self._config = load_yaml(self._path) or {}
+    
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+    
     def _resolve_path(self, path_str: str) -> str:
         if Path(path_str).is_absolute():
             return path_str
@@ -362,6 +483,10 @@ class Config:
     def uploads_path(self) -> str:
         return self._resolve_path(self.get("uploads", "./uploads/"))
     
+    @property
+    def import_errors_path(self) -> str:
+        return self._resolve_path(self.get("import.error_dir", "db/import_errors"))
+    
     @property
     def allowed_image_extensions(self) -> list[str]:
         return self.get("allowed_image_exts", ["jpg", "jpeg", "png", "gif", "bmp", "webp"])
@@ -375,13 +500,21 @@ config = Config()
 
 
 def get_locale() -> str:
-    return session.get("locale", config.default_locale)
+    """Current locale, read from the session once per request."""
+    if not has_request_context():
+        return config.default_locale
+    locale = g.get("locale")
+    if locale is None:
+        locale = g.locale = session.get("locale", config.default_locale)
+    return locale
 
 
 def set_locale(locale: str) -> None:
     if locale in ("en", "es"):
         session["locale"] = locale
         session.permanent = True
+        if has_request_context():
+            g.locale = locale
 '''
 
 
@@ -453,6 +586,7 @@ class Cars(db.Model):
     year = db.Column(db.Integer)
     imagen = db.Column(db.String(255))
     contacto_id = db.Column(db.Integer, db.ForeignKey("contactos.id"), nullable=False)
+    row_version = db.Column(db.BigInteger, index=True)
 
 
 class Siblings(db.Model):
@@ -475,10 +609,9 @@ def get_app_py(project_name: str) -> str:
     return f'''"""
 Flask Application Factory
 """
-import os
 from pathlib import Path
 from typing import Optional
-from flask import Flask, redirect, url_for, send_from_directory
+from flask import Flask, redirect, url_for
 from flask_login import current_user
 from flask_wtf.csrf import CSRFProtect
 
@@ -501,7 +634,13 @@ def create_app(config_path: Optional[str] = None) -> Flask:
     
     @app.route("/uploads/<filename>")
     def uploaded_file(filename):
-        return send_from_directory(os.path.abspath(config.uploads_path), filename)
+        from engine.uploads import serve_upload
+        return serve_upload(filename)
+    
+    @app.route("/assets/<path:filename>")
+    def hashed_asset(filename):
+        from engine.assets import serve_asset
+        return serve_asset(filename)
     
     db.init_app(app)
     login_manager.init_app(app)
@@ -511,7 +650,13 @@ def create_app(config_path: Optional[str] = None) -> Flask:
     I18N.init_app(app)
     
     from engine import EntityConfigManager
-    EntityConfigManager.load_all()
+    from engine.snapshot import apply_snapshot
+    if not apply_snapshot():
+        EntityConfigManager.load_all()
+    
+    if config.get("app.hot_reload", False):
+        from engine.watcher import start_watcher
+        start_watcher(config.get("app.hot_reload_interval", 1.0))
     
     _register_blueprints(app)
     _register_template_filters(app)
@@ -545,7 +690,8 @@ def _register_template_filters(app: Flask) -> None:
     def image_link(filename: Optional[str]) -> str:
         if not filename:
             return "/static/images/placeholder.png"
-        return f"/uploads/{{filename}}"
+        from engine.uploads import upload_url
+        return upload_url(filename)
     
     @app.template_filter("capitalize_words")
     def capitalize_words(text: str) -> str:
@@ -556,7 +702,16 @@ def _register_context_processors(app: Flask) -> None:
     @app.context_processor
     def inject_config():
         from datetime import datetime
+        from engine.assets import (
+            asset_url, bundle_manifest, export_libs, theme_urls, vendor_theme_urls, vendor_urls,
+        )
         return {{
+            "asset_url": asset_url,
+            "asset_manifest": bundle_manifest(),
+            "vendor_urls": vendor_urls,
+            "vendor_theme_urls": vendor_theme_urls,
+            "theme_urls": theme_urls,
+            "export_libs": export_libs,
             "config": config,
             "site_name": config.site_name,
             "company_name": config.company_name,
@@ -574,17 +729,20 @@ def _register_context_processors(app: Flask) -> None:
     
     @app.context_processor
     def inject_i18n():
-        from i18n import tr
+        from i18n import grid_language, tr
         from config import get_locale
         return {{
             "tr": tr,
             "locale": get_locale(),
+            "grid_language": grid_language,
         }}
     
     @app.context_processor
     def inject_menu():
-        from menu import get_menu_config
-        return {{"menu_config": get_menu_config()}}
+        from menu import get_cached_menu
+        from config import get_locale
+        level = current_user.level if current_user.is_authenticated else None
+        return {{"menu_config": get_cached_menu(level, get_locale())}}
 '''
 
 
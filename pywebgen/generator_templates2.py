@@ -12,6 +12,7 @@ from pywebgen.generator_templates import (
     REQUIREMENTS_TXT, get_config_yaml, CONFIG_PY, MODELS_PY, get_app_py,
     EN_I18N, ES_I18N
 )
+from pywebgen.assets import install_vendor_assets, load_manifest
 
 GITIGNORE = """__pycache__/
 *.py[cod]
@@ -37,12 +38,19 @@ htmlcov/
 
 I18N_INIT = '''"""
 Internationalization (i18n) Support
+
+Locale files are flattened to {"section.key": text} tables on first use,
+so translate() is a single dict lookup. Strings with placeholders are
+parsed into their literal and field parts at load time, so formatting
+never re-parses the text. The DataTables
+language object is built from the grid.* keys and cached per locale.
 """
-from typing import Any, Optional
+from string import Formatter
+from typing import Optional
 from pathlib import Path
 import yaml
 from flask import Flask
-from config import get_locale
+from config import get_locale, load_yaml
 
 
 SUPPORTED_LOCALES = {
@@ -50,9 +58,79 @@ SUPPORTED_LOCALES = {
     "es": {"name": "Español", "flag": "🇲🇽"},
 }
 
+# Runtime misses remembered per locale for missing_keys(); keys built from
+# data must not grow the set forever
+MAX_MISSING_KEYS = 1000
+
+_formatter = Formatter()
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, str]:
+    """{"a": {"b": "x"}} -> {"a.b": "x"}; only string leaves are kept."""
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, str):
+            flat[path] = value
+    return flat
+
+
+# DataTables language option -> translation key
+DATATABLES_KEYS = {
+    "emptyTable": "grid.no_records",
+    "zeroRecords": "grid.zero_records",
+    "info": "grid.info",
+    "infoEmpty": "grid.info_empty",
+    "infoFiltered": "grid.info_filtered",
+    "lengthMenu": "grid.length_menu",
+    "loadingRecords": "grid.loading_records",
+    "processing": "grid.processing",
+    "search": "grid.search",
+    "paginate.first": "grid.paginate.first",
+    "paginate.last": "grid.paginate.last",
+    "paginate.next": "grid.paginate.next",
+    "paginate.previous": "grid.paginate.previous",
+    "aria.sortAscending": "grid.sort_ascending",
+    "aria.sortDescending": "grid.sort_descending",
+}
+
+
+def compile_entry(text: str) -> tuple[str, Optional[tuple]]:
+    """
+    Pair a translation with its parsed (literal, field, spec, conversion)
+    parts, or with None when it has no fields.
+    """
+    try:
+        parts = tuple(_formatter.parse(text))
+    except ValueError:
+        return text, None
+    if all(name is None for _, name, _, _ in parts):
+        return text, None
+    return text, parts
+
+
+def render(parts: tuple, values: dict) -> str:
+    """Same result as text.format_map(values), from the parts compile_entry stored."""
+    pieces = []
+    for literal, name, spec, conversion in parts:
+        pieces.append(literal)
+        if name is not None:
+            value = _formatter.convert_field(_formatter.get_field(name, (), values)[0], conversion)
+            if "{" in spec:
+                spec = _formatter.vformat(spec, (), values)
+            pieces.append(format(value, spec))
+    return "".join(pieces)
+
 
 class I18N:
-    _translations: dict[str, dict[str, Any]] = {}
+    _translations: dict[str, dict[str, tuple[str, Optional[tuple]]]] = {}
+    _files: dict[str, Path] = {}
+    _missing: dict[str, set] = {}
+    _version: int = 0
+    # locale -> (table it was built from, DataTables language object)
+    _datatables: dict[str, tuple[dict, dict]] = {}
     
     @classmethod
     def init_app(cls, app: Flask) -> None:
@@ -60,40 +138,120 @@ class I18N:
     
     @classmethod
     def load_translations(cls, path: str = "resources/i18n") -> None:
+        """Register the available locale files; each is parsed on first use."""
         i18n_path = Path(path)
         if not i18n_path.exists():
             return
-        for file_path in i18n_path.glob("*.yaml"):
-            locale = file_path.stem
-            with open(file_path, "r") as f:
-                cls._translations[locale] = yaml.safe_load(f) or {}
+        cls._files = {file_path.stem: file_path for file_path in i18n_path.glob("*.yaml")}
+        cls._translations = {}
+    
+    @classmethod
+    def _parse(cls, file_path: Path) -> dict[str, tuple[str, Optional[tuple]]]:
+        entries = flatten(load_yaml(file_path) or {})
+        return {key: compile_entry(text) for key, text in entries.items()}
+    
+    @classmethod
+    def load_locale(cls, locale: str) -> dict[str, tuple[str, Optional[tuple]]]:
+        file_path = cls._files.get(locale)
+        table = cls._parse(file_path) if file_path and file_path.exists() else {}
+        cls._translations[locale] = table
+        return table
+    
+    @classmethod
+    def load_tables(cls, tables: dict[str, dict[str, tuple[str, Optional[tuple]]]]) -> None:
+        """Install already compiled tables, e.g. from the config snapshot."""
+        cls._translations = {**cls._translations, **tables}
+    
+    @classmethod
+    def reload_files(cls, changed: list, removed: list = ()) -> None:
+        """Re-parse changed locale files that are in use and swap the tables in at once."""
+        files, translations = dict(cls._files), dict(cls._translations)
+        for file_path in removed:
+            files.pop(Path(file_path).stem, None)
+            translations.pop(Path(file_path).stem, None)
+        
+        for file_path in changed:
+            locale = Path(file_path).stem
+            files[locale] = Path(file_path)
+            if locale not in translations:
+                continue
+            try:
+                translations[locale] = cls._parse(Path(file_path))
+            except (OSError, yaml.YAMLError) as e:
+                print(f"[ERROR] Reload of {file_path} failed: {e}")
+        
+        cls._files, cls._translations = files, translations
+        cls._version += 1
+    
+    @classmethod
+    def get_version(cls) -> int:
+        return cls._version
+    
+    @classmethod
+    def table(cls, locale: str) -> dict[str, tuple[str, Optional[tuple]]]:
+        table = cls._translations.get(locale)
+        if table is None:
+            table = cls.load_locale(locale)
+        return table
     
     @classmethod
     def translate(cls, key: str, locale: Optional[str] = None, **kwargs) -> str:
         locale = locale or get_locale()
-        translations = cls._translations.get(locale, {})
-        
-        keys = key.split(".")
-        value = translations
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return key
-            if value is None:
-                return key
+        entry = cls.table(locale).get(key)
+        if entry is None:
+            missing = cls._missing.setdefault(locale, set())
+            if len(missing) < MAX_MISSING_KEYS:
+                missing.add(key)
+            return key
         
-        if isinstance(value, str) and kwargs:
+        text, parts = entry
+        if parts and kwargs:
             try:
-                return value.format(**kwargs)
-            except (KeyError, ValueError):
+                return render(parts, kwargs)
+            except (KeyError, ValueError, IndexError, AttributeError, TypeError):
                 pass
+        return text
+    
+    @classmethod
+    def datatables_language(cls, locale: str) -> dict:
+        """DataTables `language` option from the locale's grid.* keys.
+    
+    Untranslated options keep DataTables' defaults.
+    """
+        table = cls.table(locale)
+        cached = cls._datatables.get(locale)
+        if cached and cached[0] is table:
+            return cached[1]
         
-        return value if isinstance(value, str) else key
+        language: dict = {}
+        for option, key in DATATABLES_KEYS.items():
+            if key in table:
+                group, _, name = option.rpartition(".")
+                (language.setdefault(group, {}) if group else language)[name] = table[key][0]
+        cls._datatables[locale] = (table, language)
+        return language
+    
+    @classmethod
+    def missing_keys(cls, reference: str = "en") -> dict[str, list[str]]:
+        """
+        Keys present in the reference locale but not in each other locale,
+        plus keys looked up at runtime but never defined.
+        """
+        expected = set(cls.table(reference))
+        report = {}
+        for locale in cls._files:
+            missing = (expected - set(cls.table(locale))) | cls._missing.get(locale, set())
+            if missing:
+                report[locale] = sorted(missing)
+        return report
 
 
 def tr(key: str, **kwargs) -> str:
     return I18N.translate(key, **kwargs)
+
+
+def grid_language() -> dict:
+    return I18N.datatables_language(get_locale())
 '''
 
 
@@ -106,7 +264,11 @@ Menu Configuration
 
 Auto-generated from entity configs with manual overrides.
 """
+from typing import Optional
+
+from engine import EntityConfigManager
 from engine.menu import get_auto_menu_config
+from i18n import I18N
 
 
 # Define menu order here - items not listed appear at the end
@@ -125,10 +287,11 @@ custom_dropdowns = {
 }
 
 
-def get_menu_config():
+def get_menu_config(level: Optional[str] = None, locale: Optional[str] = None):
     """Returns the complete menu configuration with ordering."""
-    auto = get_auto_menu_config()
+    auto = get_auto_menu_config(level, locale)
     order_list = get_menu_order()
+    ordered_labels = {label for label, _, _ in order_list}
     
     # Build ordered nav links
     ordered_nav = []
@@ -142,7 +305,7 @@ def get_menu_config():
     
     # Add any auto items not in order list
     for item in auto.get("nav_links", []):
-        if item["label"] not in [o[0] for o in order_list]:
+        if item["label"] not in ordered_labels:
             ordered_nav.append(item)
     
     # Merge dropdowns
@@ -161,6 +324,18 @@ def get_menu_config():
         "nav_links": ordered_nav,
         "dropdowns": ordered_dropdowns,
     }
+
+
+_menu_cache: dict = {}
+
+
+def get_cached_menu(level: Optional[str], locale: str) -> dict:
+    """Menu for a user level and locale, rebuilt only when entity configs or translations reload."""
+    version = (EntityConfigManager.get_version(), I18N.get_version())
+    cached = _menu_cache.get((level, locale))
+    if cached is None or cached[0] != version:
+        cached = _menu_cache[(level, locale)] = (version, get_menu_config(level, locale))
+    return cached[1]
 '''
 
 
@@ -371,15 +546,36 @@ def contactos_report():
 ROUTES_ADMIN = '''"""
 Admin Routes - Dynamic Entity CRUD
 """
+import io
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 from typing import Optional
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import (
+    Blueprint, Response, abort, copy_current_request_context, render_template, request, redirect,
+    url_for, flash, jsonify, send_from_directory, stream_with_context,
+)
 from flask_login import login_required, current_user
 from flask_wtf.csrf import validate_csrf
 
+from config import config as app_config
 from engine import EntityConfigManager
+from engine.bulk import bulk_delete, bulk_update, import_batches
 from engine.crud import save_record, delete_record
-from engine.query import list_records, get_record
-from engine.render import render_form, render_grid, render_error, render_tabbed_view
+from engine.events import enabled as events_enabled, stream as change_stream
+from engine.export import iter_csv, iter_ndjson, strip_sensitive
+from engine.serialize import json_response
+from engine.query import get_record, get_subgrid_data, loaded_row, stream_records
+from engine.render import (
+    render_form, render_grid, render_error, render_tabbed_view, render_import_form,
+    render_parent_detail_vertical, render_selector_row,
+)
+from engine.uploads import (
+    UploadError, append_chunk, chunked_enabled, link_uploads, start_upload, upload_status,
+)
 from i18n import tr
 
 
@@ -460,16 +656,78 @@ def save(entity: str):
     
     if result.get("success"):
         new_id = result.get("id")
+        # Subgrid forms post a redirect back to their parent; only top-level records need the detail
+        is_subgrid = bool(redirect_url)
         if redirect_url:
             pass
         elif new_id:
             redirect_url = f"/admin/{entity}?id={new_id}"
         else:
             redirect_url = f"/admin/{entity}"
-        return jsonify({"ok": True, "redirect": redirect_url, "id": new_id})
+        
+        # The saved row and its rendered fragments let the page patch itself, without a redirect
+        cfg = EntityConfigManager.get(entity)
+        row = get_record(entity, new_id) if new_id else None
+        loaded = loaded_row(entity, row) if row else None
+        top_level = row is not None and not is_subgrid
+        row_json = link_uploads(entity, [strip_sensitive(entity, loaded)])[0] if loaded else None
+        detail = render_parent_detail_vertical(entity, row, cfg.actions) if top_level else None
+        selector_row = render_selector_row(row, cfg.get_display_fields()) if top_level else None
+        return json_response({
+            "ok": True,
+            "redirect": redirect_url,
+            "id": new_id,
+            "entity": entity,
+            "created": not data.get("id"),
+            "row": row_json,
+            "detail": detail,
+            "selector_row": selector_row,
+        })
     return jsonify({"ok": False, "errors": result.get("errors", result.get("error"))}), 400
 
 
+def upload_error(error: UploadError):
+    body = {"ok": False, "error": str(error)}
+    if error.offset is not None:
+        body["offset"] = error.offset
+    return jsonify(body), error.status
+
+
+@admin_bp.route("/uploads", methods=["POST"])
+@login_required
+def start_chunked_upload():
+    """Open a resumable upload.
+    
+    The client then PUTs chunk_size pieces to /admin/uploads/<id>?offset=N.
+    """
+    if not chunked_enabled():
+        abort(404)
+    payload = request.get_json(silent=True) or {}
+    try:
+        filename = str(payload.get("filename", ""))
+        status = start_upload(filename, payload.get("size"), current_user.id)
+        return jsonify(status), 201
+    except UploadError as e:
+        return upload_error(e)
+
+
+@admin_bp.route("/uploads/<upload_id>", methods=["GET", "PUT"])
+@login_required
+def chunked_upload(upload_id: str):
+    """GET: stored offset to resume from. PUT: append the raw request body at ?offset=."""
+    if not chunked_enabled():
+        abort(404)
+    try:
+        if request.method == "GET":
+            return jsonify(upload_status(upload_id, current_user.id))
+        offset = request.args.get("offset", type=int)
+        if offset is None:
+            raise UploadError("offset required")
+        return jsonify(append_chunk(upload_id, offset, request.stream, current_user.id))
+    except UploadError as e:
+        return upload_error(e)
+
+
 @admin_bp.route("/<entity>/delete/<int:record_id>")
 @login_required
 def delete(entity: str, record_id: int):
@@ -479,6 +737,9 @@ def delete(entity: str, record_id: int):
     
     result = delete_record(entity, record_id, current_user.id)
     
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return jsonify({**result, "entity": entity, "id": record_id})
+    
     if result.get("success"):
         flash(tr("success.deleted"), "success")
     else:
@@ -487,14 +748,151 @@ def delete(entity: str, record_id: int):
     parent_entity = request.args.get("parent_entity", "")
     parent_id = request.args.get("parent_id", type=int)
     
-    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return jsonify(result)
-    
     if parent_entity and parent_id:
         return redirect(url_for("admin.grid", entity=parent_entity, id=parent_id))
     return redirect(url_for("admin.grid", entity=entity))
 
 
+EXPORT_FORMATS = {
+    "csv": ("text/csv", iter_csv),
+    "ndjson": ("application/x-ndjson", iter_ndjson),
+}
+
+
+@admin_bp.route("/<entity>/export.<fmt>")
+@login_required
+def export(entity: str, fmt: str):
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    
+    if not check_permission(entity):
+        return jsonify({"success": False, "error": tr("error.unauthorized")}), 403
+    
+    mimetype, serializer = EXPORT_FORMATS[fmt]
+    chunks = stream_records(
+        entity,
+        chunk_size=app_config.get("export.chunk_size", 1000),
+        parent_id=request.args.get("parent_id", type=int),
+        foreign_key=request.args.get("foreign_key"),
+    )
+    
+    return Response(
+        stream_with_context(serializer(entity, chunks)),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity}.{fmt}"',
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@admin_bp.route("/<entity>/import", methods=["GET", "POST"])
+@login_required
+def import_records(entity: str):
+    if not check_permission(entity):
+        if request.method == "GET":
+            return render_error(tr("error.unauthorized"))
+        return jsonify({"ok": False, "error": tr("error.unauthorized")}), 403
+    
+    if request.method == "GET":
+        from flask_wtf.csrf import generate_csrf
+        return render_import_form(entity, generate_csrf())
+    
+    upload = request.files.get("file")
+    if not upload or not upload.filename:
+        return jsonify({"ok": False, "error": tr("error.invalid_data")}), 400
+    
+    error_dir = Path(app_config.import_errors_path)
+    error_dir.mkdir(parents=True, exist_ok=True)
+    error_name = f"{entity}-{datetime.now():%Y%m%d%H%M%S%f}.csv"
+    
+    # Flask closes the request's files when the view returns; the import outlives it
+    data = tempfile.TemporaryFile()
+    shutil.copyfileobj(upload.stream, data)
+    data.seek(0)
+    source = io.TextIOWrapper(data, encoding="utf-8-sig", newline="")
+    batch_size = app_config.get("import.batch_size", 5000)
+    
+    def lines():
+        # One JSON object per line: running counts after each batch, then the result
+        with source, open(error_dir / error_name, "w", newline="") as error_file:
+            for result in import_batches(entity, source, batch_size, error_file):
+                yield json.dumps({"inserted": result.inserted, "rejected": result.rejected}) + "\\n"
+        
+        payload = {
+            "ok": True,
+            "done": True,
+            "redirect": f"/admin/{entity}",
+            "message": tr("success.imported", inserted=result.inserted, rejected=result.rejected),
+            **result.to_dict(),
+        }
+        if result.rejected:
+            payload["error_file"] = url_for("admin.import_errors", entity=entity, name=error_name)
+        else:
+            (error_dir / error_name).unlink()
+        yield json.dumps(payload) + "\\n"
+    
+    return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
+
+
+@admin_bp.route("/<entity>/import/errors/<name>")
+@login_required
+def import_errors(entity: str, name: str):
+    if not check_permission(entity):
+        abort(403)
+    if not name.startswith(f"{entity}-"):
+        abort(404)
+    return send_from_directory(app_config.import_errors_path, name, as_attachment=True)
+
+
+def bulk_selection() -> dict:
+    """Read ids/filter/values from a JSON body, or repeated ids from a form post."""
+    payload = request.get_json(silent=True) or {}
+    ids = payload.get("ids") or request.form.getlist("ids", type=int)
+    return {
+        "ids": ids or None,
+        "filters": payload.get("filter") or None,
+        "values": payload.get("values") or {},
+    }
+
+
+def bulk_allowed(entity: str, action: str) -> bool:
+    """The user may open the entity and the entity allows the action."""
+    return check_permission(entity) and EntityConfigManager.get(entity).actions.get(action, True)
+
+
+@admin_bp.route("/<entity>/bulk-delete", methods=["POST"])
+@login_required
+def bulk_delete_records(entity: str):
+    if not bulk_allowed(entity, "delete"):
+        return jsonify({"ok": False, "error": tr("error.unauthorized")}), 403
+    
+    selection = bulk_selection()
+    batch_size = app_config.get("bulk.batch_size", 500)
+    result = bulk_delete(entity, selection["ids"], selection["filters"], batch_size)
+    
+    if result.get("success"):
+        return jsonify({"ok": True, "deleted": result["deleted"]})
+    return jsonify({"ok": False, "errors": result.get("errors", result.get("error"))}), 400
+
+
+@admin_bp.route("/<entity>/bulk-update", methods=["POST"])
+@login_required
+def bulk_update_records(entity: str):
+    if not bulk_allowed(entity, "edit"):
+        return jsonify({"ok": False, "error": tr("error.unauthorized")}), 403
+    
+    selection = bulk_selection()
+    batch_size = app_config.get("bulk.batch_size", 500)
+    result = bulk_update(
+        entity, selection["values"], selection["ids"], selection["filters"], batch_size
+    )
+    
+    if result.get("success"):
+        return jsonify({"ok": True, "updated": result["updated"]})
+    return jsonify({"ok": False, "errors": result.get("errors", result.get("error"))}), 400
+
+
 @admin_bp.route("/subgrid")
 @login_required
 def subgrid():
@@ -508,29 +906,104 @@ def subgrid():
     if not check_permission(entity):
         return jsonify({"success": False, "error": tr("error.unauthorized")}), 403
     
+    include_schema = request.args.get("schema", type=int) == 1
+    columnar = request.args.get("format") == "columns"
+    since = request.args.get("since", type=int)
+    data = get_subgrid_data(
+        entity,
+        parent_id=parent_id,
+        foreign_key=foreign_key,
+        include_schema=include_schema,
+        columnar=columnar,
+        since=since,
+    )
+    if not data["success"]:
+        return jsonify(data), 404
+    return json_response(data) if columnar else jsonify(data)
+
+
+@admin_bp.route("/events")
+@login_required
+def events():
+    """Server-Sent Events stream of changes to the requested entities the user may see."""
+    if not events_enabled():
+        abort(404)
+    
+    requested = [e for e in request.args.get("entities", "").split(",") if e]
+    allowed = {e for e in requested if check_permission(e)}
+    if not allowed:
+        return jsonify({"success": False, "error": tr("error.unauthorized")}), 403
+    
+    last_id = request.headers.get("Last-Event-ID", type=int)
+    response = Response(change_stream(allowed, last_id), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@admin_bp.route("/schema/<entity>")
+@login_required
+def schema(entity: str):
+    """Grid schema of an entity. Immutable once requested with its current version."""
+    if not check_permission(entity):
+        return jsonify({"success": False, "error": tr("error.unauthorized")}), 403
+    
     config = EntityConfigManager.get(entity)
-    if not config:
-        return jsonify({"success": False, "error": "Entity not found"}), 404
-    
-    rows = list_records(entity, parent_id=parent_id, foreign_key=foreign_key)
-    
-    fields = {}
-    field_options = {}
-    field_types = {}
-    for field in config.get_display_fields():
-        fields[field.id] = field.label
-        field_types[field.id] = field.type
-        if field.options:
-            field_options[field.id] = {str(opt.get("value", "")): opt.get("label", "") for opt in field.options}
-    
-    return jsonify({
-        "success": True,
-        "rows": rows,
-        "fields": fields,
-        "field_types": field_types,
-        "field_options": field_options,
-        "actions": config.actions
-    })
+    response = jsonify({"success": True, "version": config.schema_version, **config.schema})
+    if request.args.get("v") == config.schema_version:
+        response.headers["Cache-Control"] = "private, max-age=31536000, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@admin_bp.route("/subgrids")
+@login_required
+def subgrids():
+    """
+    Data for several subgrids of one parent record in a single response.
+    
+    Each subgrid is queried on its own worker thread with its own app
+    context, so the queries run concurrently on separate pooled connections.
+    """
+    parent_entity = request.args.get("parent_entity", "")
+    parent_id = request.args.get("parent_id", type=int)
+    only = set(filter(None, request.args.get("entities", "").split(",")))
+    columnar = request.args.get("format") == "columns"
+    
+    parent = EntityConfigManager.get(parent_entity)
+    if not parent or not parent_id:
+        return jsonify({"success": False, "error": "Parent required"}), 400
+    
+    if not check_permission(parent_entity):
+        return jsonify({"success": False, "error": tr("error.unauthorized")}), 403
+    
+    wanted = [sg for sg in parent.subgrids if not only or sg.entity in only]
+    results = {}
+    jobs = []
+    for sg in wanted:
+        if check_permission(sg.entity):
+            jobs.append(sg)
+        else:
+            results[sg.entity] = {"success": False, "error": tr("error.unauthorized")}
+    
+    def load(sg):
+        data = get_subgrid_data(
+            sg.entity, parent_id=parent_id, foreign_key=sg.foreign_key, columnar=columnar
+        )
+        return sg.entity, data
+    
+    if len(jobs) > 1:
+        workers = min(len(jobs), app_config.get("subgrid.max_workers", 4))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(copy_current_request_context(load), sg) for sg in jobs]
+            loaded = [future.result() for future in futures]
+    else:
+        loaded = [load(sg) for sg in jobs]
+    
+    results.update(loaded)
+    payload = {"success": True, "subgrids": results}
+    return json_response(payload) if columnar else jsonify(payload)
 '''
 
 
@@ -544,23 +1017,33 @@ Entity Configuration Engine
 from dataclasses import dataclass, field
 from typing import Any, Callable, Optional
 from pathlib import Path
+import hashlib
+import json
 import yaml
 
+from config import load_yaml
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class FieldConfig:
     id: str
     label: str
     type: str
     required: bool = False
     placeholder: Optional[str] = None
-    options: list = field(default_factory=list)
+    options: tuple = ()
     hidden_in_grid: bool = False
     hidden_in_form: bool = False
     grid_only: bool = False
     fk: Optional[str] = None
     fk_id: Optional[str] = None
     fk_label: Optional[str] = None
+    option_labels: dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "options", tuple(self.options))
+        labels = {str(opt.get("value", "")): opt.get("label", "") for opt in self.options}
+        object.__setattr__(self, "option_labels", labels)
     
     @classmethod
     def from_dict(cls, data: dict) -> "FieldConfig":
@@ -580,7 +1063,7 @@ class FieldConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SubgridConfig:
     entity: str
     title: str
@@ -599,21 +1082,53 @@ class SubgridConfig:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EntityConfig:
+    """
+    Immutable entity metadata. The field views below are computed once
+    when the config is built, so requests never re-filter the field list.
+    """
     entity: str
     title: str
     table: str
     connection: str = "default"
-    rights: list = field(default_factory=lambda: ["U", "A", "S"])
+    rights: tuple = ("U", "A", "S")
     menu_category: Optional[str] = None
     menu_order: int = 999
     menu_hidden: bool = False
-    fields: list = field(default_factory=list)
+    fields: tuple = ()
     queries: dict = field(default_factory=dict)
     actions: dict = field(default_factory=lambda: {"new": True, "edit": True, "delete": True})
     hooks: dict = field(default_factory=dict)
-    subgrids: list = field(default_factory=list)
+    subgrids: tuple = ()
+    version_column: Optional[str] = None
+    display_fields: tuple = field(init=False, repr=False, compare=False)
+    form_fields: tuple = field(init=False, repr=False, compare=False)
+    field_map: dict = field(init=False, repr=False, compare=False)
+    schema: dict = field(init=False, repr=False, compare=False)
+    schema_version: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        fields = tuple(self.fields)
+        display_fields = tuple(
+            f for f in fields if f.type not in ("hidden", "password") and not f.hidden_in_grid
+        )[:8]
+        object.__setattr__(self, "fields", fields)
+        object.__setattr__(self, "rights", tuple(self.rights))
+        object.__setattr__(self, "subgrids", tuple(self.subgrids))
+        object.__setattr__(self, "display_fields", display_fields)
+        form_fields = tuple(f for f in fields if not f.grid_only and not f.hidden_in_form)
+        object.__setattr__(self, "form_fields", form_fields)
+        object.__setattr__(self, "field_map", {f.id: f for f in fields})
+        object.__setattr__(self, "schema", {
+            "fields": {f.id: f.label for f in display_fields},
+            "field_types": {f.id: f.type for f in display_fields},
+            "field_options": {f.id: f.option_labels for f in display_fields if f.option_labels},
+            "actions": self.actions,
+        })
+        schema_json = json.dumps(self.schema, sort_keys=True, default=str)
+        schema_version = hashlib.sha1(schema_json.encode()).hexdigest()[:12]
+        object.__setattr__(self, "schema_version", schema_version)
     
     @classmethod
     def from_dict(cls, data: dict) -> "EntityConfig":
@@ -633,18 +1148,21 @@ class EntityConfig:
             actions=data.get("actions", {"new": True, "edit": True, "delete": True}),
             hooks=data.get("hooks", {}),
             subgrids=subgrids,
+            version_column=data.get("version_column"),
         )
     
-    def get_display_fields(self) -> list:
-        return [f for f in self.fields if f.type not in ("hidden", "password") and not f.hidden_in_grid][:8]
+    def get_display_fields(self) -> tuple:
+        return self.display_fields
     
-    def get_form_fields(self) -> list:
-        return [f for f in self.fields if not f.grid_only and not f.hidden_in_form]
+    def get_form_fields(self) -> tuple:
+        return self.form_fields
 
 
 class EntityConfigManager:
     _configs: dict = {}
     _hooks: dict = {}
+    _sources: dict = {}
+    _version: int = 0
     
     @classmethod
     def load_all(cls, path: str = "resources/entities") -> None:
@@ -656,22 +1174,63 @@ class EntityConfigManager:
     
     @classmethod
     def load_file(cls, file_path: Path) -> None:
-        with open(file_path, "r") as f:
-            data = yaml.safe_load(f)
+        cls.load_data(file_path, load_yaml(file_path))
+    
+    @classmethod
+    def load_data(cls, file_path: Path, data: Optional[dict]) -> None:
+        """Register an entity from its parsed YAML (from disk or the config snapshot)."""
         if data:
             config = EntityConfig.from_dict(data)
             cls._configs[config.entity] = config
-            cls._load_hooks(config)
+            cls._hooks[config.entity] = cls._load_hooks(config)
+            cls._sources[str(file_path)] = config.entity
+            cls._version += 1
+    
+    @classmethod
+    def _parse_file(cls, file_path: Path) -> Optional[EntityConfig]:
+        data = load_yaml(file_path)
+        return EntityConfig.from_dict(data) if data else None
+    
+    @classmethod
+    def reload_files(cls, changed: list, removed: list = ()) -> list:
+        """
+        Re-parse changed entity files and drop removed ones.
+        
+        The new configs are built on copies and swapped in with a single
+        assignment, so requests in flight see either the old or the new set.
+        A file that fails to parse keeps its previous config.
+        """
+        configs, hooks, sources = dict(cls._configs), dict(cls._hooks), dict(cls._sources)
+        reloaded = []
+        
+        for file_path in removed:
+            entity = sources.pop(str(file_path), None)
+            if entity:
+                configs.pop(entity, None)
+                hooks.pop(entity, None)
+                reloaded.append(entity)
+        
+        for file_path in changed:
+            try:
+                config = cls._parse_file(file_path)
+            except (OSError, yaml.YAMLError, TypeError, ValueError) as e:
+                print(f"[ERROR] Reload of {file_path} failed: {e}")
+                continue
+            if config:
+                configs[config.entity] = config
+                hooks[config.entity] = cls._load_hooks(config)
+                sources[str(file_path)] = config.entity
+                reloaded.append(config.entity)
+        
+        if reloaded:
+            cls._configs, cls._hooks, cls._sources = configs, hooks, sources
+            cls._version += 1
+        return reloaded
     
     @classmethod
-    def _load_hooks(cls, config: EntityConfig) -> None:
-        hook_functions = {}
-        for hook_name, hook_path in config.hooks.items():
-            func = cls._resolve_hook(hook_path)
-            if func:
-                hook_functions[hook_name] = func
-        if hook_functions:
-            cls._hooks[config.entity] = hook_functions
+    def _load_hooks(cls, config: EntityConfig) -> dict:
+        # Dotted paths for now; get_hook imports each one the first time it is called
+        return dict(config.hooks)
     
     @classmethod
     def _resolve_hook(cls, hook_path: str):
@@ -691,9 +1250,18 @@ class EntityConfigManager:
     def get_all(cls) -> dict:
         return cls._configs.copy()
     
+    @classmethod
+    def get_version(cls) -> int:
+        """Incremented whenever a config is (re)loaded; caches built from configs compare it."""
+        return cls._version
+    
     @classmethod
     def get_hook(cls, entity: str, hook_name: str):
-        return cls._hooks.get(entity, {}).get(hook_name)
+        hooks = cls._hooks.get(entity, {})
+        hook = hooks.get(hook_name)
+        if isinstance(hook, str):
+            hook = hooks[hook_name] = cls._resolve_hook(hook)
+        return hook
     
     @classmethod
     def list_entities(cls) -> list:
@@ -723,25 +1291,38 @@ class EntityConfigManager:
 ENGINE_MENU = '''"""
 Menu Generation from Entity Configs
 """
+from typing import Optional
+
 from engine import EntityConfigManager
+from i18n import I18N
 
 
-def get_auto_menu_config() -> dict:
-    """Generate menu configuration from entity configs."""
+def menu_label(name: str, cfg, locale: Optional[str] = None) -> str:
+    """Translated menu label (menu.<entity>), falling back to the entity title."""
+    key = f"menu.{name}"
+    label = I18N.translate(key, locale=locale)
+    return cfg.title if label == key else label
+
+
+def get_auto_menu_config(level: Optional[str] = None, locale: Optional[str] = None) -> dict:
+    """Generate menu configuration from entity configs, limited to the entities `level` may open."""
     entities = EntityConfigManager.get_all()
     
     nav_links = []
     dropdowns = {}
+    category_order = {}
     
     for name, cfg in entities.items():
         if getattr(cfg, 'menu_hidden', False):
             continue
+        if level is not None and level not in cfg.rights:
+            continue
         
         icon = "bi bi-folder"
         menu_order = getattr(cfg, 'menu_order', 999)
         
         item = {
-            "label": cfg.title,
+            "label": menu_label(name, cfg, locale),
             "href": f"/admin/{name}/",
             "icon": icon,
             "order": menu_order,
@@ -749,9 +1330,8 @@ def get_auto_menu_config() -> dict:
         
         category = getattr(cfg, 'menu_category', None)
         if category:
-            if category not in dropdowns:
-                dropdowns[category] = {"items": [], "order": menu_order}
-            dropdowns[category]["items"].append(item)
+            dropdowns.setdefault(category, []).append(item)
+            category_order[category] = min(category_order.get(category, menu_order), menu_order)
         else:
             nav_links.append(item)
     
@@ -759,12 +1339,15 @@ def get_auto_menu_config() -> dict:
     nav_links.sort(key=lambda x: x.get("order", 999))
     
     # Sort dropdown items and dropdowns themselves
-    for category in dropdowns:
-        dropdowns[category]["items"].sort(key=lambda x: x.get("order", 999))
+    for items in dropdowns.values():
+        items.sort(key=lambda x: x.get("order", 999))
     
     return {
         "nav_links": nav_links,
-        "dropdowns": dropdowns,
+        "dropdowns": {
+            category: dropdowns[category]
+            for category in sorted(dropdowns, key=category_order.get)
+        },
     }
 '''
 
@@ -779,6 +1362,13 @@ from werkzeug.utils import secure_filename
 
 from models import db
 from engine import EntityConfigManager
+from engine.events import publish
+from engine.sync import next_row_version, record_tombstones
+from engine.thumbnails import queue_thumbnails
+from engine.uploads import (
+    UPLOAD_REF, acquire, content_enabled, content_names, finish_upload, release, store_content,
+    store_file, sweep_unreferenced, upload_path,
+)
 from config import config
 
 
@@ -801,6 +1391,55 @@ def get_model_class(table_name: str):
     return None
 
 
+DATA_VERSIONS: dict[str, int] = {}
+
+
+def bump_version(
+    entity: str, action: str = "save", ids: Optional[list] = None, user_id: Optional[int] = None
+) -> int:
+    """
+    Mark an entity's data as changed and publish the change to the live feed.
+    
+    Called once per committed write, however many rows; ids=None means
+    the changed rows are unknown.
+    """
+    DATA_VERSIONS[entity] = DATA_VERSIONS.get(entity, 0) + 1
+    publish(entity, action, ids, user_id)
+    return DATA_VERSIONS[entity]
+
+
+def file_values(cfg, record) -> dict:
+    return {f.id: getattr(record, f.id, None) for f in cfg.fields if f.type == "file"}
+
+
+def table_file_columns(table: str) -> list[str]:
+    """File fields any entity declares on a table; cascaded child rows are known by table only."""
+    return sorted({
+        f.id for cfg in EntityConfigManager.get_all().values() if cfg.table == table
+        for f in cfg.fields if f.type == "file"
+    })
+
+
+def cascaded_file_names(record) -> list[str]:
+    """Content names held by the rows that delete-cascading relationships remove with record."""
+    names = []
+    for rel in type(record).__mapper__.relationships:
+        if not rel.cascade.delete or rel.direction.name != "ONETOMANY":
+            continue
+        for child in getattr(record, rel.key):
+            columns = table_file_columns(child.__tablename__)
+            names += content_names(getattr(child, name, None) for name in columns)
+            names += cascaded_file_names(child)
+    return names
+
+
+def sweep_uploads() -> None:
+    try:
+        sweep_unreferenced()
+    except Exception as e:
+        print(f"[ERROR] Upload sweep failed: {e}")
+
+
 def save_record(entity: str, data: dict, files: Optional[dict] = None, user_id: Optional[int] = None) -> dict:
     cfg = EntityConfigManager.get(entity)
     if not cfg:
@@ -814,13 +1453,23 @@ def save_record(entity: str, data: dict, files: Optional[dict] = None, user_id:
     if not model_class:
         return {"success": False, "error": "Model not found"}
     
+    # File fields sent through /admin/uploads arrive as "upload:<id>"
+    uploads = {
+        key: value[len(UPLOAD_REF):] for key, value in data.items()
+        if isinstance(value, str) and value.startswith(UPLOAD_REF)
+        and getattr(cfg.field_map.get(key), "type", None) == "file"
+    }
+    data = {key: value for key, value in data.items() if key not in uploads}
+    
     record_id = data.get("id")
+    previous = {}
     
     try:
         if record_id:
             record = db.session.get(model_class, record_id)
             if not record:
                 return {"success": False, "error": "Record not found"}
+            previous = file_values(cfg, record)
             
             for key, value in data.items():
                 if key != "id" and hasattr(record, key):
@@ -847,153 +1496,2518 @@ def save_record(entity: str, data: dict, files: Optional[dict] = None, user_id:
                         if filename and hasattr(record, field_name):
                             setattr(record, field_name, filename)
         
+        for field_name, upload_id in uploads.items():
+            filename = handle_chunked_upload(upload_id, cfg.table, record.id, user_id)
+            if filename and hasattr(record, field_name):
+                setattr(record, field_name, filename)
+        
+        # Content-addressed files are shared; count which records use them
+        current = file_values(cfg, record)
+        changed = [key for key, value in current.items() if value != previous.get(key)]
+        acquire(content_names(current[key] for key in changed))
+        release(content_names(previous.get(key) for key in changed))
+        
+        if cfg.version_column and hasattr(record, cfg.version_column):
+            setattr(record, cfg.version_column, next_row_version())
+        
         db.session.commit()
         db.session.refresh(record)
+        bump_version(entity, "save", [record.id], user_id)
         
         execute_hook(entity, "after_save", {"id": record.id, "data": data})
         
         return {"success": True, "id": record.id}
     
-    except Exception as e:
-        db.session.rollback()
-        return {"success": False, "error": str(e)}
+    except Exception as e:
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
+
+
+def delete_record(entity: str, record_id: int, user_id: Optional[int] = None) -> dict:
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return {"success": False, "error": "Entity not found"}
+    
+    execute_hook(entity, "before_delete", {"id": record_id})
+    
+    model_class = get_model_class(cfg.table)
+    if not model_class:
+        return {"success": False, "error": "Model not found"}
+    
+    try:
+        record = db.session.get(model_class, record_id)
+        if not record:
+            return {"success": False, "error": "Record not found"}
+        
+        released = content_names(file_values(cfg, record).values()) + cascaded_file_names(record)
+        db.session.delete(record)
+        if cfg.version_column:
+            record_tombstones(entity, [record_id])
+        release(released)
+        db.session.commit()
+        bump_version(entity, "delete", [record_id], user_id)
+        
+        execute_hook(entity, "after_delete", {"id": record_id})
+        if released:
+            sweep_uploads()
+        
+        return {"success": True}
+    
+    except Exception as e:
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
+
+
+def handle_file_upload(file: FileStorage, table: str, record_id: int) -> Optional[str]:
+    if not file or not file.filename:
+        return None
+    
+    ext = file.filename.rsplit(".", 1)[-1].lower()
+    if ext not in config.allowed_image_extensions:
+        return None
+    
+    if content_enabled():
+        filename, created = store_content(file.stream, ext)
+        if created:
+            queue_thumbnails(upload_path(filename))
+        return filename
+    
+    filename = secure_filename(f"{table}_{record_id}.{ext}")
+    uploads_dir = config.uploads_path
+    
+    import os
+    os.makedirs(uploads_dir, exist_ok=True)
+    
+    file_path = os.path.join(uploads_dir, filename)
+    file.save(file_path)
+    queue_thumbnails(file_path)
+    
+    return filename
+
+
+def handle_chunked_upload(
+    upload_id: str, table: str, record_id: int, user_id: Optional[int]
+) -> Optional[str]:
+    """Move a finished chunked upload into place under the name handle_file_upload would give it."""
+    import os
+    source, original_name = finish_upload(upload_id, user_id)
+    ext = original_name.rsplit(".", 1)[-1].lower()
+    if ext not in config.allowed_image_extensions:
+        os.remove(source)
+        return None
+    
+    if content_enabled():
+        filename, created = store_file(source, ext)
+        if created:
+            queue_thumbnails(upload_path(filename))
+        return filename
+    
+    filename = secure_filename(f"{table}_{record_id}.{ext}")
+    file_path = os.path.join(config.uploads_path, filename)
+    os.replace(source, file_path)
+    queue_thumbnails(file_path)
+    
+    return filename
+'''
+
+
+def get_engine_query() -> str:
+    return '''"""
+Engine Query - Data Query Operations
+"""
+import re
+from typing import Iterator, Optional, Any
+from sqlalchemy import select, text
+
+from models import db
+from engine import EntityConfigManager
+from engine.export import sensitive_columns, strip_sensitive
+from engine.sync import delta_available, deleted_since, sync_token
+from engine.uploads import link_upload_columns, link_uploads
+
+
+WHERE = re.compile(r"\\bWHERE\\b", re.IGNORECASE)
+ORDER_BY = re.compile(r"\\bORDER\\s+BY\\b", re.IGNORECASE)
+
+
+def get_model_class(table_name: str):
+    import models
+    for attr_name in dir(models):
+        attr = getattr(models, attr_name)
+        if hasattr(attr, '__tablename__') and attr.__tablename__ == table_name:
+            return attr
+    return None
+
+
+def execute_hook(entity: str, hook_name: str, data) -> Any:
+    hook = EntityConfigManager.get_hook(entity, hook_name)
+    if hook:
+        try:
+            return hook(data)
+        except Exception as e:
+            print(f"[ERROR] Hook {hook_name} failed: {e}")
+    return data
+
+
+def filter_query(query: str, clauses: list[str]) -> str:
+    """Inject WHERE/AND conditions into a list query, ahead of its ORDER BY."""
+    if not clauses:
+        return query
+    
+    condition = " AND ".join(clauses)
+    order_by = list(ORDER_BY.finditer(query))
+    order_pos = order_by[-1].start() if order_by else -1
+    head, tail = (query[:order_pos], query[order_pos:]) if order_pos != -1 else (query, "")
+    keyword = "AND" if WHERE.search(head) else "WHERE"
+    return f"{head.rstrip()} {keyword} {condition} {tail}".rstrip()
+
+
+def build_list_query(
+    cfg,
+    model_class,
+    parent_id: Optional[int] = None,
+    foreign_key: Optional[str] = None,
+    since: Optional[int] = None,
+) -> tuple[str, dict]:
+    """Return the list SQL and bind params, filtered by parent and row version when given."""
+    query = cfg.queries.get("list") or f"SELECT * FROM {cfg.table}"
+    clauses = []
+    params = {}
+    
+    if parent_id and foreign_key and foreign_key in model_class.__table__.columns:
+        clauses.append(f"{foreign_key} = :parent_id")
+        params["parent_id"] = parent_id
+    
+    versioned = cfg.version_column and cfg.version_column in model_class.__table__.columns
+    if since is not None and versioned:
+        clauses.append(f"{cfg.version_column} >= :since")
+        params["since"] = since
+    
+    return filter_query(query, clauses), params
+
+
+def list_records(
+    entity: str,
+    parent_id: Optional[int] = None,
+    parent_entity: Optional[str] = None,
+    foreign_key: Optional[str] = None,
+    since: Optional[int] = None,
+) -> list[dict]:
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return []
+    
+    execute_hook(entity, "before_load", {"entity": entity})
+    
+    model_class = get_model_class(cfg.table)
+    if not model_class:
+        return []
+    
+    query = cfg.queries.get("list")
+    
+    if query:
+        query, params = build_list_query(cfg, model_class, parent_id, foreign_key, since)
+        result = db.session.execute(text(query), params)
+        rows = [dict(row._mapping) for row in result]
+    else:
+        records = db.session.query(model_class)
+        if parent_id and foreign_key:
+            records = records.filter(getattr(model_class, foreign_key) == parent_id)
+        if since is not None and cfg.version_column:
+            records = records.filter(getattr(model_class, cfg.version_column) >= since)
+        records = records.all()
+        
+        rows = [{c.name: getattr(r, c.name) for c in model_class.__table__.columns} for r in records]
+    
+    rows = execute_hook(entity, "after_load", rows)
+    
+    return rows if isinstance(rows, list) else []
+
+
+def stream_records(
+    entity: str,
+    chunk_size: int = 1000,
+    parent_id: Optional[int] = None,
+    foreign_key: Optional[str] = None,
+) -> Iterator[list[dict]]:
+    """
+    Yield records in chunks from a server-side cursor.
+    
+    after_load runs once per chunk, so memory stays bounded by chunk_size
+    no matter how large the table is.
+    """
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return
+    
+    execute_hook(entity, "before_load", {"entity": entity})
+    
+    model_class = get_model_class(cfg.table)
+    if not model_class:
+        return
+    
+    query, params = build_list_query(cfg, model_class, parent_id, foreign_key)
+    statement = text(query).execution_options(stream_results=True, yield_per=chunk_size)
+    result = db.session.execute(statement, params)
+    
+    for partition in result.mappings().partitions(chunk_size):
+        rows = execute_hook(entity, "after_load", [dict(row) for row in partition])
+        if isinstance(rows, list) and rows:
+            yield rows
+
+
+def get_record(entity: str, record_id: int) -> Optional[dict]:
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return None
+    
+    model_class = get_model_class(cfg.table)
+    if not model_class:
+        return None
+    
+    query = cfg.queries.get("get")
+    
+    if query:
+        result = db.session.execute(text(query), {"id": record_id})
+        row = result.fetchone()
+        if row:
+            return dict(row._mapping)
+        return None
+    else:
+        record = db.session.get(model_class, record_id)
+        if record:
+            return {c.name: getattr(record, c.name) for c in model_class.__table__.columns}
+        return None
+
+
+def loaded_row(entity: str, row: dict) -> Optional[dict]:
+    """Pass a single fetched row through the after_load hook, as listed rows are."""
+    rows = execute_hook(entity, "after_load", [dict(row)])
+    return rows[0] if isinstance(rows, list) and rows else None
+
+
+def list_columns(
+    entity: str,
+    parent_id: Optional[int] = None,
+    foreign_key: Optional[str] = None,
+    since: Optional[int] = None,
+) -> dict:
+    """
+    Records as {"columns": [...], "data": [[...], ...]}, without sensitive columns.
+    
+    The rows come straight from the result tuples. The default query
+    selects only id and the non-sensitive display columns; a custom list
+    query is filtered by column index instead. after_load works on dict
+    rows, so an entity with after_load but no after_load_columns hook is
+    loaded through list_records() and converted. after_load_columns
+    receives and returns the {"columns", "data"} payload itself.
+    """
+    cfg = EntityConfigManager.get(entity)
+    model_class = get_model_class(cfg.table) if cfg else None
+    if not model_class:
+        return {"columns": [], "data": []}
+    excluded = sensitive_columns(entity)
+    column_hook = EntityConfigManager.get_hook(entity, "after_load_columns")
+    
+    if not column_hook and EntityConfigManager.get_hook(entity, "after_load"):
+        rows = list_records(entity, parent_id=parent_id, foreign_key=foreign_key, since=since)
+        columns = [c for c in rows[0].keys() if c not in excluded] if rows else []
+        return {"columns": columns, "data": [[row.get(c) for c in columns] for row in rows]}
+    
+    execute_hook(entity, "before_load", {"entity": entity})
+    
+    if cfg.queries.get("list"):
+        query, params = build_list_query(cfg, model_class, parent_id, foreign_key, since)
+        result = db.session.execute(text(query), params)
+        keys = list(result.keys())
+        keep = [i for i, column in enumerate(keys) if column not in excluded]
+        payload = {
+            "columns": [keys[i] for i in keep],
+            "data": [tuple(row[i] for i in keep) for row in result],
+        }
+    else:
+        table = model_class.__table__
+        fields = [
+            f.id for f in cfg.display_fields
+            if f.id in table.c and f.id != "id" and f.id not in excluded
+        ]
+        statement = select(table.c.id, *(table.c[name] for name in fields))
+        if parent_id and foreign_key and foreign_key in table.c:
+            statement = statement.where(table.c[foreign_key] == parent_id)
+        if since is not None and cfg.version_column and cfg.version_column in table.c:
+            statement = statement.where(table.c[cfg.version_column] >= since)
+        result = db.session.execute(statement)
+        payload = {"columns": list(result.keys()), "data": [tuple(row) for row in result]}
+    
+    if column_hook:
+        payload = execute_hook(entity, "after_load_columns", payload)
+    return payload
+
+
+def get_subgrid_data(
+    entity: str,
+    parent_id: Optional[int] = None,
+    foreign_key: Optional[str] = None,
+    include_schema: bool = False,
+    columnar: bool = False,
+    since: Optional[int] = None,
+) -> dict:
+    """
+    Subgrid rows plus the version of the entity schema they follow.
+    
+    Clients fetch the schema itself once from /admin/schema/<entity>?v=...
+    unless include_schema asks for it inline. columnar returns
+    columns/data arrays instead of a list of row dicts.
+    
+    For entities with a version_column the payload carries a sync
+    "version"; passing it back as since returns only the rows changed
+    after it plus the ids deleted since ("delta": true).
+    """
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return {"success": False, "error": "Entity not found"}
+    
+    if since is not None and not (cfg.version_column and delta_available(since)):
+        since = None
+    token = sync_token() if cfg.version_column else None
+    
+    if columnar:
+        result = list_columns(entity, parent_id, foreign_key, since)
+        data = {
+            "success": True,
+            "columns": result["columns"],
+            "data": link_upload_columns(entity, result["columns"], result["data"]),
+            "schema_version": cfg.schema_version,
+        }
+    else:
+        data = {
+            "success": True,
+            "rows": link_uploads(entity, [
+                strip_sensitive(entity, row)
+                for row in list_records(entity, parent_id, foreign_key=foreign_key, since=since)
+            ]),
+            "schema_version": cfg.schema_version,
+        }
+    
+    if token is not None:
+        data["version"] = token
+        if since is not None:
+            data["delta"] = True
+            data["deleted"] = deleted_since(entity, since)
+    if include_schema:
+        data.update(cfg.schema)
+    return data
+'''
+
+
+def get_engine_serialize() -> str:
+    return '''"""
+Engine Serialize - Fast JSON encoding for grid payloads
+
+Uses orjson when installed and the standard library otherwise. Both
+paths write dates as ISO 8601 and Decimals as strings, so the output
+does not depend on which encoder is present.
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    text = json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def json_response(value: Any, status: int = 200) -> Response:
+    return Response(dumps(value), status=status, mimetype="application/json")
+'''
+
+
+def get_engine_sync() -> str:
+    return '''"""
+Engine Sync - Row versions and tombstones for subgrid delta sync
+
+Entities that declare a version_column get a new row version on every
+write and a tombstone for every deleted row, so a client can ask for
+what changed since the version it already holds.
+"""
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import column, delete, insert, select, table
+
+from config import config
+from models import db
+
+
+ROW_TOMBSTONES = table("row_tombstones", column("entity"), column("record_id"), column("version"))
+
+_lock = threading.Lock()
+_last_version = 0
+
+
+def _now() -> int:
+    return time.time_ns() // 1000
+
+
+def next_row_version() -> int:
+    """Microseconds since the epoch, strictly increasing within the process."""
+    global _last_version
+    with _lock:
+        _last_version = max(_now(), _last_version + 1)
+        return _last_version
+
+
+def sync_token() -> int:
+    """
+    Version to hand back to clients as their next since.
+    
+    Lags the clock by sync.skew_seconds so rows written by transactions
+    still in flight (or by workers with a slightly late clock) are
+    picked up again on the next delta instead of being missed.
+    """
+    return _now() - int(config.get("sync.skew_seconds", 5) * 1_000_000)
+
+
+def _retention_start() -> int:
+    return _now() - int(config.get("sync.tombstone_days", 7) * 86400 * 1_000_000)
+
+
+def delta_available(since: Optional[int]) -> bool:
+    """Tombstones are pruned after sync.tombstone_days; older clients need a full reload."""
+    return since is not None and since >= _retention_start()
+
+
+def record_tombstones(entity: str, ids: list) -> None:
+    """Add tombstones for deleted rows to the current transaction and prune expired ones."""
+    if not ids:
+        return
+    
+    version = next_row_version()
+    rows = [{"entity": entity, "record_id": i, "version": version} for i in ids]
+    db.session.execute(insert(ROW_TOMBSTONES), rows)
+    db.session.execute(
+        delete(ROW_TOMBSTONES).where(
+            ROW_TOMBSTONES.c.entity == entity, ROW_TOMBSTONES.c.version < _retention_start()
+        )
+    )
+
+
+def deleted_since(entity: str, since: int) -> list:
+    query = select(ROW_TOMBSTONES.c.record_id).where(
+        ROW_TOMBSTONES.c.entity == entity, ROW_TOMBSTONES.c.version >= since
+    )
+    return list(db.session.execute(query).scalars())
+'''
+
+
+def get_engine_events() -> str:
+    return '''"""
+Engine Events - Change feed for live grid updates
+
+Every committed write publishes a change event. Events are appended to a
+small SQLite log (events.path) shared by all worker processes; one poller
+thread per process tails the log into an in-memory buffer and wakes the
+Server-Sent Events streams waiting on it. A publish wakes the local poller
+at once; other workers pick it up within events.poll_interval.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from config import config
+
+
+BUFFER_SIZE = 1000
+MAX_EVENT_IDS = 500
+PRUNE_EVERY = 100
+
+_condition = threading.Condition()
+_buffer: deque = deque(maxlen=BUFFER_SIZE)
+_cursor = 0
+_floor = 0
+_wake = threading.Event()
+_poller: Optional[threading.Thread] = None
+
+_db_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_published = 0
+
+
+def enabled() -> bool:
+    return bool(config.get("events.enabled", False))
+
+
+def _connection() -> sqlite3.Connection:
+    """The process-wide connection to the event log. Call with _db_lock held."""
+    global _conn
+    if _conn is None:
+        path = Path(config.get("events.path", "db/events.sqlite"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, entity TEXT NOT NULL, action TEXT NOT NULL, "
+            "ids TEXT, user_id INTEGER, created REAL NOT NULL)"
+        )
+    return _conn
+
+
+def publish(
+    entity: str, action: str, ids: Optional[Iterable] = None, user_id: Optional[int] = None
+) -> None:
+    """
+    Append a change to the log.
+    
+    ids is None when the change can't be narrowed to rows (imports, very
+    large bulk operations); clients then resync the whole grid. Never
+    raises: a lost event only means a client refreshes later.
+    """
+    global _published
+    if not enabled():
+        return
+    
+    ids = list(ids) if ids is not None else None
+    if ids is not None and len(ids) > MAX_EVENT_IDS:
+        ids = None
+    
+    try:
+        ids_json = json.dumps(ids, default=str) if ids is not None else None
+        with _db_lock:
+            conn = _connection()
+            conn.execute(
+                "INSERT INTO events (entity, action, ids, user_id, created) VALUES (?, ?, ?, ?, ?)",
+                (entity, action, ids_json, user_id, time.time()),
+            )
+            _published += 1
+            if _published % PRUNE_EVERY == 0:
+                retention = float(config.get("events.retention_seconds", 300))
+                conn.execute("DELETE FROM events WHERE created < ?", (time.time() - retention,))
+    except Exception as e:
+        print(f"[WARN] Change event for {entity} not published: {e}")
+        return
+    _wake.set()
+
+
+def _poll() -> None:
+    global _cursor, _floor
+    interval = float(config.get("events.poll_interval", 1.0))
+    while True:
+        _wake.wait(interval)
+        _wake.clear()
+        try:
+            with _db_lock:
+                rows = _connection().execute(
+                    "SELECT id, entity, action, ids, user_id FROM events"
+                    " WHERE id > ? ORDER BY id LIMIT ?",
+                    (_cursor, BUFFER_SIZE),
+                ).fetchall()
+        except Exception as e:
+            print(f"[WARN] Reading the change feed failed: {e}")
+            continue
+        if not rows:
+            continue
+        
+        with _condition:
+            for event_id, entity, action, ids, user_id in rows:
+                if len(_buffer) == BUFFER_SIZE:
+                    _floor = _buffer[0]["id"]
+                _buffer.append({
+                    "id": event_id,
+                    "entity": entity,
+                    "action": action,
+                    "ids": json.loads(ids) if ids else None,
+                    "user": user_id,
+                })
+            _cursor = rows[-1][0]
+            _condition.notify_all()
+
+
+def _start_poller() -> None:
+    global _poller, _cursor, _floor
+    with _condition:
+        if _poller is not None:
+            return
+        with _db_lock:
+            latest = _connection().execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()
+            _cursor = _floor = latest[0]
+        _poller = threading.Thread(target=_poll, name="change-feed", daemon=True)
+        _poller.start()
+
+
+def _frame(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    head = f"id: {event_id}\\n" if event_id is not None else ""
+    return f"{head}event: {event}\\ndata: {json.dumps(data)}\\n\\n"
+
+
+def stream(entities: set, last_id: Optional[int] = None) -> Iterator[str]:
+    """
+    SSE frames for changes to entities.
+    
+    A reconnecting client passes its Last-Event-ID; if events after it are
+    no longer buffered it gets a "reset" event and resyncs. The stream
+    ends after events.max_age seconds and the browser reconnects, so
+    worker threads are recycled.
+    """
+    _start_poller()
+    keepalive = float(config.get("events.keepalive", 15))
+    deadline = time.monotonic() + float(config.get("events.max_age", 300))
+    
+    yield "retry: 3000\\n\\n"
+    with _condition:
+        cursor = _cursor if last_id is None else last_id
+    
+    while time.monotonic() < deadline:
+        with _condition:
+            _condition.wait_for(lambda: _cursor > cursor, timeout=keepalive)
+            lost = cursor < _floor
+            events = [e for e in _buffer if e["id"] > cursor]
+            cursor = max(cursor, _cursor)
+        
+        if lost:
+            yield _frame("reset", {}, cursor)
+            continue
+        
+        matching = [e for e in events if e["entity"] in entities]
+        for event in matching:
+            yield _frame("change", event, event["id"])
+        if not matching:
+            # Advances the client's Last-Event-ID past events it did not need
+            yield f"id: {cursor}\\n\\n" if events else ": keepalive\\n\\n"
+'''
+
+
+def get_engine_uploads() -> str:
+    return '''"""
+Engine Uploads - Versioned URLs and cached serving for uploaded files
+
+upload_url("contactos_1.jpg") returns /uploads/contactos_1.jpg?v=<token>,
+where the token is derived from the file's mtime and size. Every upload
+rewrites the file, so the token changes exactly when the content does and
+the versioned URL can be cached as immutable. Requests without the current
+token are still served, but revalidate (ETag / Last-Modified, 304).
+link_uploads() and link_upload_columns() apply upload_url() to an entity's
+file fields; every JSON payload with records goes through one of them, so
+hooks never need to.
+
+upload_serving.mode decides who moves the bytes:
+  app               Werkzeug streams the file; WSGI servers with a
+                    wsgi.file_wrapper (gunicorn, uWSGI) use sendfile(2),
+                    and Range requests are answered with 206
+  x-sendfile        an X-Sendfile header for Apache/lighttpd
+  x-accel-redirect  an X-Accel-Redirect to an nginx internal location
+In the offload modes the app only sends headers (or a 304) and the proxy
+streams the file and handles Range itself, so large media never holds an
+app worker.
+
+With upload_storage.mode: content, uploads are stored once under their
+SHA-256 instead (cas/<aa>/<bb>/<sha256>) and records hold <sha256>.<ext>,
+whose extension only sets the Content-Type. The name never points at other
+bytes, so its URL needs no token and identical files share one copy.
+Records using a digest, under any extension, are counted in upload_refs; a
+file is removed once its count has stayed at zero for
+upload_storage.gc_grace_seconds.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import secrets
+import time
+from collections import Counter
+from typing import Optional
+from urllib.parse import quote
+
+from flask import abort, request, send_from_directory
+from sqlalchemy import column, delete, insert, select, table, update
+from werkzeug.security import safe_join
+from werkzeug.utils import send_from_directory as send_with_environ
+
+from config import config
+from engine import EntityConfigManager
+from models import db
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent appends to one upload are not locked
+    fcntl = None
+
+
+IMMUTABLE_MAX_AGE = 31536000
+UPLOADS_PREFIX = "/uploads/"
+OFFLOAD_MODES = ("x-sendfile", "x-accel-redirect")
+# Range is the proxy's job once the file is offloaded
+OFFLOAD_SKIPPED_HEADERS = ("HTTP_RANGE", "HTTP_IF_RANGE")
+UPLOAD_REF = "upload:"
+UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+PARTIAL_DIR = ".partial"
+CONTENT_DIR = "cas"
+CONTENT_NAME = re.compile(r"^([0-9a-f]{64})\\.[0-9a-z]+$")
+COPY_BUFFER = 64 * 1024
+
+UPLOAD_REFS = table("upload_refs", column("name"), column("refs"), column("updated_at"))
+
+
+def _root() -> str:
+    return os.path.abspath(config.uploads_path)
+
+
+def content_path(digest: str) -> str:
+    return os.path.join(_root(), CONTENT_DIR, digest[:2], digest[2:4], digest)
+
+
+def upload_path(filename: str) -> Optional[str]:
+    """Absolute path of an upload, or None for names outside the uploads folder."""
+    match = CONTENT_NAME.match(filename)
+    if match:
+        return content_path(match.group(1))
+    # Partial uploads and the content tree are only reachable through their own names
+    if filename.split("/", 1)[0] in (PARTIAL_DIR, CONTENT_DIR):
+        return None
+    return safe_join(_root(), filename)
+
+
+def upload_version(filename: str) -> Optional[str]:
+    """Short token for the file's current mtime and size, or None when it does not exist."""
+    path = upload_path(filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    match = CONTENT_NAME.match(filename)
+    if match:
+        return match.group(1)[:12]
+    return hashlib.blake2b(f"{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=6).hexdigest()
+
+
+def upload_url(value: Optional[str]) -> str:
+    """Versioned URL for an uploaded file name; values that already are URLs pass through."""
+    if not value:
+        return ""
+    if value.startswith(("/", "http:", "https:")):
+        return value
+    if CONTENT_NAME.match(value):
+        return UPLOADS_PREFIX + value
+    version = upload_version(value)
+    url = UPLOADS_PREFIX + quote(value)
+    return f"{url}?v={version}" if version else url
+
+
+def file_fields(entity: str) -> list[str]:
+    cfg = EntityConfigManager.get(entity)
+    return [f.id for f in cfg.fields if f.type == "file"] if cfg else []
+
+
+def link_uploads(entity: str, rows: list) -> list:
+    """Replace the file field values of dict rows, in place, with their upload_url()."""
+    fields = file_fields(entity)
+    for row in rows:
+        for name in fields:
+            if row.get(name):
+                row[name] = upload_url(row[name])
+    return rows
+
+
+def link_upload_columns(entity: str, columns: list, data: list) -> list:
+    """link_uploads() for columnar rows; data comes back unchanged without file columns."""
+    fields = set(file_fields(entity))
+    indexes = [i for i, name in enumerate(columns) if name in fields]
+    if not indexes:
+        return data
+    rows = [list(row) for row in data]
+    for row in rows:
+        for i in indexes:
+            if row[i]:
+                row[i] = upload_url(row[i])
+    return rows
+
+
+def _send(path: str, max_age: Optional[int], mimetype: Optional[str] = None):
+    directory, filename = os.path.split(path)
+    mode = config.get("upload_serving.mode", "app")
+    if mode not in OFFLOAD_MODES:
+        return send_from_directory(directory, filename, max_age=max_age, mimetype=mimetype)
+    
+    environ = {
+        key: value for key, value in request.environ.items()
+        if key not in OFFLOAD_SKIPPED_HEADERS
+    }
+    response = send_with_environ(
+        directory, filename, environ, max_age=max_age, mimetype=mimetype, use_x_sendfile=True
+    )
+    if mode == "x-accel-redirect" and "X-Sendfile" in response.headers:
+        del response.headers["X-Sendfile"]
+        prefix = config.get("upload_serving.internal_prefix", "/protected-uploads/")
+        relative = os.path.relpath(path, _root()).replace(os.sep, "/")
+        response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + quote(relative)
+    return response
+
+
+def serve_upload(filename: str):
+    """
+    Send an uploaded file.
+    
+    With the current ?v= token, or a content-addressed name, the response
+    is immutable for a year; otherwise it must be revalidated, which costs
+    a 304 while unchanged. ?w=<px> asks for the thumbnail sized for that
+    display width.
+    """
+    version = upload_version(filename)
+    if version is None:
+        abort(404)
+    
+    path = upload_path(filename)
+    content = CONTENT_NAME.match(filename) is not None
+    current = content or request.args.get("v") == version
+    # Stored blobs have no extension; the requested name says what they are
+    mimetype = mimetypes.guess_type(filename)[0] if content else None
+    width = request.args.get("w", type=int)
+    if width:
+        from engine.thumbnails import variant_for
+        variant = variant_for(path, width)
+        if variant:
+            path, mimetype = variant, None
+        else:
+            # No fresh thumbnail yet: send the original, but never let this URL cache it
+            current = False
+    
+    response = _send(path, IMMUTABLE_MAX_AGE if current else None, mimetype)
+    if current:
+        response.cache_control.immutable = True
+    return response
+
+# Chunked uploads: POST /admin/uploads opens a session, PUT .../<id>?offset=N
+# appends the request body at N, and the finished file is claimed by
+# save_record through an "upload:<id>" form value. The temp file lives next
+# to the uploads so the final move is a rename; its size is the resume offset.
+
+class UploadError(Exception):
+    def __init__(self, message: str, status: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def chunked_enabled() -> bool:
+    return bool(config.get("chunked_uploads.enabled", True))
+
+
+def chunk_size() -> int:
+    return int(config.get("chunked_uploads.chunk_mb", 1) * 1024 * 1024)
+
+
+def _partial_dir() -> str:
+    return os.path.join(_root(), PARTIAL_DIR)
+
+
+def _paths(upload_id: str) -> tuple[str, str]:
+    if not UPLOAD_ID.match(upload_id):
+        raise UploadError("Unknown upload", 404)
+    base = os.path.join(_partial_dir(), upload_id)
+    return f"{base}.part", f"{base}.json"
+
+
+def _load(upload_id: str, user_id: int) -> tuple[dict, str, str]:
+    part_path, meta_path = _paths(upload_id)
+    try:
+        with open(meta_path) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        raise UploadError("Unknown upload", 404)
+    if info.get("user_id") != user_id:
+        raise UploadError("Unknown upload", 404)
+    return info, part_path, meta_path
+
+
+def _prune_expired() -> None:
+    cutoff = time.time() - config.get("chunked_uploads.expire_hours", 24) * 3600
+    for name in os.listdir(_partial_dir()):
+        path = os.path.join(_partial_dir(), name)
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _status(upload_id: str, info: dict, offset: int) -> dict:
+    return {
+        "id": upload_id,
+        "size": info["size"],
+        "offset": offset,
+        "complete": offset == info["size"],
+    }
+
+
+def start_upload(filename: str, size, user_id: int) -> dict:
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext not in config.allowed_image_extensions:
+        raise UploadError(f"File type .{ext} is not allowed")
+    limit = config.get("chunked_uploads.max_mb", 200) * 1024 * 1024
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        raise UploadError("File size required")
+    if size > limit:
+        raise UploadError("File too large", 413)
+    
+    os.makedirs(_partial_dir(), exist_ok=True)
+    _prune_expired()
+    
+    upload_id = secrets.token_hex(16)
+    part_path, meta_path = _paths(upload_id)
+    open(part_path, "wb").close()
+    info = {"filename": filename, "size": size, "user_id": user_id, "created": time.time()}
+    with open(meta_path, "w") as f:
+        json.dump(info, f)
+    return {**_status(upload_id, info, 0), "chunk_size": chunk_size()}
+
+
+def upload_status(upload_id: str, user_id: int) -> dict:
+    info, part_path, _ = _load(upload_id, user_id)
+    return {**_status(upload_id, info, os.path.getsize(part_path)), "chunk_size": chunk_size()}
+
+
+def append_chunk(upload_id: str, offset: int, stream, user_id: int) -> dict:
+    """
+    Append one chunk read from stream at offset.
+    
+    The body is copied in COPY_BUFFER pieces, so memory stays flat for any
+    chunk size. A dropped connection keeps what arrived; the client asks
+    for the offset again and resumes from there.
+    """
+    info, part_path, meta_path = _load(upload_id, user_id)
+    with open(part_path, "ab") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        current = f.seek(0, os.SEEK_END)
+        if offset != current:
+            raise UploadError("Offset does not match the stored data", 409, current)
+        
+        limit = min(chunk_size(), info["size"] - current)
+        written = 0
+        while True:
+            piece = stream.read(COPY_BUFFER)
+            if not piece:
+                break
+            written += len(piece)
+            if written > limit:
+                f.flush()
+                f.truncate(current)
+                raise UploadError(
+                    "Chunk exceeds the chunk size or the declared file size", 413, current
+                )
+            f.write(piece)
+    os.utime(meta_path)
+    return _status(upload_id, info, current + written)
+
+
+def finish_upload(upload_id: str, user_id: int) -> tuple[str, str]:
+    """Path of a complete upload and its original name.
+    
+    The session ends here; the caller moves the file.
+    """
+    info, part_path, meta_path = _load(upload_id, user_id)
+    offset = os.path.getsize(part_path)
+    if offset != info["size"]:
+        raise UploadError("Upload is not complete", 409, offset)
+    os.remove(meta_path)
+    return part_path, info["filename"]
+
+# Content-addressed storage: a blob is named by the SHA-256 of its bytes, so
+# it is written once and never changes. <sha>.jpg and <sha>.jpeg are the same
+# blob with one reference count. The cas/<aa>/<bb>/ shards keep every
+# directory small on volumes with millions of files.
+
+def content_enabled() -> bool:
+    return config.get("upload_storage.mode", "named") == "content"
+
+
+def content_names(values) -> list[str]:
+    return [value for value in values if isinstance(value, str) and CONTENT_NAME.match(value)]
+
+
+def _digests(names) -> Counter:
+    return Counter(CONTENT_NAME.match(name).group(1) for name in content_names(names))
+
+
+def _place(tmp_path: str, digest: str, ext: str) -> tuple[str, bool]:
+    name = f"{digest}.{ext}"
+    target = content_path(digest)
+    if os.path.exists(target):
+        os.remove(tmp_path)
+        return name, False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(tmp_path, target)
+    return name, True
+
+
+def store_content(stream, ext: str) -> tuple[str, bool]:
+    """
+    Copy a file object into the store; returns its name and whether it was new.
+    
+    The bytes are hashed while they are copied to a temp file, which is then
+    renamed into its shard. When the blob already exists it already holds
+    these bytes, and the copy is dropped.
+    """
+    os.makedirs(_partial_dir(), exist_ok=True)
+    tmp_path = os.path.join(_partial_dir(), f"{secrets.token_hex(16)}.store")
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                piece = stream.read(COPY_BUFFER)
+                if not piece:
+                    break
+                digest.update(piece)
+                f.write(piece)
+        return _place(tmp_path, digest.hexdigest(), ext)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def store_file(path: str, ext: str) -> tuple[str, bool]:
+    """Move a file already on the uploads volume (a finished chunked upload) into the store."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            piece = f.read(COPY_BUFFER)
+            if not piece:
+                break
+            digest.update(piece)
+    return _place(path, digest.hexdigest(), ext)
+
+
+def acquire(names) -> None:
+    """
+    Count one more record per content name (others are ignored).
+    
+    upload_refs is keyed by digest, so names differing only in extension
+    share a count. Runs inside the caller's transaction.
+    """
+    now = int(time.time())
+    for digest, count in _digests(names).items():
+        result = db.session.execute(
+            update(UPLOAD_REFS)
+            .where(UPLOAD_REFS.c.name == digest)
+            .values(refs=UPLOAD_REFS.c.refs + count, updated_at=now)
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(UPLOAD_REFS).values(name=digest, refs=count, updated_at=now))
+
+
+def release(names) -> None:
+    """Count one record less per content name; the file stays until sweep_unreferenced."""
+    now = int(time.time())
+    for digest, count in _digests(names).items():
+        db.session.execute(
+            update(UPLOAD_REFS)
+            .where(UPLOAD_REFS.c.name == digest)
+            .values(refs=UPLOAD_REFS.c.refs - count, updated_at=now)
+        )
+
+
+def sweep_unreferenced() -> int:
+    """
+    Remove files, and their thumbnails, unreferenced for the grace period.
+    
+    The grace period covers an upload that found its bytes already stored
+    but has not committed its acquire() yet, and pages still showing the
+    old URL. Each row is deleted on its own, still guarded by refs <= 0, so
+    a digest acquired again meanwhile is kept. The count covers every
+    extension of the digest, so the blob is unused under all of them.
+    """
+    cutoff = int(time.time()) - config.get("upload_storage.gc_grace_seconds", 3600)
+    stale = UPLOAD_REFS.c.refs <= 0
+    query = select(UPLOAD_REFS.c.name).where(stale, UPLOAD_REFS.c.updated_at < cutoff)
+    digests = db.session.execute(query).scalars().all()
+    removed = []
+    for digest in digests:
+        row = delete(UPLOAD_REFS).where(UPLOAD_REFS.c.name == digest, stale)
+        if db.session.execute(row).rowcount:
+            removed.append(digest)
+    db.session.commit()
+    
+    for digest in removed:
+        directory = os.path.dirname(content_path(digest))
+        try:
+            entries = os.listdir(directory)
+        except OSError:
+            continue
+        # The blob and its <digest>.<size>.webp thumbnails
+        for entry in entries:
+            if entry == digest or entry.startswith(digest + "."):
+                os.remove(os.path.join(directory, entry))
+    return len(removed)
+'''
+
+
+def get_engine_thumbnails() -> str:
+    return '''"""
+Engine Thumbnails - Downsized WebP variants of uploaded images
+
+handle_file_upload queues thumbnail generation on a small worker pool, so
+saving a record never waits on image decoding. Each size in
+thumbnails.sizes is written next to the original as <stem>.<size>.webp,
+fitted into a size x size box.
+
+thumb_url(value, 60) asks /uploads for the variant suited to a 60px slot
+on a 2x screen. serve_upload answers with the variant once it exists and
+is newer than the original; until then (Pillow not installed, worker still
+busy, files uploaded before thumbnails were enabled) it falls back to the
+original, uncached, so nothing breaks and nothing stale sticks.
+"""
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from config import config
+from engine.uploads import UPLOADS_PREFIX, upload_url
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return Image is not None and bool(config.get("thumbnails.enabled", True))
+
+
+def sizes() -> list[int]:
+    return sorted(int(size) for size in config.get("thumbnails.sizes", [120, 240, 480]))
+
+
+def thumb_name(filename: str, size: int) -> str:
+    return f"{filename.rsplit('.', 1)[0]}.{size}.webp"
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=config.get("thumbnails.workers", 2),
+                thread_name_prefix="thumbnails",
+            )
+        return _executor
+
+
+def generate_thumbnails(path: str) -> list[str]:
+    """Write every configured size for the image at path; returns the written paths."""
+    written = []
+    quality = config.get("thumbnails.quality", 80)
+    directory, filename = os.path.split(path)
+    with Image.open(path) as source:
+        # JPEG decodes straight to a smaller scale, which is most of the work for camera photos
+        source.draft("RGB", (max(sizes()), max(sizes())))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            transparent = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if transparent else "RGB")
+        
+        for size in sorted(sizes(), reverse=True):
+            image.thumbnail((size, size))
+            target = os.path.join(directory, thumb_name(filename, size))
+            # A private temp file: two jobs for the same image must not write into one
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".webp.part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    image.save(f, "WEBP", quality=quality, method=4)
+                os.replace(tmp_path, target)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+            written.append(target)
+    return written
+
+
+def _generate_logged(path: str) -> list[str]:
+    try:
+        return generate_thumbnails(path)
+    except Exception as e:
+        print(f"[ERROR] Thumbnails for {path} failed: {e}")
+        return []
+
+
+def queue_thumbnails(path: str) -> Optional[Future]:
+    """Generate thumbnails for a just-written upload in the background."""
+    if not enabled():
+        return None
+    return _pool().submit(_generate_logged, path)
+
+
+def variant_for(path: str, width: int) -> Optional[str]:
+    """Path of the smallest fresh variant covering width at 2x, or None to serve the original."""
+    wanted = width * 2
+    candidates = [size for size in sizes() if size >= wanted] or sizes()[-1:]
+    if not candidates:
+        return None
+    directory, filename = os.path.split(path)
+    variant = os.path.join(directory, thumb_name(filename, candidates[0]))
+    try:
+        if os.stat(variant).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return variant
+    except OSError:
+        pass
+    return None
+
+
+def thumb_url(value: Optional[str], width: int) -> str:
+    """URL for displaying an upload `width` CSS pixels wide.
+    
+    `value` may be a file name or an upload_url().
+    """
+    url = upload_url(value)
+    if not url.startswith(UPLOADS_PREFIX):
+        return url
+    return f"{url}{'&' if '?' in url else '?'}w={width}"
+'''
+
+
+def get_engine_assets() -> str:
+    return '''"""
+Engine Assets - Content-hashed URLs for files under resources/public
+
+asset_url("js/tabgrid.js") returns /assets/js/tabgrid.<hash>.js. The hash
+comes from the file's content, so the URL changes whenever the file does
+and the response can be cached as immutable. Once `manage.py assets build`
+has run, names listed in dist/manifest.json resolve to the minified,
+precompressed bundles instead.
+"""
+import hashlib
+import json
+import mimetypes
+import re
+from pathlib import Path
+
+from flask import abort, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+from engine.bundle import BOOTSWATCH_THEMES, BUNDLES, STATIC_URL, VENDOR_FILES, theme_sources
+
+
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 31536000
+HASHED_NAME = re.compile(r"^(?P<stem>.+)\\.(?P<digest>[0-9a-f]{12})(?P<ext>\\.[^./]+)$")
+
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# Loaded by the grid export buttons on first click (see loadExportLibs in tabgrid.js)
+EXPORT_LIBS = {"excel": "export-excel.js", "pdf": "export-pdf.js"}
+
+# asset name -> (mtime_ns, hashed name); rebuilt per file when it changes on disk
+_manifest: dict[str, tuple[int, str]] = {}
+_bundles: tuple[int, dict] = (0, {})
+
+
+def _root() -> Path:
+    return Path(current_app.static_folder)
+
+
+def bundle_manifest() -> dict:
+    """The manifest written by `manage.py assets build`, or {} when bundles were never built."""
+    global _bundles
+    path = _root() / "dist" / "manifest.json"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _bundles[0] != mtime:
+        _bundles = (mtime, json.loads(path.read_text()))
+    return _bundles[1]
+
+
+def vendor_url(path: str) -> str:
+    """The copy installed under /static/vendor, or its CDN URL when the project lacks it."""
+    if (_root() / path).is_file():
+        return f"{STATIC_URL}/{path}"
+    return VENDOR_FILES[path]
+
+
+def vendor_urls(bundle: str) -> list:
+    """URLs of the vendor files a bundle is built from, for pages served before a build."""
+    return [vendor_url(path) for path in BUNDLES[bundle]]
+
+
+def vendor_theme_urls() -> dict:
+    """Theme name -> stylesheet URL, installed copy first."""
+    sources = theme_sources(list(BOOTSWATCH_THEMES))
+    return {theme: vendor_url(path) for theme, path in sources.items()}
+
+
+def theme_urls() -> dict:
+    """Theme name -> URL of its vendored stylesheet (empty until bundles are built)."""
+    return {theme: f"/assets/{path}" for theme, path in bundle_manifest().get("themes", {}).items()}
+
+
+def export_libs() -> dict:
+    """Export kind -> script URLs, from the built bundle when there is one."""
+    files = bundle_manifest().get("files", {})
+    return {
+        kind: [f"/assets/{files[bundle]}"] if bundle in files else vendor_urls(bundle)
+        for kind, bundle in EXPORT_LIBS.items()
+    }
+
+
+def hashed_name(name: str) -> str:
+    file_path = _root() / name
+    mtime = file_path.stat().st_mtime_ns
+    entry = _manifest.get(name)
+    if entry is None or entry[0] != mtime:
+        digest = hashlib.sha256(file_path.read_bytes()).hexdigest()[:HASH_LENGTH]
+        stem, _, ext = name.rpartition(".")
+        entry = (mtime, f"{stem}.{digest}.{ext}")
+        _manifest[name] = entry
+    return entry[1]
+
+
+def asset_url(name: str) -> str:
+    built = bundle_manifest().get("files", {}).get(name)
+    if built:
+        return f"/assets/{built}"
+    return f"/assets/{hashed_name(name)}"
+
+
+def _send_built(filename: str):
+    """A built bundle, as its .br/.gz sibling when the client accepts it."""
+    response = None
+    for encoding, suffix in PRECOMPRESSED:
+        if request.accept_encodings[encoding] and (_root() / (filename + suffix)).is_file():
+            mimetype = mimetypes.guess_type(filename)[0]
+            response = send_from_directory(
+                _root(), filename + suffix, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE
+            )
+            response.headers["Content-Encoding"] = encoding
+            break
+    if response is None:
+        response = send_from_directory(_root(), filename, max_age=IMMUTABLE_MAX_AGE)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def serve_asset(filename: str):
+    """
+    Serve /assets/<name>.<hash>.<ext> from resources/public.
+    
+    A current hash is cached for a year as immutable; a stale one (a page
+    rendered before a deploy) still gets the file, but uncached. Built
+    bundles under dist/ already carry their hash and are served as is.
+    """
+    if filename.startswith("dist/"):
+        built = safe_join(str(_root()), filename)
+        if built and Path(built).is_file():
+            return _send_built(filename)
+        abort(404)
+    
+    match = HASHED_NAME.match(filename)
+    if not match:
+        abort(404)
+    name = match["stem"] + match["ext"]
+    if not (_root() / name).is_file():
+        abort(404)
+    
+    current = hashed_name(name) == filename
+    response = send_from_directory(_root(), name, max_age=IMMUTABLE_MAX_AGE if current else None)
+    if current:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    return response
+'''
+
+
+def get_engine_bundle() -> str:
+    vendor = sorted(load_manifest().items())
+    vendor_files = "".join(f'    "vendor/{name}": "{entry["url"]}",\n' for name, entry in vendor)
+    vendor_sha256 = "".join(
+        f'    "vendor/{name}": "{entry["sha256"]}",\n' for name, entry in vendor
+    )
+    return '''"""
+Engine Bundle - Vendored, minified, precompressed static bundles
+
+`pywebgen new` installs the pinned third-party files into
+resources/public/vendor. `python manage.py assets build` concatenates them
+into content-hashed bundles under resources/public/dist, and writes .gz
+(and .br, when the brotli package is installed) siblings next to each
+bundle; vendor files missing from the project are downloaded first and
+checked against their pinned hashes. dist/manifest.json maps logical
+names to the built files; while it exists, asset_url() and base.html use
+the bundles instead of the individual vendor files.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.request import urlopen
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+
+PUBLIC_ROOT = Path("resources/public")
+# URL prefix Flask serves PUBLIC_ROOT under (static_url_path in app.py)
+STATIC_URL = "/static"
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_WORKERS = 8
+
+# The one list of third-party files, rendered from the manifest pywebgen pins
+# them in: path under resources/public -> CDN URL, and -> SHA-256. `pywebgen
+# new` installs the packaged copies; base.html falls back to the CDN for any
+# file missing from resources/public/vendor (see engine.assets.vendor_url)
+VENDOR_FILES = {
+__VENDOR_FILES__}
+
+VENDOR_SHA256 = {
+__VENDOR_SHA256__}
+
+BOOTSWATCH_THEMES = tuple(
+    path[len("vendor/themes/"):-len(".min.css")]
+    for path in VENDOR_FILES if path.startswith("vendor/themes/")
+)
+
+# Logical name -> sources under resources/public, concatenated in order
+BUNDLES = {
+    # Every page
+    "vendor.js": [
+        "vendor/jquery-3.7.1.min.js",
+        "vendor/popper.min.js",
+        "vendor/bootstrap.min.js",
+    ],
+    "vendor.css": ["vendor/bootstrap-icons.min.css"],
+    # Pages with grids
+    "grid.js": [
+        "vendor/jquery.dataTables.min.js",
+        "vendor/dataTables.bootstrap4.min.js",
+        "vendor/dataTables.buttons.min.js",
+        "vendor/buttons.bootstrap4.min.js",
+        "vendor/buttons.html5.min.js",
+        "vendor/buttons.print.min.js",
+    ],
+    "grid.css": [
+        "vendor/dataTables.bootstrap4.min.css",
+        "vendor/buttons.bootstrap4.min.css",
+    ],
+    # First click on an Excel/PDF export button
+    "export-excel.js": ["vendor/jszip.min.js"],
+    "export-pdf.js": ["vendor/pdfmake.min.js", "vendor/vfs_fonts.js"],
+    "js/tabgrid.js": ["js/tabgrid.js"],
+}
+
+CSS_URL = re.compile(r"""url\\(\\s*(['"]?)([^'")]+)\\1\\s*\\)""")
+CSS_COMMENT = re.compile(r"/\\*.*?\\*/", re.DOTALL)
+
+
+class AssetBuildError(Exception):
+    pass
+
+
+def theme_sources(themes: list[str]) -> dict[str, str]:
+    """Theme name -> vendored stylesheet. "default" is plain Bootstrap."""
+    sources = {"default": "vendor/bootstrap.min.css"}
+    for theme in themes:
+        if theme != "default":
+            sources[theme] = f"vendor/themes/{theme}.min.css"
+    return sources
+
+
+def vendor_downloads(themes: list[str]) -> dict[str, str]:
+    """Every vendor file except the Bootswatch themes the build does not use."""
+    wanted = set(theme_sources(themes).values())
+    return {
+        path: url for path, url in VENDOR_FILES.items()
+        if not path.startswith("vendor/themes/") or path in wanted
+    }
+
+
+def _download(url: str, target: Path, sha256: str) -> None:
+    with urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        data = response.read()
+    if hashlib.sha256(data).hexdigest() != sha256:
+        raise AssetBuildError("does not match its pinned SHA-256")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".part")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(target)
+
+
+def fetch_vendor_files(
+    root: Path, themes: list[str], refresh: bool = False, log: Callable = print
+) -> None:
+    """Download missing vendor files concurrently, refusing any that fail their pinned hash.
+    
+    Raises AssetBuildError listing every failure.
+    """
+    wanted = {
+        path: url for path, url in vendor_downloads(themes).items()
+        if refresh or not (root / path).exists()
+    }
+    if not wanted:
+        return
+    
+    log(f"Downloading {len(wanted)} vendor file(s)...")
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {
+            path: pool.submit(_download, url, root / path, VENDOR_SHA256[path])
+            for path, url in wanted.items()
+        }
+    
+    failures = []
+    for path, future in futures.items():
+        error = future.exception()
+        if error:
+            failures.append(f"{path} ({wanted[path]}): {error}")
+    if failures:
+        raise AssetBuildError("Could not download:\\n  " + "\\n  ".join(failures))
+
+
+def minify_js(source: str) -> str:
+    """rjsmin when installed; otherwise only indentation, blank lines and whole-line comments go."""
+    if rjsmin:
+        return rjsmin.jsmin(source)
+    lines = (line.strip() for line in source.splitlines())
+    return "\\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_css(source: str) -> str:
+    if rcssmin:
+        return rcssmin.cssmin(source)
+    source = CSS_COMMENT.sub("", source)
+    return "\\n".join(line.strip() for line in source.splitlines() if line.strip())
+
+
+def rebase_css_urls(css: str, source_dir: str) -> str:
+    """
+    Rewrite relative url(...) references as absolute /static/ URLs.
+    
+    Bundles are served from /assets/dist/..., where only built files
+    exist, so fonts and images must keep pointing at the static folder.
+    """
+    def rebase(match):
+        quote, url = match.group(1), match.group(2).strip()
+        if url.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        path, sep, suffix = url.partition("?")
+        rebased = os.path.normpath(os.path.join(source_dir, path)).replace(os.sep, "/")
+        return f"url({quote}{STATIC_URL}/{rebased}{sep}{suffix}{quote})"
+    return CSS_URL.sub(rebase, css)
+
+
+def _read_source(root: Path, path: str) -> str:
+    source_file = root / path
+    if not source_file.exists():
+        raise AssetBuildError(
+            f"Missing source {path}; run `python manage.py assets build` with network access once"
+        )
+    text = source_file.read_text(encoding="utf-8")
+    minified = ".min." in path
+    if path.endswith(".css"):
+        text = rebase_css_urls(text, os.path.dirname(path))
+        return text if minified else minify_css(text)
+    return text if minified else minify_js(text)
+
+
+def _write_hashed(root: Path, name: str, content: str) -> str:
+    """Write dist/<name with hash> plus its compressed siblings; returns the path under root."""
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    stem, _, ext = name.rpartition(".")
+    relative = f"{DIST_DIR}/{stem}.{digest}.{ext}"
+    target = root / relative
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+    # mtime=0 keeps the .gz byte-identical across builds
+    Path(f"{target}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli:
+        Path(f"{target}.br").write_bytes(brotli.compress(data, quality=11))
+    return relative
+
+
+def build_assets(
+    root: Path = PUBLIC_ROOT,
+    themes: Optional[list[str]] = None,
+    download: bool = True,
+    refresh: bool = False,
+    log: Callable = print,
+) -> dict:
+    """Build every bundle and theme into dist/ and write the manifest. Returns the manifest."""
+    themes = themes or []
+    if download:
+        fetch_vendor_files(root, themes, refresh, log)
+    
+    manifest = {"files": {}, "themes": {}}
+    for name, sources in BUNDLES.items():
+        separator = "\\n" if name.endswith(".css") else ";\\n"
+        content = separator.join(_read_source(root, path) for path in sources)
+        manifest["files"][name] = _write_hashed(root, name, content)
+    
+    for theme, path in theme_sources(themes).items():
+        content = _read_source(root, path)
+        manifest["themes"][theme] = _write_hashed(root, f"themes/{theme}.css", content)
+    
+    # Drop bundles from earlier builds
+    built = set(manifest["files"].values()) | set(manifest["themes"].values())
+    for old in (root / DIST_DIR).rglob("*"):
+        relative = old.relative_to(root).as_posix()
+        source = re.sub(r"\\.(gz|br)$", "", relative)
+        if old.is_file() and old.name != MANIFEST_NAME and source not in built:
+            old.unlink()
+    
+    (root / DIST_DIR / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    for name, relative in sorted(manifest["files"].items()):
+        log(f"  {name} -> {relative} ({(root / relative).stat().st_size // 1024} KB)")
+    log(f"  {len(manifest['themes'])} theme(s)")
+    return manifest
+'''.replace("__VENDOR_FILES__", vendor_files).replace("__VENDOR_SHA256__", vendor_sha256)
+
+
+def get_tabgrid_js() -> str:
+    from pathlib import Path
+    template_path = Path(__file__).parent / "tabgrid_template.js"
+    return template_path.read_text()
+
+
+def get_engine_export() -> str:
+    return '''"""
+Engine Export - Streaming CSV / NDJSON serialization
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Optional
+
+from engine import EntityConfigManager
+
+
+SENSITIVE_COLUMNS = {"password", "passwd", "pwd"}
+
+
+def sensitive_columns(entity: str) -> set:
+    """Columns never exported or sent to the browser: password-like names and password fields."""
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return set(SENSITIVE_COLUMNS)
+    return SENSITIVE_COLUMNS | {f.id for f in cfg.fields if f.type == "password"}
+
+
+def strip_sensitive(entity: str, row: Optional[dict]) -> Optional[dict]:
+    """The row without password columns, for anything sent to the browser."""
+    if row is None:
+        return None
+    excluded = sensitive_columns(entity)
+    return {key: value for key, value in row.items() if key not in excluded}
+
+
+def _table_columns(entity: str) -> list:
+    """Header for an export without rows: the table's columns, else the entity's fields."""
+    from engine.query import get_model_class
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        return []
+    model_class = get_model_class(cfg.table)
+    if model_class is not None:
+        return list(model_class.__table__.columns.keys())
+    return [f.id for f in cfg.fields]
+
+
+def iter_csv(entity: str, chunks: Iterable[list[dict]]) -> Iterator[str]:
+    """
+    Serialize row chunks as CSV, emitting one string per chunk.
+    
+    The header is written even with no rows.
+    """
+    excluded = sensitive_columns(entity)
+    buffer = io.StringIO()
+    writer = None
+    
+    for rows in chunks:
+        if writer is None:
+            columns = [c for c in rows[0].keys() if c not in excluded]
+            writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    
+    if writer is None:
+        csv.writer(buffer).writerow([c for c in _table_columns(entity) if c not in excluded])
+        yield buffer.getvalue()
+
+
+def iter_ndjson(entity: str, chunks: Iterable[list[dict]]) -> Iterator[str]:
+    """Serialize row chunks as newline-delimited JSON, emitting one string per chunk."""
+    excluded = sensitive_columns(entity)
+    
+    for rows in chunks:
+        lines = []
+        for row in rows:
+            for column in excluded:
+                row.pop(column, None)
+            lines.append(json.dumps(row, default=str, ensure_ascii=False))
+        yield "\\n".join(lines) + "\\n"
+'''
+
+
+def get_engine_bulk() -> str:
+    return '''"""
+Engine Bulk - Batched CSV import, bulk update and bulk delete
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from sqlalchemy import delete, insert, select, update
+
+from models import db
+from engine import EntityConfigManager
+from engine.crud import (
+    bump_version, execute_hook, get_model_class, sweep_uploads, table_file_columns,
+)
+from engine.sync import next_row_version, record_tombstones
+from engine.uploads import acquire, content_names, release
+
+
+TRUE_VALUES = {"1", "t", "true", "y", "yes", "on"}
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportResult:
+    inserted: int = 0
+    rejected: int = 0
+    errors: list = field(default_factory=list)
+    error_writer: Optional[csv.DictWriter] = field(default=None, repr=False)
+    
+    def reject(self, line: int, message: str, row: Optional[dict] = None) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+        if self.error_writer is not None and row is not None:
+            self.error_writer.writerow({**row, "_line": line, "_error": message})
+    
+    def to_dict(self) -> dict:
+        return {"inserted": self.inserted, "rejected": self.rejected, "errors": self.errors}
+
+
+def _python_type(column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def build_converter(column, field_cfg) -> Callable[[str], Any]:
+    """Compile a CSV string -> column value converter from the column and FieldConfig types."""
+    py_type = _python_type(column)
+    required = bool(field_cfg and field_cfg.required)
+    label = field_cfg.label if field_cfg else column.name
+    field_type = field_cfg.type if field_cfg else "text"
+    allowed = None
+    if field_cfg and field_type in ("select", "radio") and field_cfg.options:
+        allowed = set(field_cfg.option_labels)
+    
+    def convert(value: str) -> Any:
+        if value is None or value == "":
+            if required:
+                raise ValueError(f"{label} is required")
+            return None
+        if allowed is not None and value not in allowed:
+            raise ValueError(f"{label}: invalid option '{value}'")
+        if field_type == "email" and "@" not in value:
+            raise ValueError(f"{label}: invalid email '{value}'")
+        
+        try:
+            if field_type == "number" and py_type is str:
+                float(value)
+            if field_type == "date" and py_type is str:
+                date.fromisoformat(value)
+            
+            if py_type is bool:
+                return value.strip().lower() in TRUE_VALUES
+            if py_type is int:
+                return int(value)
+            if py_type is float:
+                return float(value)
+            if py_type is Decimal:
+                return Decimal(value)
+            if py_type is datetime:
+                return datetime.fromisoformat(value)
+            if py_type is date:
+                return date.fromisoformat(value)
+        except (ValueError, ArithmeticError):
+            raise ValueError(f"{label}: invalid value '{value}'")
+        return value
+
+    return convert
+
+
+def _apply_before_save(
+    entity: str, batch: list[tuple[int, dict]], result: ImportResult
+) -> list[tuple[int, dict]]:
+    """Run before_save_many over the whole batch, or before_save row by row."""
+    many_hook = EntityConfigManager.get_hook(entity, "before_save_many")
+    if many_hook:
+        rows = many_hook([row for _, row in batch])
+        pairs = zip([line for line, _ in batch], rows if isinstance(rows, list) else [])
+    elif EntityConfigManager.get_hook(entity, "before_save"):
+        pairs = [(line, execute_hook(entity, "before_save", row)) for line, row in batch]
+    else:
+        return batch
+    
+    accepted = []
+    for line, row in pairs:
+        if not isinstance(row, dict):
+            result.reject(line, "Rejected by before_save")
+        elif "errors" in row:
+            result.reject(line, str(row["errors"]), row)
+        else:
+            accepted.append((line, row))
+    return accepted
+
+
+def _copy_rows(table, rows: list[dict]) -> bool:
+    """Load rows through PostgreSQL COPY. Returns False when COPY is unavailable."""
+    dbapi_conn = db.session.connection().connection.driver_connection
+    cursor = dbapi_conn.cursor()
+    if not hasattr(cursor, "copy_expert"):
+        return False
+    
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["\\\\N" if row.get(c) is None else row.get(c) for c in columns])
+    buffer.seek(0)
+    
+    column_list = ", ".join(columns)
+    statement = f"COPY {table.name} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\\\N')"
+    cursor.copy_expert(statement, buffer)
+    return True
+
+
+def _insert_rows(table, rows: list[dict]) -> None:
+    groups: dict[tuple, list[dict]] = {}
+    for row in rows:
+        groups.setdefault(tuple(row.keys()), []).append(row)
+    
+    for group in groups.values():
+        if db.engine.dialect.name == "postgresql" and _copy_rows(table, group):
+            continue
+        db.session.execute(insert(table), group)
+
+
+def _file_columns(cfg, table) -> list[str]:
+    return [f.id for f in cfg.fields if f.type == "file" and f.id in table.columns]
+
+
+def _flush_batch(entity: str, table, batch: list[tuple[int, dict]], result: ImportResult) -> None:
+    batch = _apply_before_save(entity, batch, result)
+    if not batch:
+        return
+    
+    columns = set(table.columns.keys())
+    rows = [{k: v for k, v in row.items() if k in columns} for _, row in batch]
+    
+    cfg = EntityConfigManager.get(entity)
+    if cfg.version_column in columns:
+        version = next_row_version()
+        for row in rows:
+            row[cfg.version_column] = version
+    # Imported rows naming content-addressed files count as references to them
+    file_columns = _file_columns(cfg, table)
+    
+    try:
+        _insert_rows(table, rows)
+        acquire(content_names(row.get(name) for row in rows for name in file_columns))
+        db.session.commit()
+        result.inserted += len(rows)
+        return
+    except Exception:
+        db.session.rollback()
+    
+    # The batch failed as a whole: retry row by row to isolate the bad rows
+    for (line, _), row in zip(batch, rows):
+        try:
+            db.session.execute(insert(table), [row])
+            acquire(content_names(row.get(name) for name in file_columns))
+            db.session.commit()
+            result.inserted += 1
+        except Exception as e:
+            db.session.rollback()
+            result.reject(line, str(getattr(e, "orig", e)), row)
+
+
+def import_csv(
+    entity: str,
+    source: TextIO,
+    batch_size: int = 5000,
+    error_file: Optional[TextIO] = None,
+    progress: Optional[Callable[[ImportResult], None]] = None,
+) -> ImportResult:
+    """
+    Import CSV rows into an entity table.
+    
+    Values are validated against the FieldConfig types, before_save (or
+    before_save_many) runs per batch, and each batch is inserted with a
+    single executemany (COPY on PostgreSQL) and committed on its own.
+    Rejected rows are written to error_file with _line and _error columns.
+    """
+    result = ImportResult()
+    for result in import_batches(entity, source, batch_size, error_file):
+        if progress:
+            progress(result)
+    return result
+
+
+def import_batches(
+    entity: str,
+    source: TextIO,
+    batch_size: int = 5000,
+    error_file: Optional[TextIO] = None,
+) -> Iterator[ImportResult]:
+    """import_csv step by step: yields the running result after each committed batch, and last."""
+    result = ImportResult()
+    cfg = EntityConfigManager.get(entity)
+    if not cfg:
+        result.reject(0, "Entity not found")
+        yield result
+        return
+    
+    model_class = get_model_class(cfg.table)
+    if not model_class:
+        result.reject(0, "Model not found")
+        yield result
+        return
+    
+    table = model_class.__table__
+    reader = csv.DictReader(source)
+    header = [h for h in (reader.fieldnames or []) if h in table.columns]
+    converters = {
+        name: build_converter(table.columns[name], cfg.field_map.get(name)) for name in header
+    }
+    
+    # Rows cannot supply a column the file does not have
+    missing = [
+        f.label for f in cfg.fields
+        if f.required and f.id != "id" and f.id in table.columns and f.id not in header
+    ]
+    if missing:
+        result.reject(0, f"Missing required column(s): {', '.join(missing)}")
+        yield result
+        return
+    
+    if error_file is not None:
+        fieldnames = ["_line", "_error"] + (reader.fieldnames or [])
+        result.error_writer = csv.DictWriter(
+            error_file, fieldnames=fieldnames, extrasaction="ignore"
+        )
+        result.error_writer.writeheader()
+    
+    batch = []
+    for line, raw in enumerate(reader, start=2):
+        try:
+            row = {name: converters[name](raw.get(name)) for name in header}
+        except (ValueError, ArithmeticError) as e:
+            result.reject(line, str(e), raw)
+            continue
+        if row.get("id") is None:
+            row.pop("id", None)
+        batch.append((line, row))
+        
+        if len(batch) >= batch_size:
+            _flush_batch(entity, table, batch, result)
+            batch = []
+            yield result
+    
+    if batch:
+        _flush_batch(entity, table, batch, result)
+    if result.inserted:
+        bump_version(entity)
+    yield result
+
+
+def _chunks(ids: list, size: int):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _where(table, filters: dict) -> list:
+    """Translate {column: value} (a list value means IN) into column conditions."""
+    conditions = []
+    for name, value in filters.items():
+        if name not in table.columns:
+            raise ValueError(f"Unknown column '{name}'")
+        column = table.columns[name]
+        if isinstance(value, (list, tuple)):
+            conditions.append(column.in_(value))
+        else:
+            conditions.append(column == value)
+    return conditions
+
+
+def _resolve_ids(table, ids: Optional[list], filters: Optional[dict]) -> list:
+    """Return the target ids from an explicit list and/or a filter. Refuses an empty selection."""
+    if not ids and not filters:
+        raise ValueError("Provide ids or a filter")
+    
+    query = select(table.c.id)
+    if ids:
+        query = query.where(table.c.id.in_(list(ids)))
+    if filters:
+        query = query.where(*_where(table, filters))
+    return list(db.session.execute(query).scalars())
+
+
+def _run_many_hook(
+    entity: str, name: str, single: Optional[str], ids: list, payload: dict
+) -> Optional[dict]:
+    """Run the batch-aware hook, or fall back to the per-row hook for each id."""
+    many_hook = EntityConfigManager.get_hook(entity, name)
+    if many_hook:
+        result = many_hook({"ids": ids, **payload})
+        return result if isinstance(result, dict) else None
+    
+    if single and EntityConfigManager.get_hook(entity, single):
+        for record_id in ids:
+            execute_hook(entity, single, {"id": record_id, **payload})
+    return None
 
 
-def delete_record(entity: str, record_id: int, user_id: Optional[int] = None) -> dict:
+def _release_files(table, columns: list[str], ids: list) -> bool:
+    """release() the content files the rows name in columns; True when there were any."""
+    columns = [table.c[name] for name in columns if name in table.c]
+    if not columns:
+        return False
+    rows = db.session.execute(select(*columns).where(table.c.id.in_(ids)))
+    names = content_names(value for row in rows for value in row)
+    release(names)
+    return bool(names)
+
+
+def _delete_children(model_class, ids: list) -> bool:
+    """
+    Delete rows owned through delete-cascading relationships, depth first.
+    
+    Releases the content files those rows name; True when there were any.
+    """
+    released = False
+    for rel in model_class.__mapper__.relationships:
+        if not rel.cascade.delete or rel.direction.name != "ONETOMANY":
+            continue
+        child_class = rel.mapper.class_
+        child_table = child_class.__table__
+        for parent_col, child_col in rel.local_remote_pairs:
+            parent_table = model_class.__table__
+            parents = select(parent_table.c[parent_col.name]).where(parent_table.c.id.in_(ids))
+            condition = child_table.c[child_col.name].in_(parents)
+            child_ids = list(
+                db.session.execute(select(child_table.c.id).where(condition)).scalars()
+            )
+            if child_ids:
+                released = _delete_children(child_class, child_ids) | released
+                columns = table_file_columns(child_table.name)
+                released = _release_files(child_table, columns, child_ids) | released
+                db.session.execute(delete(child_table).where(child_table.c.id.in_(child_ids)))
+    return released
+
+
+def _model_for(entity: str):
     cfg = EntityConfigManager.get(entity)
     if not cfg:
-        return {"success": False, "error": "Entity not found"}
-    
-    execute_hook(entity, "before_delete", {"id": record_id})
-    
+        raise LookupError("Entity not found")
     model_class = get_model_class(cfg.table)
     if not model_class:
-        return {"success": False, "error": "Model not found"}
+        raise LookupError("Model not found")
+    return model_class
+
+
+def bulk_delete(
+    entity: str,
+    ids: Optional[list] = None,
+    filters: Optional[dict] = None,
+    batch_size: int = 500,
+) -> dict:
+    """
+    Delete many records in a single transaction.
     
+    Rows are selected by ids and/or a {column: value} filter and removed with
+    one DELETE ... WHERE id IN (...) per batch. before_delete_many and
+    after_delete_many receive {"ids": [...]}; without them the per-row
+    before_delete/after_delete hooks run for each id.
+    """
     try:
-        record = db.session.get(model_class, record_id)
-        if not record:
-            return {"success": False, "error": "Record not found"}
-        
-        db.session.delete(record)
-        db.session.commit()
-        
-        execute_hook(entity, "after_delete", {"id": record_id})
-        
-        return {"success": True}
+        model_class = _model_for(entity)
+        table = model_class.__table__
+        ids = _resolve_ids(table, ids, filters)
+    except (LookupError, ValueError) as e:
+        return {"success": False, "error": str(e)}
     
+    if not ids:
+        return {"success": True, "deleted": 0}
+    cfg = EntityConfigManager.get(entity)
+    versioned = bool(cfg.version_column)
+    file_columns = _file_columns(cfg, table)
+    
+    verdict = _run_many_hook(entity, "before_delete_many", "before_delete", ids, {})
+    if verdict and "errors" in verdict:
+        return {"success": False, "errors": verdict["errors"]}
+    
+    released = False
+    try:
+        for batch in _chunks(ids, batch_size):
+            released = _release_files(table, file_columns, batch) | released
+            released = _delete_children(model_class, batch) | released
+            db.session.execute(delete(table).where(table.c.id.in_(batch)))
+            if versioned:
+                record_tombstones(entity, batch)
+        db.session.commit()
     except Exception as e:
         db.session.rollback()
-        return {"success": False, "error": str(e)}
-
-
-def handle_file_upload(file: FileStorage, table: str, record_id: int) -> Optional[str]:
-    if not file or not file.filename:
-        return None
-    
-    ext = file.filename.rsplit(".", 1)[-1].lower()
-    if ext not in config.allowed_image_extensions:
-        return None
+        return {"success": False, "error": str(getattr(e, "orig", e))}
+    
+    bump_version(entity, "delete", ids)
+    _run_many_hook(entity, "after_delete_many", "after_delete", ids, {})
+    if released:
+        sweep_uploads()
+    return {"success": True, "deleted": len(ids)}
+
+
+def bulk_update(
+    entity: str,
+    values: dict,
+    ids: Optional[list] = None,
+    filters: Optional[dict] = None,
+    batch_size: int = 500,
+) -> dict:
+    """
+    Set the same column values on many records in a single transaction.
     
-    filename = secure_filename(f"{table}_{record_id}.{ext}")
-    upload_path = config.uploads_path
+    Issues one UPDATE ... WHERE id IN (...) per batch. before_update_many
+    receives {"ids": [...], "values": {...}} and may return {"errors": ...}
+    to cancel or {"values": ...} to replace the values; after_update_many
+    runs after the commit.
+    """
+    try:
+        model_class = _model_for(entity)
+        table = model_class.__table__
+        ids = _resolve_ids(table, ids, filters)
+    except (LookupError, ValueError) as e:
+        return {"success": False, "error": str(e)}
     
-    import os
-    os.makedirs(upload_path, exist_ok=True)
+    field_map = EntityConfigManager.get(entity).field_map
+    try:
+        values = {
+            k: build_converter(table.columns[k], field_map.get(k))(v) if isinstance(v, str) else v
+            for k, v in (values or {}).items() if k in table.columns and k != "id"
+        }
+    except (ValueError, ArithmeticError) as e:
+        return {"success": False, "error": str(e)}
+    if not values:
+        return {"success": False, "error": "No columns to update"}
+    if not ids:
+        return {"success": True, "updated": 0}
+    
+    verdict = _run_many_hook(entity, "before_update_many", None, ids, {"values": values})
+    if verdict and "errors" in verdict:
+        return {"success": False, "errors": verdict["errors"]}
+    if verdict and isinstance(verdict.get("values"), dict):
+        values = verdict["values"]
+    cfg = EntityConfigManager.get(entity)
+    if cfg.version_column and cfg.version_column in table.columns:
+        values = {**values, cfg.version_column: next_row_version()}
+    # Overwritten content-addressed files lose a reference, the new one gains one per row
+    file_columns = [table.c[name] for name in _file_columns(cfg, table) if name in values]
+    new_names = content_names(values[column.name] for column in file_columns)
     
-    file_path = os.path.join(upload_path, filename)
-    file.save(file_path)
+    released = False
+    try:
+        for batch in _chunks(ids, batch_size):
+            if file_columns:
+                rows = db.session.execute(select(*file_columns).where(table.c.id.in_(batch)))
+                old_names = content_names(value for row in rows for value in row)
+                release(old_names)
+                acquire(new_names * len(batch))
+                released = released or bool(old_names)
+            db.session.execute(update(table).where(table.c.id.in_(batch)).values(**values))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return {"success": False, "error": str(getattr(e, "orig", e))}
     
-    return filename
+    bump_version(entity, "save", ids)
+    _run_many_hook(entity, "after_update_many", None, ids, {"values": values})
+    if released:
+        sweep_uploads()
+    return {"success": True, "updated": len(ids)}
 '''
 
 
-def get_engine_query() -> str:
+def get_engine_snapshot() -> str:
     return '''"""
-Engine Query - Data Query Operations
+Engine Snapshot - Precompiled entity configs and translations
+
+`python manage.py compile` parses every entity and locale YAML file once
+and pickles the result with the SHA-256 of each source file. At startup
+the snapshot is used only when the format version, the Python version
+and every source hash still match; otherwise the YAML files are parsed
+as usual.
 """
-from typing import Optional, Any
-from sqlalchemy import text
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional
 
-from models import db
+from config import load_yaml
 from engine import EntityConfigManager
+from i18n import I18N
 
 
-def get_model_class(table_name: str):
-    import models
-    for attr_name in dir(models):
-        attr = getattr(models, attr_name)
-        if hasattr(attr, '__tablename__') and attr.__tablename__ == table_name:
-            return attr
-    return None
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_PATH = Path("db/config.snapshot")
+ENTITIES_PATH = Path("resources/entities")
+I18N_PATH = Path("resources/i18n")
 
 
-def execute_hook(entity: str, hook_name: str, data) -> Any:
-    hook = EntityConfigManager.get_hook(entity, hook_name)
-    if hook:
-        try:
-            return hook(data)
-        except Exception as e:
-            print(f"[ERROR] Hook {hook_name} failed: {e}")
-    return data
+def source_files() -> list[Path]:
+    return sorted([*ENTITIES_PATH.glob("*.yaml"), *I18N_PATH.glob("*.yaml")])
 
 
-def list_records(entity: str, parent_id: Optional[int] = None, parent_entity: Optional[str] = None, foreign_key: Optional[str] = None) -> list[dict]:
-    cfg = EntityConfigManager.get(entity)
-    if not cfg:
-        return []
-    
-    execute_hook(entity, "before_load", {"entity": entity})
-    
-    model_class = get_model_class(cfg.table)
-    if not model_class:
-        return []
-    
-    query = cfg.queries.get("list")
-    
-    if query:
-        if parent_id and foreign_key:
-            query = query.replace("ORDER BY", f"WHERE {foreign_key} = {parent_id} ORDER BY")
-        
-        result = db.session.execute(text(query))
-        rows = [dict(row._mapping) for row in result]
-    else:
-        if parent_id and foreign_key:
-            records = db.session.query(model_class).filter(
-                getattr(model_class, foreign_key) == parent_id
-            ).all()
-        else:
-            records = db.session.query(model_class).all()
-        
-        rows = [{c.name: getattr(r, c.name) for c in model_class.__table__.columns} for r in records]
-    
-    rows = execute_hook(entity, "after_load", rows)
-    
-    return rows if isinstance(rows, list) else []
+def source_hashes(paths: list[Path]) -> dict[str, str]:
+    return {str(p): hashlib.sha256(p.read_bytes()).hexdigest() for p in paths}
 
 
-def get_record(entity: str, record_id: int) -> Optional[dict]:
-    cfg = EntityConfigManager.get(entity)
-    if not cfg:
+def write_snapshot(path: Path = SNAPSHOT_PATH) -> dict:
+    paths = source_files()
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "python": sys.version_info[:2],
+        "sources": source_hashes(paths),
+        "entities": {str(p): load_yaml(p) for p in paths if p.parent == ENTITIES_PATH},
+        "i18n": {p.stem: I18N._parse(p) for p in paths if p.parent == I18N_PATH},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return snapshot
+
+
+def read_snapshot(path: Path = SNAPSHOT_PATH) -> Optional[dict]:
+    """The snapshot, or None when it is missing, unreadable or out of date."""
+    if not path.exists():
         return None
-    
-    model_class = get_model_class(cfg.table)
-    if not model_class:
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:
         return None
     
-    query = cfg.queries.get("get")
-    
-    if query:
-        result = db.session.execute(text(query), {"id": record_id})
-        row = result.fetchone()
-        if row:
-            return dict(row._mapping)
+    if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("python") != sys.version_info[:2]:
         return None
-    else:
-        record = db.session.get(model_class, record_id)
-        if record:
-            return {c.name: getattr(record, c.name) for c in model_class.__table__.columns}
+    if snapshot.get("sources") != source_hashes(source_files()):
+        print("[INFO] Config snapshot is stale; run `python manage.py compile` to refresh it")
         return None
+    return snapshot
+
+
+def apply_snapshot(path: Path = SNAPSHOT_PATH) -> bool:
+    """Load entity configs and translations from the snapshot. Returns False if it can't be used."""
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return False
+    
+    for file_path, data in snapshot["entities"].items():
+        EntityConfigManager.load_data(Path(file_path), data)
+    I18N.load_tables(snapshot["i18n"])
+    return True
+'''
+
+
+def get_engine_watcher() -> str:
+    return '''"""
+Engine Watcher - Reload entity YAML, translations and config.yaml on change
+
+Uses watchdog (inotify/FSEvents) when installed, otherwise polls mtimes.
+Only the files that changed are re-parsed; the managers swap the new
+objects in atomically and bump their versions, which invalidates the
+caches built from them (menus, compiled queries).
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from config import config
+from engine import EntityConfigManager
+from i18n import I18N
+
+
+ENTITIES_PATH = Path("resources/entities")
+I18N_PATH = Path("resources/i18n")
+DEBOUNCE_SECONDS = 0.2
+
+
+def scan() -> dict:
+    """mtime_ns of every watched file."""
+    stamps = {}
+    folders = [folder for folder in (ENTITIES_PATH, I18N_PATH) if folder.exists()]
+    paths = [p for folder in folders for p in folder.glob("*.yaml")]
+    if config.path:
+        paths.append(config.path)
+    for file_path in paths:
+        try:
+            stamps[file_path] = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return stamps
+
+
+def apply_changes(changed: list, removed: list) -> None:
+    def under(folder: Path, paths: list) -> list:
+        return [p for p in paths if p.parent == folder]
+    
+    entity_changed, entity_removed = under(ENTITIES_PATH, changed), under(ENTITIES_PATH, removed)
+    if entity_changed or entity_removed:
+        entities = EntityConfigManager.reload_files(entity_changed, entity_removed)
+        if entities:
+            print(f"[INFO] Reloaded entities: {', '.join(entities)}")
+    
+    i18n_changed, i18n_removed = under(I18N_PATH, changed), under(I18N_PATH, removed)
+    if i18n_changed or i18n_removed:
+        I18N.reload_files(i18n_changed, i18n_removed)
+        locales = ", ".join(p.stem for p in i18n_changed + i18n_removed)
+        print(f"[INFO] Reloaded translations: {locales}")
+    
+    if config.path in changed:
+        config.reload()
+        print(f"[INFO] Reloaded {config.path}")
+
+
+class ReloadWatcher:
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.stamps = scan()
+        self.wake = threading.Event()
+        self.observer = None
+    
+    def check(self) -> None:
+        """Reload whatever changed since the previous scan."""
+        current = scan()
+        changed = [p for p, mtime in current.items() if self.stamps.get(p) != mtime]
+        removed = [p for p in self.stamps if p not in current]
+        self.stamps = current
+        if changed or removed:
+            apply_changes(changed, removed)
+    
+    def _watch_events(self) -> bool:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return False
+        
+        wake = self.wake
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+        
+        self.observer = Observer()
+        folders = {folder.resolve() for folder in (ENTITIES_PATH, I18N_PATH) if folder.exists()}
+        if config.path:
+            folders.add(config.path.resolve().parent)
+        for folder in folders:
+            self.observer.schedule(Handler(), str(folder), recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+        return True
+    
+    def run(self) -> None:
+        # With filesystem events, the timeout is only a safety net for missed events
+        timeout = 60.0 if self._watch_events() else self.interval
+        while True:
+            if self.wake.wait(timeout):
+                time.sleep(DEBOUNCE_SECONDS)
+                self.wake.clear()
+            try:
+                self.check()
+            except Exception as e:
+                print(f"[ERROR] Hot reload failed: {e}")
+
+
+_watcher: Optional[ReloadWatcher] = None
+
+
+def start_watcher(interval: float = 1.0) -> ReloadWatcher:
+    """Start the reload thread once per process."""
+    global _watcher
+    if _watcher is None:
+        _watcher = ReloadWatcher(interval)
+        threading.Thread(target=_watcher.run, name="hot-reload", daemon=True).start()
+    return _watcher
 '''
 
 
@@ -1369,9 +4383,58 @@ FROM users ORDER BY lastname, firstname;""",
   year INTEGER,
   imagen TEXT,
   contacto_id INTEGER,
+  row_version BIGINT,
   FOREIGN KEY (contacto_id) REFERENCES contactos(id) ON DELETE CASCADE
-);""",
+);
+CREATE INDEX IF NOT EXISTS idx_cars_row_version ON cars (row_version);""",
     "cars_sqlite_down": "DROP TABLE IF EXISTS cars;",
+    "row_tombstones_sqlite_up": """CREATE TABLE IF NOT EXISTS row_tombstones (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  entity TEXT NOT NULL,
+  record_id INTEGER NOT NULL,
+  version BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_row_tombstones_entity_version
+  ON row_tombstones (entity, version);""",
+    "row_tombstones_sqlite_down": "DROP TABLE IF EXISTS row_tombstones;",
+    "row_tombstones_mysql_up": """CREATE TABLE IF NOT EXISTS row_tombstones (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  entity VARCHAR(100) NOT NULL,
+  record_id INT NOT NULL,
+  version BIGINT NOT NULL,
+  INDEX idx_row_tombstones_entity_version (entity, version)
+);""",
+    "row_tombstones_mysql_down": "DROP TABLE IF EXISTS row_tombstones;",
+    "row_tombstones_postgresql_up": """CREATE TABLE IF NOT EXISTS row_tombstones (
+  id SERIAL PRIMARY KEY,
+  entity VARCHAR(100) NOT NULL,
+  record_id INTEGER NOT NULL,
+  version BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_row_tombstones_entity_version
+  ON row_tombstones (entity, version);""",
+    "row_tombstones_postgresql_down": "DROP TABLE IF EXISTS row_tombstones;",
+    "upload_refs_sqlite_up": """CREATE TABLE IF NOT EXISTS upload_refs (
+  name VARCHAR(80) PRIMARY KEY,
+  refs INTEGER NOT NULL DEFAULT 0,
+  updated_at BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_upload_refs_refs_updated ON upload_refs (refs, updated_at);""",
+    "upload_refs_sqlite_down": "DROP TABLE IF EXISTS upload_refs;",
+    "upload_refs_mysql_up": """CREATE TABLE IF NOT EXISTS upload_refs (
+  name VARCHAR(80) PRIMARY KEY,
+  refs INT NOT NULL DEFAULT 0,
+  updated_at BIGINT NOT NULL,
+  INDEX idx_upload_refs_refs_updated (refs, updated_at)
+);""",
+    "upload_refs_mysql_down": "DROP TABLE IF EXISTS upload_refs;",
+    "upload_refs_postgresql_up": """CREATE TABLE IF NOT EXISTS upload_refs (
+  name VARCHAR(80) PRIMARY KEY,
+  refs INTEGER NOT NULL DEFAULT 0,
+  updated_at BIGINT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_upload_refs_refs_updated ON upload_refs (refs, updated_at);""",
+    "upload_refs_postgresql_down": "DROP TABLE IF EXISTS upload_refs;",
 }
 
 
@@ -1395,6 +4458,18 @@ def write_migrations(project_path: Path) -> None:
         ("004-siblings", "sqlite", "down", MIGRATIONS["siblings_sqlite_down"]),
         ("005-cars", "sqlite", "up", MIGRATIONS["cars_sqlite_up"]),
         ("005-cars", "sqlite", "down", MIGRATIONS["cars_sqlite_down"]),
+        ("006-row_tombstones", "sqlite", "up", MIGRATIONS["row_tombstones_sqlite_up"]),
+        ("006-row_tombstones", "sqlite", "down", MIGRATIONS["row_tombstones_sqlite_down"]),
+        ("006-row_tombstones", "mysql", "up", MIGRATIONS["row_tombstones_mysql_up"]),
+        ("006-row_tombstones", "mysql", "down", MIGRATIONS["row_tombstones_mysql_down"]),
+        ("006-row_tombstones", "postgresql", "up", MIGRATIONS["row_tombstones_postgresql_up"]),
+        ("006-row_tombstones", "postgresql", "down", MIGRATIONS["row_tombstones_postgresql_down"]),
+        ("007-upload_refs", "sqlite", "up", MIGRATIONS["upload_refs_sqlite_up"]),
+        ("007-upload_refs", "sqlite", "down", MIGRATIONS["upload_refs_sqlite_down"]),
+        ("007-upload_refs", "mysql", "up", MIGRATIONS["upload_refs_mysql_up"]),
+        ("007-upload_refs", "mysql", "down", MIGRATIONS["upload_refs_mysql_down"]),
+        ("007-upload_refs", "postgresql", "up", MIGRATIONS["upload_refs_postgresql_up"]),
+        ("007-upload_refs", "postgresql", "down", MIGRATIONS["upload_refs_postgresql_down"]),
     ]
     
     for name, db_type, direction, sql in migrations:
@@ -1585,6 +4660,7 @@ fields:
   - id: contacto_id
     label: Contactos ID
     type: hidden
+version_column: row_version
 queries:
   list: SELECT * FROM cars ORDER BY id DESC
   get: SELECT * FROM cars WHERE id = :id
@@ -1646,9 +4722,6 @@ def before_load(params):
 
 def after_load(rows):
     print(f"[INFO] Loaded {len(rows)} contactos record(s)")
-    for row in rows:
-        if row.get("imagen"):
-            row["imagen"] = f"/uploads/{row['imagen']}"
     return rows
 
 def before_save(data):
@@ -1677,9 +4750,6 @@ def before_load(params):
     return params
 
 def after_load(rows):
-    for row in rows:
-        if row.get("imagen"):
-            row["imagen"] = f"/uploads/{row['imagen']}"
     return rows
 
 def before_save(data):
@@ -1704,9 +4774,6 @@ def before_load(params):
     return params
 
 def after_load(rows):
-    for row in rows:
-        if row.get("imagen"):
-            row["imagen"] = f"/uploads/{row['imagen']}"
     return rows
 
 def before_save(data):
@@ -1970,28 +5037,6 @@ python manage.py scaffold <table>  # Generate entity from table
 '''
 
 
-def download_static_assets(project_path: Path) -> None:
-    """Download Bootstrap and jQuery assets."""
-    import urllib.request
-    
-    vendor_dir = project_path / "resources/public/vendor"
-    vendor_dir.mkdir(parents=True, exist_ok=True)
-    
-    assets = [
-        ("https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css", "bootstrap.min.css"),
-        ("https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css", "bootstrap-icons.css"),
-        ("https://code.jquery.com/jquery-3.7.1.min.js", "jquery-3.7.1.min.js"),
-        ("https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js", "bootstrap.bundle.min.js"),
-    ]
-    
-    for url, filename in assets:
-        try:
-            path = vendor_dir / filename
-            urllib.request.urlretrieve(url, path)
-        except Exception:
-            pass  # Skip if download fails
-
-
 def write_handlers(project_name: str, project_path: Path) -> None:
     """Write MVC handler files for custom routes."""
     handlers_dir = project_path / "handlers"
@@ -2030,7 +5075,14 @@ def get_base_html(project_name: str) -> str:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{{% block title %}}{{{{ title }}}}{{% endblock %}} - {project_name}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css">
+    {{% if asset_manifest %}}
+    <link rel="stylesheet" href="{{{{ asset_url('vendor.css') }}}}">
+    {{% if grids %}}<link rel="stylesheet" href="{{{{ asset_url('grid.css') }}}}">{{% endif %}}
+    {{% else %}}
+    {{% for url in vendor_urls('vendor.css') + (vendor_urls('grid.css') if grids else []) %}}
+    <link rel="stylesheet" href="{{{{ url }}}}">
+    {{% endfor %}}
+    {{% endif %}}
     <style>
         html, body {{ height: 100%; }}
         body {{ display: flex; flex-direction: column; }}
@@ -2171,49 +5223,31 @@ def get_base_html(project_name: str) -> str:
     </div>
     
     <script>var LOCALE = "{{{{ locale }}}}";</script>
-    <script src="https://code.jquery.com/jquery-3.7.1.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js"></script>
-    <script src="https://cdn.datatables.net/1.13.7/js/jquery.dataTables.min.js"></script>
-    <script src="https://cdn.datatables.net/buttons/2.4.2/js/dataTables.buttons.min.js"></script>
-    <script src="https://cdn.datatables.net/buttons/2.4.2/js/buttons.html5.min.js"></script>
-    <script src="https://cdn.datatables.net/buttons/2.4.2/js/buttons.print.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jszip/3.10.1/jszip.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/pdfmake/0.2.7/pdfmake.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/pdfmake/0.2.7/vfs_fonts.js"></script>
-    <link rel="stylesheet" href="https://cdn.datatables.net/1.13.7/css/jquery.dataTables.min.css">
-    <link rel="stylesheet" href="https://cdn.datatables.net/buttons/2.4.2/css/buttons.dataTables.min.css">
+    {{% if asset_manifest %}}
+    <script src="{{{{ asset_url('vendor.js') }}}}"></script>
+    {{% if grids %}}<script src="{{{{ asset_url('grid.js') }}}}"></script>{{% endif %}}
+    {{% else %}}
+    {{% for url in vendor_urls('vendor.js') + (vendor_urls('grid.js') if grids else []) %}}
+    <script src="{{{{ url }}}}"></script>
+    {{% endfor %}}
+    {{% endif %}}
+    {{% if grids %}}
+    <!-- JSZip/pdfmake load on the first Excel/PDF export click -->
+    <script>
+    var EXPORT_LIBS = {{{{ export_libs() | tojson }}}};
+    var GRID_LANGUAGE = {{{{ grid_language() | tojson }}}};
+    </script>
+    {{% endif %}}
     <script>
     // Theme switcher - must run before DOM ready
     (function() {{
         var theme = localStorage.getItem('theme') || 'sketchy';
-        var themeMap = {{
-            'default': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
-            'cerulean': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/cerulean/bootstrap.min.css',
-            'cosmo': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/cosmo/bootstrap.min.css',
-            'cyborg': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/cyborg/bootstrap.min.css',
-            'darkly': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/darkly/bootstrap.min.css',
-            'flatly': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/flatly/bootstrap.min.css',
-            'journal': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/journal/bootstrap.min.css',
-            'litera': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/litera/bootstrap.min.css',
-            'lumen': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/lumen/bootstrap.min.css',
-            'lux': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/lux/bootstrap.min.css',
-            'materia': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/materia/bootstrap.min.css',
-            'minty': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/minty/bootstrap.min.css',
-            'morph': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/morph/bootstrap.min.css',
-            'pulse': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/pulse/bootstrap.min.css',
-            'quartz': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/quartz/bootstrap.min.css',
-            'sandstone': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/sandstone/bootstrap.min.css',
-            'simplex': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/simplex/bootstrap.min.css',
-            'sketchy': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/sketchy/bootstrap.min.css',
-            'slate': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/slate/bootstrap.min.css',
-            'solar': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/solar/bootstrap.min.css',
-            'spacelab': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/spacelab/bootstrap.min.css',
-            'united': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/united/bootstrap.min.css',
-            'vapor': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/vapor/bootstrap.min.css',
-            'zephyr': 'https://cdn.jsdelivr.net/npm/bootswatch@5.3.2/dist/zephyr/bootstrap.min.css'
-        }};
-        
-        var href = themeMap[theme] || themeMap['default'];
+        var themeMap = {{{{ vendor_theme_urls() | tojson }}}};
+        
+        // Built theme bundles (manage.py assets build) win over the individual files
+        var localThemes = {{{{ theme_urls() | tojson }}}};
+        var href = localThemes[theme] || themeMap[theme]
+            || localThemes['default'] || themeMap['default'];
         var link = document.createElement('link');
         link.rel = 'stylesheet';
         link.id = 'bootswatch-theme';
@@ -2246,7 +5280,8 @@ def get_base_html(project_name: str) -> str:
             var url = $(this).data('url');
             var modal = $('#exampleModal');
             modal.find('.modal-body').html('<div class="text-center py-5"><div class="spinner-border text-primary" role="status"></div></div>');
-            modal.find('.modal-title').text($(this).hasClass('edit-record-btn') ? 'Edit Record' : 'New Record');
+            var title = $(this).hasClass('edit-record-btn') ? 'Edit Record' : 'New Record';
+            modal.find('.modal-title').text($(this).data('title') || title);
             modal.modal('show');
             $.get(url, function(html) {{
                 modal.find('.modal-body').html(html);
@@ -2255,7 +5290,85 @@ def get_base_html(project_name: str) -> str:
             }});
         }});
         
-        $(document).on('submit', '#exampleModal form', function(e) {{
+        // CSV import streams its progress, then shows the result and any rejected rows in the modal
+        $(document).on('submit', '#exampleModal form.import-form', function(e) {{
+            e.preventDefault();
+            var form = $(this);
+            var modal = $('#exampleModal');
+            var status = form.find('.import-status');
+            var btn = form.find('[type="submit"]');
+            var xhr = new XMLHttpRequest();
+            var parsed = 0;
+            var last = null;
+            var spinner = '<span class="spinner-border spinner-border-sm me-2"></span>';
+            var showStatus = function(kind, html) {{
+                status.html('<div class="alert alert-' + kind + ' mb-0">' + html + '</div>');
+            }};
+            var readLines = function() {{
+                var text = xhr.responseText;
+                var end = xhr.readyState === 4 ? text.length : text.lastIndexOf('\\n') + 1;
+                text.slice(parsed, end).split('\\n').forEach(function(line) {{
+                    if (line.trim()) last = JSON.parse(line);
+                }});
+                parsed = Math.max(parsed, end);
+            }};
+            var fail = function(message) {{
+                showStatus('danger', $('<div>').text('Error: ' + message).html());
+                btn.prop('disabled', false).html('<i class="bi bi-upload me-2"></i>Import');
+            }};
+            
+            btn.prop('disabled', true).html(spinner + 'Uploading...');
+            xhr.open('POST', form.attr('action'));
+            xhr.upload.onprogress = function(ev) {{
+                if (ev.lengthComputable) {{
+                    btn.html(spinner + 'Uploading ' + Math.round(ev.loaded / ev.total * 100) + '%');
+                }}
+            }};
+            xhr.upload.onload = function() {{
+                btn.html(spinner + 'Importing...');
+            }};
+            xhr.onprogress = function() {{
+                readLines();
+                if (last && !last.done) {{
+                    showStatus('info', last.inserted + ' imported, ' + last.rejected + ' rejected');
+                }}
+            }};
+            xhr.onload = function() {{
+                try {{
+                    readLines();
+                }} catch (err) {{
+                    last = null;
+                }}
+                if (!last || !last.ok || !last.done) {{
+                    fail((last && last.error) || 'Import failed');
+                    return;
+                }}
+                var html = $('<div>').text(last.message).html();
+                if (last.error_file) {{
+                    html += ' <a class="alert-link" href="' + last.error_file + '">'
+                        + 'Download rejected rows</a>';
+                    if (last.errors.length) {{
+                        var items = last.errors.slice(0, 5).map(function(err) {{
+                            var text = 'Line ' + err.line + ': ' + err.error;
+                            return '<li>' + $('<div>').text(text).html() + '</li>';
+                        }});
+                        html += '<ul class="mb-0 mt-2 small">' + items.join('') + '</ul>';
+                    }}
+                }}
+                showStatus(last.rejected ? 'warning' : 'success', html);
+                btn.remove();
+                // The grid shows the new rows once the modal is closed
+                modal.one('hidden.bs.modal', function() {{
+                    window.location.href = last.redirect;
+                }});
+            }};
+            xhr.onerror = function() {{
+                fail('Import failed');
+            }};
+            xhr.send(new FormData(this));
+        }});
+        
+        $(document).on('submit', '#exampleModal form:not(.import-form)', function(e) {{
             e.preventDefault();
             var form = $(this);
             var modal = $('#exampleModal');
@@ -2263,36 +5376,76 @@ def get_base_html(project_name: str) -> str:
             btn.prop('disabled', true).html('<span class="spinner-border spinner-border-sm me-2"></span>Saving...');
             
             var formData = new FormData(this);
-            $.ajax({{
-                url: form.attr('action'),
-                type: 'POST',
-                data: formData,
-                processData: false,
-                contentType: false,
-                success: function(resp) {{
-                    if (resp.ok) {{
-                        modal.modal('hide');
-                        if (resp.redirect) {{
-                            window.location.href = resp.redirect;
+            var resetButton = function() {{
+                btn.prop('disabled', false).html('<i class="bi bi-check-lg me-2"></i>Submit');
+            }};
+            // Large files go ahead in resumable chunks; the form then only references them
+            var onProgress = function(done) {{
+                var percent = Math.round(done * 100) + '%';
+                var spinner = '<span class="spinner-border spinner-border-sm me-2"></span>';
+                btn.html(spinner + 'Uploading ' + percent);
+            }};
+            var uploads = window.prepareChunkedUploads
+                ? window.prepareChunkedUploads(this, formData, onProgress)
+                : Promise.resolve();
+            uploads.then(function() {{
+                btn.html('<span class="spinner-border spinner-border-sm me-2"></span>Saving...');
+                $.ajax({{
+                    url: form.attr('action'),
+                    type: 'POST',
+                    data: formData,
+                    processData: false,
+                    contentType: false,
+                    success: function(resp) {{
+                        if (resp.ok) {{
+                            modal.modal('hide');
+                            if (window.applySavedRecord && window.applySavedRecord(resp)) {{
+                                return;
+                            }}
+                            if (resp.redirect) {{
+                                window.location.href = resp.redirect;
+                            }} else {{
+                                location.reload();
+                            }}
                         }} else {{
-                            location.reload();
+                            alert('Error: ' + (resp.errors || resp.error || 'Unknown error'));
+                            resetButton();
                         }}
-                    }} else {{
-                        alert('Error: ' + (resp.errors || resp.error || 'Unknown error'));
-                        btn.prop('disabled', false).html('<i class="bi bi-check-lg me-2"></i>Submit');
+                    }},
+                    error: function(xhr) {{
+                        alert('Error saving record');
+                        resetButton();
                     }}
-                }},
-                error: function(xhr) {{
-                    alert('Error saving record');
-                    btn.prop('disabled', false).html('<i class="bi bi-check-lg me-2"></i>Submit');
-                }}
+                }});
+            }}, function(err) {{
+                // err is an Error, or the jqXHR of a refused upload
+                var refused = err.responseJSON && err.responseJSON.error;
+                alert('Error: ' + (err.message || refused || 'Upload failed'));
+                resetButton();
             }});
         }});
         
         $(document).on('click', '.delete-record-btn', function(e) {{
             if (!confirm('Are you sure you want to delete this record?')) {{
                 e.preventDefault();
+                return;
             }}
+            if (!window.applyDeletedRecord) return;
+            
+            // Pages that can patch themselves delete in the background
+            e.preventDefault();
+            $.ajax({{
+                url: $(this).attr('href'),
+                headers: {{ 'X-Requested-With': 'XMLHttpRequest' }}
+            }}).done(function(resp) {{
+                if (!resp.success) {{
+                    alert('Error: ' + (resp.error || 'Unknown error'));
+                }} else if (!window.applyDeletedRecord(resp)) {{
+                    location.reload();
+                }}
+            }}).fail(function() {{
+                alert('Error deleting record');
+            }});
         }});
     }});
     </script>
@@ -2403,6 +5556,7 @@ def get_welcome_html() -> str:
 
 def get_reports_dashboard_html() -> str:
     return '''{% extends "base.html" %}
+{% set grids = true %}
 {% block content %}
 {{ content | safe }}
 {% endblock %}
@@ -2414,6 +5568,7 @@ def get_reports_dashboard_html() -> str:
 
 def get_entity_html() -> str:
     return '''{% extends "base.html" %}
+{% set grids = true %}
 {% block content %}
 {{ content | safe }}
 {% endblock %}'''
@@ -2546,6 +5701,10 @@ Commands:
     python manage.py migrate      # Run database migrations  
     python manage.py seed         # Seed database with demo data
     python manage.py scaffold <table>  # Generate entity from table
+    python manage.py import <entity> <file.csv>  # Bulk import CSV rows
+    python manage.py i18n         # Report translation keys missing per locale
+    python manage.py compile      # Precompile entity/i18n YAML into db/config.snapshot
+    python manage.py assets build # Vendor, bundle, minify and precompress static assets
     python manage.py shell        # Start interactive shell with app context
 """
 import os
@@ -2622,6 +5781,10 @@ def generate_models_from_migrations(migrations: list):
         "INTEGER": "db.Integer",
         "INT": "db.Integer", 
         "BIGINT": "db.BigInteger",
+        # PostgreSQL auto-increment keys
+        "SMALLSERIAL": "db.SmallInteger",
+        "SERIAL": "db.Integer",
+        "BIGSERIAL": "db.BigInteger",
         "VARCHAR": "db.String(255)",
         "CHAR": "db.String(1)",
         "TEXT": "db.Text",
@@ -2695,7 +5858,9 @@ def generate_models_from_migrations(migrations: list):
             
             for col in columns:
                 if col["primary"]:
-                    lines.append('    ' + col["name"] + ' = db.Column(db.Integer, primary_key=True)')
+                    lines.append(
+                        '    ' + col["name"] + ' = db.Column(' + col["type"] + ', primary_key=True)'
+                    )
                 elif not col["nullable"]:
                     lines.append('    ' + col["name"] + ' = db.Column(' + col["type"] + ', nullable=False)')
                 else:
@@ -2772,6 +5937,85 @@ def scaffold_all(force: bool = False):
         do_scaffold_all(force)
 
 
+def import_file(entity: str, csv_path: str, batch_size: int = None, errors_path: str = None):
+    """Bulk import a CSV file into an entity table."""
+    import time
+    from app import create_app
+    from config import config
+    app = create_app()
+    batch_size = batch_size or config.get("import.batch_size", 5000)
+    
+    errors_path = errors_path or f"{{csv_path}}.errors.csv"
+    started = time.perf_counter()
+    
+    def report(result):
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        done = result.inserted + result.rejected
+        counts = f"{{result.inserted:,}} imported, {{result.rejected:,}} rejected"
+        print(f"\\r  {{counts}} ({{done / elapsed:,.0f}} rows/s)", end="", flush=True)
+    
+    with app.app_context():
+        from engine.bulk import import_csv
+        with (
+            open(csv_path, newline="", encoding="utf-8-sig") as source,
+            open(errors_path, "w", newline="") as error_file,
+        ):
+            result = import_csv(entity, source, batch_size, error_file, progress=report)
+    
+    print()
+    if result.rejected:
+        print(f"Rejected rows written to {{errors_path}}")
+    else:
+        Path(errors_path).unlink()
+    elapsed = time.perf_counter() - started
+    print(f"Imported {{result.inserted:,}} row(s) into {{entity}} in {{elapsed:.2f}}s")
+
+
+def report_missing_translations(reference: str = "en"):
+    """Print translation keys defined in the reference locale but missing elsewhere."""
+    from app import create_app
+    create_app()
+    from i18n import I18N
+    
+    report = I18N.missing_keys(reference)
+    if not report:
+        print(f"All locales define every key in {{reference}}")
+        return
+    for locale, keys in report.items():
+        print(f"{{locale}}: {{len(keys)}} missing")
+        for key in keys:
+            print(f"  {{key}}")
+
+
+def compile_configs():
+    """Write the precompiled entity/translation snapshot loaded at startup."""
+    import time
+    from config import config
+    config.load()
+    from engine.snapshot import SNAPSHOT_PATH, write_snapshot
+    
+    started = time.perf_counter()
+    snapshot = write_snapshot()
+    elapsed = time.perf_counter() - started
+    counts = f"{{len(snapshot['entities'])}} entities and {{len(snapshot['i18n'])}} locales"
+    print(f"Compiled {{counts}} into {{SNAPSHOT_PATH}} in {{elapsed:.2f}}s")
+
+
+def build_static_assets(download: bool = True, refresh: bool = False):
+    """Vendor, bundle, minify and precompress static assets into resources/public/dist."""
+    from config import config
+    config.load()
+    from engine.bundle import AssetBuildError, build_assets
+    
+    default_theme = config.get("ui.default_theme", "default")
+    themes = list(dict.fromkeys(config.get("ui.themes", []) + [default_theme]))
+    try:
+        build_assets(themes=themes, download=download, refresh=refresh)
+    except AssetBuildError as e:
+        print(f"Error: {{e}}")
+        sys.exit(1)
+
+
 def run_shell():
     """Start an interactive Python shell with app context."""
     import importlib
@@ -2836,6 +6080,33 @@ def main():
     scaffold_parser.add_argument("--all", action="store_true", help="Scaffold all tables")
     scaffold_parser.add_argument("--force", action="store_true", help="Overwrite existing entities and hooks")
     
+    import_parser = subparsers.add_parser("import", help="Bulk import a CSV file into an entity")
+    import_parser.add_argument("entity", help="Entity name")
+    import_parser.add_argument("file", help="CSV file with a header row")
+    import_parser.add_argument(
+        "--batch-size", type=int, help="Rows per transaction (default: import.batch_size)"
+    )
+    import_parser.add_argument(
+        "--errors", help="Where to write rejected rows (default: <file>.errors.csv)"
+    )
+    
+    i18n_parser = subparsers.add_parser("i18n", help="Report translation keys missing per locale")
+    i18n_parser.add_argument(
+        "--reference", default="en", help="Locale whose keys every other locale should define"
+    )
+    
+    subparsers.add_parser("compile", help="Precompile entity and i18n YAML into a startup snapshot")
+    
+    assets_parser = subparsers.add_parser("assets", help="Build static asset bundles")
+    assets_parser.add_argument("action", choices=["build"])
+    assets_parser.add_argument(
+        "--no-download",
+        action="store_true",
+        help="Use only files already in resources/public/vendor",
+    )
+    assets_parser.add_argument(
+        "--refresh", action="store_true", help="Download vendor files again even if present"
+    )
     subparsers.add_parser("shell", help="Start interactive shell with app context")
     
     args = parser.parse_args()
@@ -2854,6 +6125,14 @@ def main():
         else:
             print("Error: Specify a table name or use --all")
             parser.print_help()
+    elif args.command == "import":
+        import_file(args.entity, args.file, args.batch_size, args.errors)
+    elif args.command == "i18n":
+        report_missing_translations(args.reference)
+    elif args.command == "compile":
+        compile_configs()
+    elif args.command == "assets":
+        build_static_assets(not args.no_download, args.refresh)
     elif args.command == "shell":
         run_shell()
     else:
@@ -3079,16 +6358,21 @@ hooks:
 
 ```python
 # hooks/contactos.py
-
 def after_load(rows):
-    """Called after loading records."""
+    """Called after loading records. File fields become versioned /uploads URLs afterwards."""
     for row in rows:
-        if row.get("imagen"):
-            row["imagen"] = f"/uploads/{row[\'imagen\']}"
         row["full_name"] = f"{row.get(\'firstname\', \'\')} {row.get(\'lastname\', \'\')}"
     return rows
 
 
+def after_load_columns(payload):
+    """Columnar rows (/admin/subgrid?format=columns): {"columns": [...], "data": [[...], ...]}.
+    
+    Without it, an entity with after_load gets its columnar rows through after_load as dicts.
+    """
+    return payload
+
+
 def before_save(data):
     """Called before saving. Return {"errors": {...}} to cancel."""
     if not data.get("email"):
@@ -3112,6 +6396,11 @@ def after_delete(data):
     """Called after delete."""
     print(f"Record {data.get(\'id\')} deleted")
     return {"success": True}
+
+
+def before_delete_many(data):
+    """Called once before a bulk delete with {"ids": [...]}. Return {"errors": {...}} to cancel."""
+    return {"success": True}
 ```
 
 ---
@@ -3132,8 +6421,8 @@ custom_dropdowns = {
     ],
 }
 
-def get_menu_config():
-    auto = get_auto_menu_config()
+def get_menu_config(level=None, locale=None):
+    auto = get_auto_menu_config(level, locale)
     return {
         "nav_links": auto.get("nav_links", []) + custom_nav_links,
         "dropdowns": {**auto.get("dropdowns", {}), **custom_dropdowns}
@@ -3173,9 +6462,33 @@ def get_menu_config():
 | GET | `/admin/{entity}/` | List/view entity |
 | GET | `/admin/{entity}/add-form/` | Get new record form |
 | GET | `/admin/{entity}/edit-form/{id}` | Get edit form |
-| POST | `/admin/{entity}/save` | Save record |
-| GET | `/admin/{entity}/delete/{id}` | Delete record |
-| GET | `/admin/subgrid` | Get subgrid data (JSON) |
+| POST | `/admin/{entity}/save` | Save record (JSON with the saved row and its detail fragment) |
+| GET | `/admin/{entity}/delete/{id}` | Delete record (JSON for XHR requests) |
+| GET | `/admin/{entity}/export.csv` | Stream all records as CSV |
+| GET | `/admin/{entity}/export.ndjson` | Stream all records as NDJSON |
+| POST | `/admin/{entity}/import` | Bulk import a CSV file; streams NDJSON progress and result |
+| POST | `/admin/{entity}/bulk-delete` | Delete the `ids` or `filter` records in one transaction |
+| POST | `/admin/{entity}/bulk-update` | Set `values` on the `ids` or `filter` records at once |
+| GET | `/admin/subgrid` | Subgrid rows and schema version (JSON); see the parameters below |
+| GET | `/admin/schema/{entity}?v=` | Get grid schema (cached as immutable when `v` matches) |
+| GET | `/admin/events?entities=` | Server-Sent Events feed of changes to the listed entities |
+| GET | `/assets/{path}.{hash}.{ext}` | Immutable file from `resources/public` (see `asset_url()`) |
+| GET | `/assets/dist/{bundle}` | Bundle from `manage.py assets build`, as `.br`/`.gz` if accepted |
+| GET | `/uploads/{file}?v={token}` | Uploaded file (URL from `upload_url()`); see below |
+| POST | `/admin/uploads` | Start a resumable upload; see below |
+| GET/PUT | `/admin/uploads/{id}` | Stored offset / append the request body at `?offset=` |
+| GET | `/uploads/{file}?v={token}&w={px}` | WebP thumbnail for a `px`-wide slot (`thumb_url()`) |
+| GET | `/admin/subgrids?parent_entity=&parent_id=` | All subgrids of a parent record at once |
+
+`/admin/subgrid` takes `entity`, `parent_id` and `foreign_key`, plus `schema=1` to
+inline the schema, `format=columns` for columnar rows and `since=` for a delta.
+
+`/uploads/{file}` is cached as immutable when `v` is the file's current token and
+revalidated (304) otherwise. With `w=`, the original is served uncached until its
+thumbnail exists.
+
+`POST /admin/uploads` takes `{filename, size}` and returns `{id, chunk_size, offset}`;
+once every chunk is in, forms send `upload:{id}` in place of the file.
 
 ---
 
@@ -3190,7 +6503,7 @@ def get_menu_config():
 '''
 
 
-def write_all_templates(project_name: str, project_path: Path) -> None:
+def write_all_templates(project_name: str, project_path: Path, fetch_assets: bool = False) -> None:
     """Write all template files for a new project."""
     
     def ensure_dir(path: Path) -> None:
@@ -3246,6 +6559,52 @@ def write_all_templates(project_name: str, project_path: Path) -> None:
     ensure_dir(project_path / "engine/query.py")
     (project_path / "engine/query.py").write_text(get_engine_query())
     
+    # Engine Export
+    ensure_dir(project_path / "engine/export.py")
+    (project_path / "engine/export.py").write_text(get_engine_export())
+    
+    # Engine Serialize
+    ensure_dir(project_path / "engine/serialize.py")
+    (project_path / "engine/serialize.py").write_text(get_engine_serialize())
+    
+    # Engine Sync
+    ensure_dir(project_path / "engine/sync.py")
+    (project_path / "engine/sync.py").write_text(get_engine_sync())
+    
+    # Engine Events
+    ensure_dir(project_path / "engine/events.py")
+    (project_path / "engine/events.py").write_text(get_engine_events())
+    
+    # Engine Uploads
+    ensure_dir(project_path / "engine/uploads.py")
+    (project_path / "engine/uploads.py").write_text(get_engine_uploads())
+    
+    # Engine Thumbnails
+    ensure_dir(project_path / "engine/thumbnails.py")
+    (project_path / "engine/thumbnails.py").write_text(get_engine_thumbnails())
+    
+    # Engine Assets
+    ensure_dir(project_path / "engine/assets.py")
+    (project_path / "engine/assets.py").write_text(get_engine_assets())
+    ensure_dir(project_path / "resources/public/js/tabgrid.js")
+    (project_path / "resources/public/js/tabgrid.js").write_text(get_tabgrid_js())
+    
+    # Engine Bundle
+    ensure_dir(project_path / "engine/bundle.py")
+    (project_path / "engine/bundle.py").write_text(get_engine_bundle())
+    
+    # Engine Bulk
+    ensure_dir(project_path / "engine/bulk.py")
+    (project_path / "engine/bulk.py").write_text(get_engine_bulk())
+    
+    # Engine Snapshot
+    ensure_dir(project_path / "engine/snapshot.py")
+    (project_path / "engine/snapshot.py").write_text(get_engine_snapshot())
+    
+    # Engine Watcher
+    ensure_dir(project_path / "engine/watcher.py")
+    (project_path / "engine/watcher.py").write_text(get_engine_watcher())
+    
     # Engine Render
     ensure_dir(project_path / "engine/render.py")
     (project_path / "engine/render.py").write_text(get_engine_render())
@@ -3285,7 +6644,12 @@ def write_all_templates(project_name: str, project_path: Path) -> None:
     ensure_dir(project_path / "PYWEBGEN_CHEATSHEET.md")
     (project_path / "PYWEBGEN_CHEATSHEET.md").write_text(get_pywebgen_cheatsheet())
     
-    # Download static assets
-    download_static_assets(project_path)
+    # Vendored static assets (shipped with pywebgen; downloaded only with fetch_assets)
+    problems = install_vendor_assets(project_path, fetch=fetch_assets)
+    if problems:
+        print(f"Warning: {len(problems)} vendor file(s) failed verification; "
+              "base.html loads them from their CDNs:")
+        for problem in problems:
+            print(f"  - {problem}")
     
     print(f"Project created: {project_path}")
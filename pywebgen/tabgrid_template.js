@@ -0,0 +1,567 @@
+/*
+ * Tabgrid - tabbed record view with AJAX subgrids, plus dashboard grids
+ *
+ * The same file serves every page and is cached by the browser; pages
+ * configure it through data attributes:
+ *   .tabgrid-container   data-entity, data-selected-parent-id, data-user-id, data-live
+ *   .tab-pane            data-subgrid-entity, data-foreign-key, data-parent-id
+ *   table                data-dashboard-grid
+ *   input[type=file]     data-chunk-size
+ * and base.html sets window.EXPORT_LIBS to the script URLs the Excel and
+ * PDF buttons load on first click, and window.GRID_LANGUAGE to the
+ * DataTables language object for the current locale.
+ */
+(function() {
+    if (window.tabgridLoaded) return;
+    window.tabgridLoaded = true;
+
+    // Export libraries (JSZip, pdfmake) are over 1 MB, so they load on the first Excel/PDF click
+    const loadedScripts = {};
+
+    function loadScript(url) {
+        if (!loadedScripts[url]) {
+            loadedScripts[url] = new Promise(function(resolve, reject) {
+                const script = document.createElement('script');
+                script.src = url;
+                script.onload = resolve;
+                script.onerror = function() {
+                    delete loadedScripts[url];
+                    reject(new Error('Could not load ' + url));
+                };
+                document.head.appendChild(script);
+            });
+        }
+        return loadedScripts[url];
+    }
+
+    // One after another: vfs_fonts needs pdfmake in place
+    window.loadExportLibs = function(kind) {
+        const urls = (window.EXPORT_LIBS && window.EXPORT_LIBS[kind]) || [];
+        return urls.reduce(function(chain, url) {
+            return chain.then(function() { return loadScript(url); });
+        }, Promise.resolve());
+    };
+
+    // Runs the stock HTML5 export button once its library is loaded
+    function lazyExportButton(kind, html5Name, className, text) {
+        return {
+            className: className,
+            text: text,
+            action: function(e, dt, node, config) {
+                const button = this;
+                button.processing(true);
+                window.loadExportLibs(kind).then(function() {
+                    button.processing(false);
+                    const html5 = $.fn.dataTable.ext.buttons[html5Name];
+                    html5.action.call(button, e, dt, node, $.extend(true, {}, html5, config));
+                }, function(err) {
+                    button.processing(false);
+                    alert(err.message);
+                });
+            }
+        };
+    }
+
+    // Files bigger than one chunk go to /admin/uploads in pieces before the form posts;
+    // the form then carries "upload:<id>" in place of the file
+    function uploadInChunks(file, csrfToken, onProgress) {
+        const headers = { 'X-CSRFToken': csrfToken };
+        return $.ajax({
+            url: '/admin/uploads',
+            type: 'POST',
+            contentType: 'application/json',
+            headers: headers,
+            data: JSON.stringify({ filename: file.name, size: file.size })
+        }).then(function(session) {
+            function sendFrom(offset, retries) {
+                onProgress(offset / file.size);
+                if (offset >= file.size) return session.id;
+                return $.ajax({
+                    url: '/admin/uploads/' + session.id + '?offset=' + offset,
+                    type: 'PUT',
+                    data: file.slice(offset, offset + session.chunk_size),
+                    processData: false,
+                    contentType: 'application/octet-stream',
+                    headers: headers
+                }).then(function(resp) {
+                    return sendFrom(resp.offset, 3);
+                }, function() {
+                    if (retries <= 0) throw new Error('Upload of ' + file.name + ' failed');
+                    // Resume from whatever the server actually stored
+                    return $.getJSON('/admin/uploads/' + session.id).then(function(status) {
+                        return sendFrom(status.offset, retries - 1);
+                    });
+                });
+            }
+            return sendFrom(session.offset, 3);
+        });
+    }
+
+    window.prepareChunkedUploads = function(form, formData, onProgress) {
+        const csrfToken = $(form).find('[name="csrf_token"]').val();
+        const pending = [];
+        $(form).find('input[type="file"][data-chunk-size]').each(function() {
+            const input = this;
+            const file = input.files[0];
+            if (!file || file.size <= Number(input.dataset.chunkSize)) return;
+            pending.push(uploadInChunks(file, csrfToken, onProgress).then(function(uploadId) {
+                formData.set(input.name, 'upload:' + uploadId);
+            }));
+        });
+        return Promise.all(pending);
+    };
+
+    // DataTables options shared by every grid
+    window.gridConfig = function(options) {
+        const dtConfig = Object.assign({
+            responsive: true,
+            pageLength: 10,
+            dom: '<"row"<"col-sm-12 col-md-6"l><"col-sm-12 col-md-6"f>>Brtip',
+            buttons: [
+                lazyExportButton('excel', 'excelHtml5', 'btn btn-success btn-sm', '<i class="bi bi-file-earmark-excel"></i> Excel'),
+                lazyExportButton('pdf', 'pdfHtml5', 'btn btn-danger btn-sm', '<i class="bi bi-file-earmark-pdf"></i> PDF'),
+                { extend: 'print', className: 'btn btn-info btn-sm', text: '<i class="bi bi-printer"></i> Print' }
+            ]
+        }, options);
+        // Built from the locale's grid.* keys, so no language file is fetched
+        if (window.GRID_LANGUAGE && !dtConfig.language) {
+            dtConfig.language = window.GRID_LANGUAGE;
+        }
+        return dtConfig;
+    };
+
+    window.initGrid = function(table, options) {
+        const dt = table.DataTable(window.gridConfig(options));
+        dt.buttons().container().appendTo('#' + table.attr('id') + '_wrapper .col-md-6:eq(0)');
+        return dt;
+    };
+
+    // Saves and deletes patch the page in place instead of reloading it
+    function initRecordPatching() {
+        window.applySavedRecord = function(resp) {
+            if (!resp.row) return false;
+            if (resp.entity === window.tabgridEntity) {
+                // A new parent record changes what every subgrid shows: navigate to it
+                if (resp.created || !resp.detail) return false;
+                $('.parent-record-view').replaceWith(resp.detail);
+
+                const selector = $('#' + window.tabgridEntity + '-select-table');
+                const tr = $('.select-parent-btn[data-parent-id="' + resp.id + '"]').closest('tr');
+                if ($.fn.DataTable.isDataTable(selector) && tr.length && resp.selector_row) {
+                    // The server renders the row like the list view: thumbnails, option and FK labels
+                    const cells = $('<tbody>').html(resp.selector_row).find('td').map(function() {
+                        return this.innerHTML;
+                    }).get();
+                    selector.DataTable().row(tr).data(cells).draw(false);
+                }
+                return true;
+            }
+
+            const pane = document.querySelector('.tab-pane[data-subgrid-entity="' + resp.entity + '"]');
+            if (!pane || pane.dataset.loaded !== 'true') return false;
+            window.patchSubgridTable(pane, { columns: Object.keys(resp.row), data: [Object.values(resp.row)], deleted: [] });
+            return true;
+        };
+
+        window.applyDeletedRecord = function(resp) {
+            if (resp.entity === window.tabgridEntity) {
+                window.location.href = '/admin/' + resp.entity;
+                return true;
+            }
+            const pane = document.querySelector('.tab-pane[data-subgrid-entity="' + resp.entity + '"]');
+            if (!pane || pane.dataset.loaded !== 'true') return false;
+            window.applySubgridChange(pane, { action: 'delete', ids: [resp.id] });
+            return true;
+        };
+    }
+
+    function initSubgrids() {
+        // Fetch every subgrid of the parent in one request; all tabs share the result
+        window.subgridRequest = null;
+        window.fetchSubgrids = function(parentId) {
+            if (!window.subgridRequest) {
+                const entities = $('.tab-pane[data-subgrid-entity]').map(function() {
+                    return this.dataset.subgridEntity;
+                }).get();
+                window.subgridRequest = $.ajax({
+                    url: '/admin/subgrids',
+                    method: 'GET',
+                    data: {
+                        parent_entity: window.tabgridEntity,
+                        parent_id: parentId,
+                        entities: entities.join(','),
+                        format: 'columns'
+                    }
+                });
+            }
+            return window.subgridRequest;
+        };
+
+        // Schemas are immutable per version: keep them for the browser session, across tabs and parents
+        window.subgridSchemas = {};
+        window.getSubgridSchema = function(entity, version, inline) {
+            const key = 'subgrid-schema:' + entity + ':' + version;
+            if (!window.subgridSchemas[key]) {
+                let cached = inline && inline.fields ? inline : null;
+                if (!cached) {
+                    try { cached = JSON.parse(sessionStorage.getItem(key)); } catch (e) { cached = null; }
+                }
+                window.subgridSchemas[key] = cached ? $.Deferred().resolve(cached).promise() :
+                    $.getJSON('/admin/schema/' + entity, { v: version }).then(function(schema) {
+                        try { sessionStorage.setItem(key, JSON.stringify(schema)); } catch (e) {}
+                        return schema;
+                    });
+            }
+            return window.subgridSchemas[key];
+        };
+
+        window.showSubgridData = function(pane, response) {
+            const loadingDiv = pane.querySelector('.subgrid-loading');
+            const tableWrapper = pane.querySelector('.subgrid-table-wrapper');
+            const subgridEntity = pane.dataset.subgridEntity;
+
+            if (pane.dataset.loaded === 'true') return;
+            if (!response || !response.success) {
+                if (loadingDiv) {
+                    loadingDiv.innerHTML = '<div class="alert alert-danger">Failed to load subgrid data: ' + ((response && response.error) || 'unavailable') + '</div>';
+                }
+                return;
+            }
+
+            window.getSubgridSchema(subgridEntity, response.schema_version, response).then(function(schema) {
+                if (pane.dataset.loaded === 'true') return;
+                if (loadingDiv) loadingDiv.style.display = 'none';
+                if (tableWrapper) tableWrapper.style.display = 'block';
+
+                const tableId = tableWrapper.querySelector('table').id;
+                if (response.columns) {
+                    window.renderSubgridTable(tableId, response.data, schema.fields, schema.field_types, schema.field_options, subgridEntity, pane.dataset.parentId, response.columns);
+                } else {
+                    window.renderSubgridTable(tableId, response.rows, schema.fields, schema.field_types, schema.field_options, subgridEntity, pane.dataset.parentId);
+                }
+                pane.subgridColumns = response.columns || null;
+                pane.dataset.syncVersion = response.version || '';
+                pane.dataset.loaded = 'true';
+            }, function(xhr, status, error) {
+                if (loadingDiv) {
+                    loadingDiv.innerHTML = '<div class="alert alert-danger">Failed to load subgrid schema: ' + error + '</div>';
+                }
+            });
+        };
+
+        window.loadSubgridData = function(pane) {
+            const subgridEntity = pane.dataset.subgridEntity;
+            const parentId = pane.dataset.parentId;
+
+            if (!parentId || parentId === '' || parentId === 'None') {
+                pane.querySelector('.subgrid-loading').innerHTML = '<div class="alert alert-warning">Please select a parent record first</div>';
+                return;
+            }
+
+            // The active tab's rows are embedded in the page; no request needed
+            const inline = pane.querySelector('script.subgrid-data');
+            if (inline) {
+                window.showSubgridData(pane, JSON.parse(inline.textContent));
+                inline.remove();
+                return;
+            }
+
+            const loadingDiv = pane.querySelector('.subgrid-loading');
+            window.fetchSubgrids(parentId).then(
+                function(batch) {
+                    window.showSubgridData(pane, batch.subgrids[subgridEntity]);
+                },
+                function(xhr, status, error) {
+                    window.subgridRequest = null;
+                    console.error('loadSubgridData error:', error);
+                    if (loadingDiv) {
+                        loadingDiv.innerHTML = '<div class="alert alert-danger">Failed to load subgrid data: ' + error + '</div>';
+                    }
+                }
+            );
+        };
+
+        // Bring a rendered subgrid up to date: only rows changed since the last sync, or a full reload
+        window.syncSubgrid = function(pane) {
+            const params = {
+                entity: pane.dataset.subgridEntity,
+                parent_id: pane.dataset.parentId,
+                foreign_key: pane.dataset.foreignKey,
+                format: 'columns'
+            };
+            if (pane.dataset.syncVersion) params.since = pane.dataset.syncVersion;
+
+            $.getJSON('/admin/subgrid', params).then(function(response) {
+                if (!response.success) return;
+                if (!response.delta) {
+                    pane.dataset.loaded = 'false';
+                    window.showSubgridData(pane, response);
+                    return;
+                }
+                window.patchSubgridTable(pane, response);
+                pane.dataset.syncVersion = response.version;
+            });
+        };
+
+        window.patchSubgridTable = function(pane, response) {
+            const dt = $(pane).find('.subgrid-table-wrapper table').DataTable();
+            const known = pane.subgridColumns;
+            const columns = response.columns;
+            const toRow = function(values) {
+                if (known) return known.map(function(name) { const i = columns.indexOf(name); return i < 0 ? null : values[i]; });
+                return Object.fromEntries(columns.map(function(name, i) { return [name, values[i]]; }));
+            };
+            const rowId = function(row) { return String(known ? row[known.indexOf('id')] : row.id); };
+
+            const changed = new Map(response.data.map(function(values) {
+                return [String(values[columns.indexOf('id')]), toRow(values)];
+            }));
+            const deleted = new Set(response.deleted.map(String));
+            const removed = [];
+
+            dt.rows().every(function(index) {
+                const id = rowId(this.data());
+                if (deleted.has(id)) {
+                    removed.push(index);
+                } else if (changed.has(id)) {
+                    this.data(changed.get(id));
+                    changed.delete(id);
+                }
+            });
+            dt.rows(removed).remove();
+            dt.rows.add(Array.from(changed.values()));
+            dt.draw(false);
+        };
+
+        // Deleted rows are dropped straight away; other changes go through a (delta) sync
+        window.applySubgridChange = function(pane, change) {
+            if (change.action === 'delete' && change.ids) {
+                const dt = $(pane).find('.subgrid-table-wrapper table').DataTable();
+                const deleted = new Set(change.ids.map(String));
+                const idAt = pane.subgridColumns ? pane.subgridColumns.indexOf('id') : -1;
+                dt.rows(function(index, row) {
+                    return deleted.has(String(idAt >= 0 ? row[idAt] : row.id));
+                }).remove().draw(false);
+                return;
+            }
+            clearTimeout(pane.syncTimer);
+            pane.syncTimer = setTimeout(function() { window.syncSubgrid(pane); }, 200);
+        };
+
+        // rowColumns is set for columnar payloads: rows are then arrays indexed by column position
+        window.renderSubgridTable = function(tableId, rows, fields, fieldTypes, fieldOptions, subgridEntity, parentId, rowColumns) {
+            const table = $('#' + tableId);
+            const columnIndex = rowColumns ? Object.fromEntries(rowColumns.map(function(name, i) { return [name, i]; })) : null;
+            const rowId = function(row) { return columnIndex ? row[columnIndex.id] : row.id; };
+
+            if ($.fn.DataTable.isDataTable(table)) {
+                table.DataTable().destroy();
+            }
+
+            let theadHtml = '<tr>';
+            for (const fieldLabel of Object.values(fields)) {
+                theadHtml += '<th>' + fieldLabel + '</th>';
+            }
+            theadHtml += '<th>Actions</th></tr>';
+            table.find('thead').html(theadHtml);
+
+            const columns = [];
+            for (const fieldId of Object.keys(fields)) {
+                const fieldType = fieldTypes[fieldId];
+                const options = fieldOptions[fieldId] || {};
+
+                columns.push({
+                    data: columnIndex ? function(row) { return row[columnIndex[fieldId]]; } : fieldId,
+                    defaultContent: '',
+                    render: function(data, type, row) {
+                        if (type === 'display') {
+                            if (fieldType === 'file' || fieldId === 'imagen' || fieldId === 'image') {
+                                if (data) {
+                                    // after_load hooks may already have turned the name into a versioned URL
+                                    const src = data.charAt(0) === '/' ? data : '/uploads/' + encodeURIComponent(data);
+                                    const thumb = src.indexOf('/uploads/') === 0 ? src + (src.indexOf('?') === -1 ? '?' : '&') + 'w=50' : src;
+                                    return '<img src="' + thumb + '" loading="lazy" style="max-width:50px;max-height:50px;border-radius:4px;">';
+                                }
+                                return '-';
+                            }
+                            if (fieldType === 'select' || fieldType === 'radio') {
+                                if (data && options[String(data)]) {
+                                    return options[String(data)];
+                                }
+                                return data || '-';
+                            }
+                            if (data === null || data === undefined) return '-';
+                            return data;
+                        }
+                        return data;
+                    }
+                });
+            }
+            columns.push({
+                data: null,
+                render: function(data, type, row) {
+                    const editUrl = '/admin/' + subgridEntity + '/edit-form/' + rowId(row) + '?parent_entity=' + window.tabgridEntity + '&parent_id=' + parentId;
+                    const deleteUrl = '/admin/' + subgridEntity + '/delete/' + rowId(row) + '?parent_entity=' + window.tabgridEntity + '&parent_id=' + parentId;
+                    return '<div class="btn-group btn-group-sm">' +
+                        '<a href="#" class="btn btn-warning btn-sm edit-record-btn" data-url="' + editUrl + '"><i class="bi bi-pencil"></i></a>' +
+                        '<a href="' + deleteUrl + '" class="btn btn-danger btn-sm delete-record-btn"><i class="bi bi-trash"></i></a>' +
+                        '</div>';
+                }
+            });
+
+            window.initGrid(table, { data: rows, columns: columns });
+        };
+
+        // Tab switching for subgrids - use Bootstrap's shown.bs.tab event
+        $(document).on('shown.bs.tab', '.nav-tabs .nav-link', function(e) {
+            const targetId = e.target.dataset.bsTarget || e.target.getAttribute('href');
+            const targetPane = document.querySelector(targetId);
+
+            if (targetPane && targetPane.dataset.subgridEntity) {
+                if (targetPane.dataset.loaded === 'true') {
+                    window.syncSubgrid(targetPane);
+                } else {
+                    window.loadSubgridData(targetPane);
+                }
+            }
+        });
+
+        $(document).on('click', '.refresh-subgrid-btn', function(e) {
+            e.preventDefault();
+            const pane = this.closest('.tab-pane');
+            if (pane.dataset.loaded === 'true') {
+                window.syncSubgrid(pane);
+            } else {
+                window.loadSubgridData(pane);
+            }
+        });
+
+        $(document).on('click', '.add-subgrid-btn', function(e) {
+            e.preventDefault();
+            const subgridEntity = $(this).data('subgrid-entity');
+            const parentId = $(this).data('parent-id');
+            const url = '/admin/' + subgridEntity + '/add-form/' + parentId + '?parent_entity=' + window.tabgridEntity;
+
+            const modal = $('#exampleModal');
+            modal.find('.modal-body').html('<div class="text-center py-5"><div class="spinner-border text-primary" role="status"></div></div>');
+            modal.find('.modal-title').text('New Record');
+            modal.modal('show');
+            $.get(url, function(html) {
+                modal.find('.modal-body').html(html);
+            }).fail(function() {
+                modal.find('.modal-body').html('<div class="alert alert-danger">Error loading form</div>');
+            });
+        });
+
+        // Load the tabs that are already active on page load
+        $('.nav-tabs .nav-link.active').each(function() {
+            const targetId = this.dataset.bsTarget || this.getAttribute('href');
+            const targetPane = document.querySelector(targetId);
+            if (targetPane && targetPane.dataset.subgridEntity && targetPane.dataset.loaded !== 'true') {
+                window.loadSubgridData(targetPane);
+            }
+        });
+    }
+
+    // Live updates: follow changes to this entity and its subgrids made elsewhere
+    function initLiveUpdates(container) {
+        if (!window.EventSource || window.changeFeed) return;
+        const feedEntities = [window.tabgridEntity].concat($('.tab-pane[data-subgrid-entity]').map(function() {
+            return this.dataset.subgridEntity;
+        }).get());
+
+        window.showParentChange = function(message) {
+            $(container).find('.live-change-alert').remove();
+            $(container).prepend('<div class="alert alert-warning live-change-alert">' + message +
+                ' <a href="#" class="alert-link" onclick="window.location.reload(); return false;">Reload</a></div>');
+        };
+
+        window.applyChange = function(change) {
+            if (change.entity === window.tabgridEntity) {
+                const ids = change.ids ? change.ids.map(String) : null;
+                if (change.action === 'delete' && ids) {
+                    const selector = $('#' + window.tabgridEntity + '-select-table');
+                    if ($.fn.DataTable.isDataTable(selector)) {
+                        ids.forEach(function(id) {
+                            selector.DataTable().row($('.select-parent-btn[data-parent-id="' + id + '"]').closest('tr')).remove();
+                        });
+                        selector.DataTable().draw(false);
+                    }
+                }
+                const mine = String(change.user) === container.dataset.userId;
+                if (!mine && window.tabgridSelectedId && (!ids || ids.indexOf(window.tabgridSelectedId) >= 0)) {
+                    window.showParentChange(change.action === 'delete' ? 'This record was deleted by another user.' : 'This record was changed by another user.');
+                }
+                return;
+            }
+            // Hidden tabs catch up when they are shown again
+            $('.tab-pane.active[data-subgrid-entity="' + change.entity + '"][data-loaded="true"]').each(function() {
+                window.applySubgridChange(this, change);
+            });
+        };
+
+        window.changeFeed = new EventSource('/admin/events?entities=' + encodeURIComponent(feedEntities.join(',')));
+        window.changeFeed.addEventListener('change', function(e) {
+            window.applyChange(JSON.parse(e.data));
+        });
+        window.changeFeed.addEventListener('reset', function() {
+            $('.tab-pane.active[data-subgrid-entity][data-loaded="true"]').each(function() {
+                window.syncSubgrid(this);
+            });
+        });
+    }
+
+    function initTabgrid(container) {
+        const entity = container.dataset.entity;
+        window.tabgridEntity = entity;
+        window.tabgridSelectedId = container.dataset.selectedParentId;
+
+        const selector = $('#' + entity + '-select-table');
+        if (selector.length && !$.fn.DataTable.isDataTable(selector)) {
+            window.initGrid(selector, { order: [[1, 'asc']] });
+        }
+
+        $(document).on('click', '.select-parent-btn', function(e) {
+            e.preventDefault();
+            e.stopPropagation();
+            $('#' + entity + '-select-parent-modal').modal('hide');
+            window.location.href = '/admin/' + entity + '?id=' + $(this).data('parent-id');
+        });
+
+        initRecordPatching();
+        if (container.querySelector('.tab-pane[data-subgrid-entity]')) {
+            initSubgrids();
+        }
+        if (container.dataset.live === '1') {
+            initLiveUpdates(container);
+        }
+
+        // Open the tab named in the URL (?tab=<entity>)
+        const tabParam = new URLSearchParams(window.location.search).get('tab');
+        if (tabParam) {
+            const tabLink = document.querySelector('[href="#tab-' + tabParam + '"]');
+            const targetPane = document.querySelector('#tab-' + tabParam);
+            if (tabLink && targetPane) {
+                $(tabLink).tab('show');
+                if (targetPane.dataset.subgridEntity && targetPane.dataset.loaded !== 'true') {
+                    setTimeout(function() {
+                        window.loadSubgridData(targetPane);
+                    }, 100);
+                }
+            }
+        }
+    }
+
+    $(function() {
+        const container = document.querySelector('.tabgrid-container');
+        if (container) {
+            initTabgrid(container);
+        }
+        $('table[data-dashboard-grid]').each(function() {
+            const table = $(this);
+            if (!$.fn.DataTable.isDataTable(table)) {
+                window.initGrid(table, { pageLength: 25, order: [[0, 'asc']] });
+            }
+        });
+    });
+})();
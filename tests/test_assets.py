@@ -0,0 +1,147 @@
+import json
+import re
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "css, expected",
+    [
+        (
+            'url("fonts/bootstrap-icons.woff2?dd67030")',
+            'url("/static/vendor/fonts/bootstrap-icons.woff2?dd67030")',
+        ),
+        ("url(../img/bg.png)", "url(/static/img/bg.png)"),
+        ("url( 'data:image/png;base64,AA' )", "url( 'data:image/png;base64,AA' )"),
+        ("url(https://example.com/a.png)", "url(https://example.com/a.png)"),
+        ("url(/static/x.png)", "url(/static/x.png)"),
+    ],
+)
+def test_css_urls_point_at_the_static_folder(app, css, expected):
+    from engine.bundle import rebase_css_urls
+
+    assert rebase_css_urls(css, "vendor") == expected
+
+
+def test_bundled_font_is_served(app, client, tmp_path, monkeypatch):
+    from engine.bundle import build_assets
+
+    root = tmp_path / "public"
+    (root / "vendor/fonts").mkdir(parents=True)
+    (root / "vendor/fonts/icons.woff2").write_bytes(b"font")
+    (root / "vendor/icons.css").write_text('@font-face{src:url("./fonts/icons.woff2")}')
+    (root / "vendor/bootstrap.min.css").write_text("body{margin:0}")
+    monkeypatch.setattr("engine.bundle.BUNDLES", {"vendor.css": ["vendor/icons.css"]})
+
+    manifest = build_assets(root, download=False, log=lambda *_: None)
+    css = (root / manifest["files"]["vendor.css"]).read_text()
+
+    assert 'url("/static/vendor/fonts/icons.woff2")' in css
+    monkeypatch.setattr(app, "static_folder", str(root))
+    assert client.get("/static/vendor/fonts/icons.woff2").data == b"font"
+
+
+def test_new_projects_get_the_pinned_vendor_files(project):
+    from pywebgen.assets import file_sha256, load_manifest
+
+    for name, entry in load_manifest().items():
+        assert file_sha256(project / "resources/public/vendor" / name) == entry["sha256"]
+
+
+def test_vendor_file_failing_its_hash_is_not_installed(tmp_path, monkeypatch):
+    import shutil
+
+    from pywebgen import assets
+
+    shipped = tmp_path / "shipped"
+    shutil.copytree(assets.VENDOR_ROOT, shipped)
+    (shipped / "jszip.min.js").write_text("tampered")
+    monkeypatch.setattr(assets, "VENDOR_ROOT", shipped)
+
+    problems = assets.install_vendor_assets(tmp_path / "demo")
+
+    assert problems == ["jszip.min.js: packaged copy does not match its pinned hash"]
+    vendor = tmp_path / "demo/resources/public/vendor"
+    assert not (vendor / "jszip.min.js").exists()
+    assert (vendor / "pdfmake.min.js").is_file()
+
+
+def test_pages_link_the_installed_vendor_files(client):
+    from engine.bundle import BUNDLES
+
+    html = client.get("/admin/cars/").get_data(as_text=True)
+
+    for bundle in ("vendor.js", "vendor.css", "grid.js", "grid.css"):
+        for path in BUNDLES[bundle]:
+            assert f'"/static/{path}"' in html
+    assert '"default": "/static/vendor/bootstrap.min.css"' in html
+    assert "cdn." not in html
+
+
+def test_pages_fall_back_to_the_cdn_for_missing_vendor_files(app, client, tmp_path, monkeypatch):
+    import shutil
+
+    from engine.bundle import VENDOR_FILES
+
+    shutil.copytree(app.static_folder, tmp_path / "public", ignore=shutil.ignore_patterns("vendor"))
+    monkeypatch.setattr(app, "static_folder", str(tmp_path / "public"))
+
+    html = client.get("/admin/cars/").get_data(as_text=True)
+
+    assert VENDOR_FILES["vendor/jquery.dataTables.min.js"] in html
+    assert VENDOR_FILES["vendor/bootstrap.min.css"] in html
+
+
+def test_downloads_failing_their_hash_are_refused(app, tmp_path, monkeypatch):
+    import io
+
+    from engine import bundle
+
+    monkeypatch.setattr(bundle, "urlopen", lambda url, timeout: io.BytesIO(b"not jquery"))
+    monkeypatch.setattr(
+        bundle, "VENDOR_FILES", {"vendor/jquery-3.7.1.min.js": "https://example.com/j.js"}
+    )
+
+    with pytest.raises(bundle.AssetBuildError, match="pinned SHA-256"):
+        bundle.fetch_vendor_files(tmp_path, [], log=lambda *_: None)
+    assert not (tmp_path / "vendor/jquery-3.7.1.min.js").exists()
+
+
+def test_tabgrid_script_is_a_hashed_immutable_asset(app, client):
+    from pathlib import Path
+
+    html = client.get("/admin/cars/").get_data(as_text=True)
+    src = re.search(r'<script src="(/assets/js/tabgrid\.[0-9a-f]{12}\.js)" defer></script>', html)
+    assert src and "renderSubgridTable" not in html
+    assert 'class="tabgrid-container" data-entity="cars"' in html
+
+    response = client.get(src.group(1))
+    assert response.status_code == 200
+    assert response.data == (Path(app.static_folder) / "js/tabgrid.js").read_bytes()
+    assert response.cache_control.immutable and response.cache_control.max_age == 31536000
+
+    stale = client.get("/assets/js/tabgrid.000000000000.js")
+    assert stale.status_code == 200 and not stale.cache_control.immutable
+
+
+def test_export_libraries_load_on_first_click(client):
+    html = client.get("/admin/cars/").get_data(as_text=True)
+
+    scripts = re.findall(r'<script src="([^"]+)"', html)
+    assert any("dataTables" in src for src in scripts)
+    assert not any("jszip" in src or "pdfmake" in src or "vfs_fonts" in src for src in scripts)
+    export_libs = json.loads(re.search(r"var EXPORT_LIBS = (\{[^}]*\})", html).group(1))
+    assert export_libs == {
+        "excel": ["/static/vendor/jszip.min.js"],
+        "pdf": ["/static/vendor/pdfmake.min.js", "/static/vendor/vfs_fonts.js"],
+    }
+
+
+@pytest.mark.parametrize("path", ["/home", "/login"])
+def test_pages_without_grids_skip_datatables(app, client, path):
+    page_client = client if path == "/home" else app.test_client()
+    response = page_client.get(path)
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "dataTables" not in html and "EXPORT_LIBS" not in html
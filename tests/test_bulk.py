@@ -0,0 +1,115 @@
+import dataclasses
+import io
+
+import pytest
+
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+
+
+@pytest.fixture
+def email_required(monkeypatch):
+    from engine import EntityConfigManager
+
+    cfg = EntityConfigManager.get("contactos")
+    fields = tuple(
+        dataclasses.replace(f, required=True) if f.id == "email" else f for f in cfg.fields
+    )
+    patched = dataclasses.replace(cfg, fields=fields)
+    monkeypatch.setitem(EntityConfigManager._configs, "contactos", patched)
+
+
+def count_contactos(name: str) -> int:
+    return query("SELECT COUNT(*) FROM contactos WHERE name = :name", name=name)[0][0]
+
+
+def test_import_inserts_rows(ctx):
+    from engine.bulk import import_csv
+
+    result = import_csv("contactos", io.StringIO("name,email\nImported,imported@example.com\n"))
+
+    assert (result.inserted, result.rejected) == (1, 0)
+    assert count_contactos("Imported") == 1
+
+
+def test_import_rejects_file_without_required_column(ctx, email_required):
+    from engine.bulk import import_csv
+
+    result = import_csv("contactos", io.StringIO("name\nNo Email\n"))
+
+    assert result.inserted == 0
+    assert result.errors == [{"line": 0, "error": "Missing required column(s): Email"}]
+    assert count_contactos("No Email") == 0
+
+
+def test_import_rejects_empty_required_value(ctx, email_required):
+    from engine.bulk import import_csv
+
+    result = import_csv("contactos", io.StringIO("name,email\nBlank Email,\n"))
+
+    assert (result.inserted, result.rejected) == (0, 1)
+    assert result.errors[0]["line"] == 2
+
+
+def test_import_route_streams_progress_and_links_rejected_rows(client, email_required, settings):
+    import json
+
+    settings("import.batch_size", 1)
+    csv = "name,email\nStreamed A,a@example.com\nStreamed B,\nStreamed C,c@example.com\n"
+
+    response = client.post(
+        "/admin/contactos/import",
+        data={"file": (io.BytesIO(csv.encode()), "contactos.csv")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.mimetype == "application/x-ndjson"
+    *progress, result = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert progress[-1] == {"inserted": 2, "rejected": 1}
+    assert len(progress) >= 2
+    assert (result["ok"], result["done"]) == (True, True)
+    assert (result["inserted"], result["rejected"]) == (2, 1)
+    assert result["errors"][0]["line"] == 3
+    rejected = client.get(result["error_file"]).get_data(as_text=True)
+    assert "Streamed B" in rejected
+
+
+def add(client, entity: str, **data) -> int:
+    response = client.post(f"/admin/{entity}/save", data=data, headers=XHR)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()["id"]
+
+
+def query(sql: str, **params) -> list:
+    from sqlalchemy import text
+
+    from models import db
+
+    return db.session.execute(text(sql), params).all()
+
+
+def test_bulk_update_without_version_column(client, ctx):
+    ids = [add(client, "contactos", name=f"Bulk {n}") for n in range(3)]
+
+    payload = {"ids": ids[:2], "values": {"phone": "555"}}
+    response = client.post("/admin/contactos/bulk-update", json=payload)
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json() == {"ok": True, "updated": 2}
+    phones = query("SELECT id, phone FROM contactos WHERE name LIKE 'Bulk %' ORDER BY id")
+    assert [phone for _, phone in phones] == ["555", "555", None]
+
+
+def test_bulk_update_bumps_version_column(client, ctx):
+    parent = add(client, "contactos", name="Car Owner")
+    ids = [
+        add(client, "cars", company="Acme", model=f"M{n}", year="2020", contacto_id=str(parent))
+        for n in range(2)
+    ]
+    before = dict(query("SELECT id, row_version FROM cars WHERE contacto_id = :p", p=parent))
+
+    response = client.post("/admin/cars/bulk-update", json={"ids": ids, "values": {"year": "2021"}})
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    after = query("SELECT id, year, row_version FROM cars WHERE contacto_id = :p", p=parent)
+    assert {row.year for row in after} == {2021}
+    assert all(row.row_version > before[row.id] for row in after)
@@ -0,0 +1,65 @@
+import dataclasses
+
+import pytest
+
+
+def entity_config(**overrides):
+    from engine import EntityConfig
+
+    data = {
+        "entity": "things",
+        "title": "Things",
+        "table": "things",
+        "fields": [
+            {"id": "id", "label": "ID", "type": "hidden"},
+            {"id": "name", "label": "Name"},
+            {"id": "secret", "label": "Secret", "type": "password"},
+            {"id": "notes", "label": "Notes", "hidden_in_grid": True},
+            {"id": "total", "label": "Total", "grid_only": True},
+            {"id": "internal", "label": "Internal", "hidden_in_form": True},
+            {
+                "id": "status",
+                "label": "Status",
+                "type": "select",
+                "options": [{"value": "A", "label": "Active"}, {"value": 0, "label": "Off"}],
+            },
+        ],
+        **overrides,
+    }
+    return EntityConfig.from_dict(data)
+
+
+def ids(fields) -> list:
+    return [f.id for f in fields]
+
+
+def test_field_views_are_computed_at_load(app):
+    cfg = entity_config()
+
+    assert ids(cfg.get_display_fields()) == ["name", "total", "internal", "status"]
+    assert ids(cfg.get_form_fields()) == ["id", "name", "secret", "notes", "status"]
+    assert cfg.get_display_fields() is cfg.display_fields
+    assert cfg.field_map["status"].option_labels == {"A": "Active", "0": "Off"}
+    assert cfg.schema["field_options"] == {"status": {"A": "Active", "0": "Off"}}
+
+
+def test_display_fields_are_capped_at_eight(app):
+    fields = [{"id": f"f{i}", "label": f"F{i}"} for i in range(12)]
+
+    assert ids(entity_config(fields=fields).display_fields) == [f"f{i}" for i in range(8)]
+
+
+def test_entity_metadata_is_frozen_and_slotted(app):
+    cfg = entity_config()
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cfg.title = "Changed"
+    assert not hasattr(cfg, "__dict__") and not hasattr(cfg.fields[0], "__dict__")
+
+
+def test_schema_version_follows_the_grid_schema(app):
+    relabelled = [{"id": "name", "label": "Renamed"}]
+
+    assert entity_config().schema_version == entity_config().schema_version
+    assert entity_config(title="Other").schema_version == entity_config().schema_version
+    assert entity_config(fields=relabelled).schema_version != entity_config().schema_version
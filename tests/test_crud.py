@@ -0,0 +1,133 @@
+import json
+import re
+
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+
+
+def test_saved_user_json_has_no_password(client):
+    response = client.post(
+        "/admin/users/save",
+        data={
+            "username": "json",
+            "firstname": "<b>Json</b>",
+            "email": "json@example.com",
+            "level": "A",
+            "active": "T",
+        },
+        headers=XHR,
+    )
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    data = response.get_json()
+    assert data["row"]["username"] == "json"
+    assert "password" not in data["row"]
+    assert "password" not in data["selector_row"]
+
+
+def test_selector_row_renders_like_the_list(client):
+    response = client.post(
+        "/admin/users/save",
+        data={"username": "row", "firstname": "<b>Row</b>", "level": "A", "active": "T"},
+        headers=XHR,
+    )
+
+    row = response.get_json()["selector_row"]
+    assert row.startswith("<tr>") and f'data-parent-id="{response.get_json()["id"]}"' in row
+    assert "<td>Administrator</td>" in row
+    assert "&lt;b&gt;Row&lt;/b&gt;" in row
+
+
+def test_subgrid_rows_drop_password_columns(client):
+    data = client.get("/admin/subgrid", query_string={"entity": "users"}).get_json()
+
+    assert data["rows"] and all("password" not in row for row in data["rows"])
+
+
+def columnar_users(client) -> dict:
+    query = {"entity": "users", "format": "columns"}
+    return client.get("/admin/subgrid", query_string=query).get_json()
+
+
+def test_columnar_rows_drop_password_columns(client):
+    data = columnar_users(client)
+
+    assert data["data"] and "password" not in data["columns"]
+
+
+def test_columnar_select_leaves_out_sensitive_display_fields(client, monkeypatch):
+    import dataclasses
+
+    from engine import EntityConfigManager
+
+    cfg = EntityConfigManager.get("users")
+    password = dataclasses.replace(cfg.fields[1], id="password", label="Password")
+    fields = (cfg.fields[0], password) + cfg.fields[1:]
+    patched = dataclasses.replace(cfg, fields=fields)
+    monkeypatch.setitem(EntityConfigManager._configs, "users", patched)
+    monkeypatch.setitem(EntityConfigManager._hooks, "users", {})
+
+    data = columnar_users(client)
+
+    assert "password" in [f.id for f in EntityConfigManager.get("users").display_fields]
+    assert data["columns"][0] == "id" and "password" not in data["columns"]
+
+
+def test_after_load_columns_hook_edits_columnar_rows(client, monkeypatch):
+    from engine import EntityConfigManager
+
+    seen = []
+
+    def after_load_columns(payload):
+        seen.append(payload)
+        index = payload["columns"].index("username")
+        payload["data"] = [
+            [*row[:index], row[index].upper(), *row[index + 1:]] for row in payload["data"]
+        ]
+        return payload
+
+    def after_load(rows):
+        raise AssertionError("after_load_columns should replace the row-dict hook")
+
+    hooks = {"after_load": after_load, "after_load_columns": after_load_columns}
+    monkeypatch.setitem(EntityConfigManager._hooks, "users", hooks)
+
+    data = columnar_users(client)
+
+    assert len(seen) == 1 and "password" not in data["columns"]
+    usernames = [row[data["columns"].index("username")] for row in data["data"]]
+    assert usernames and all(name == name.upper() for name in usernames)
+
+
+def test_saved_row_matches_its_subgrid_row(client, monkeypatch):
+    from engine import EntityConfigManager
+
+    def after_load(rows):
+        return [{**row, "label": row["name"].upper()} for row in rows]
+
+    monkeypatch.setitem(EntityConfigManager._hooks, "contactos", {"after_load": after_load})
+    saved = client.post("/admin/contactos/save", data={"name": "Compared"}, headers=XHR).get_json()
+
+    rows = client.get("/admin/subgrid", query_string={"entity": "contactos"}).get_json()["rows"]
+    listed = next(row for row in rows if row["id"] == saved["id"])
+    assert saved["row"] == listed
+    assert listed["label"] == "COMPARED"
+
+
+def test_active_subgrid_rows_are_embedded_in_the_page(client):
+    contacto = client.post("/admin/contactos/save", data={"name": "Embedded"}, headers=XHR)
+    parent = contacto.get_json()["id"]
+    car = {"company": "Acme", "model": "<b>Inline</b>", "year": "2020", "contacto_id": str(parent)}
+    car_id = client.post("/admin/cars/save", data=car, headers=XHR).get_json()["id"]
+
+    query = {"id": parent, "tab": "cars"}
+    page = client.get("/admin/contactos/", query_string=query).get_data(as_text=True)
+    pattern = r'<script type="application/json" class="subgrid-data">(.*?)</script>'
+    embedded = re.search(pattern, page)
+    assert embedded and "<b>" not in embedded.group(1)
+    data = json.loads(embedded.group(1))
+    columns = data["columns"]
+    rows = [(row[columns.index("id")], row[columns.index("model")]) for row in data["data"]]
+    assert rows == [(car_id, "<b>Inline</b>")] and "fields" in data
+
+    page = client.get("/admin/contactos/", query_string={"id": parent}).get_data(as_text=True)
+    assert 'class="subgrid-data"' not in page
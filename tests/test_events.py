@@ -0,0 +1,50 @@
+import json
+
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+
+
+def test_change_feed_is_off_by_default(client):
+    assert client.get("/admin/events?entities=contactos").status_code == 404
+    assert 'data-live="0"' in client.get("/admin/contactos/").get_data(as_text=True)
+
+
+def test_change_feed_can_be_enabled(client, settings):
+    settings("events.enabled", True)
+
+    assert 'data-live="1"' in client.get("/admin/contactos/").get_data(as_text=True)
+
+
+def read_frame(frames) -> dict:
+    """Next SSE frame of a streamed response, as {field: value}."""
+    frame = next(frames)
+    frame = frame.decode() if isinstance(frame, bytes) else frame
+    fields = {}
+    for line in frame.strip().splitlines():
+        name, _, value = line.partition(":")
+        fields[name] = value.strip()
+    return fields
+
+
+def test_saved_records_reach_the_change_feed(client, settings):
+    settings("events.enabled", True)
+    settings("events.poll_interval", 0.05)
+    settings("events.keepalive", 0.05)
+    response = client.get("/admin/events", query_string={"entities": "contactos"})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    frames = iter(response.response)
+
+    assert read_frame(frames) == {"retry": "3000"}
+    # The stream takes its starting position once the client is listening
+    assert read_frame(frames) == {"": "keepalive"}
+
+    saved = client.post("/admin/contactos/save", data={"name": "Live"}, headers=XHR).get_json()
+    frame = read_frame(frames)
+    while frame.get("event") != "change":
+        frame = read_frame(frames)
+    response.close()
+
+    event = json.loads(frame["data"])
+    assert frame["id"] == str(event["id"])
+    assert event["entity"] == "contactos" and event["action"] == "save"
+    assert event["ids"] == [saved["id"]] and isinstance(event["user"], int)
@@ -0,0 +1,87 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Hello {name}",
+        "{count} of {total} rows",
+        "{count:>5}|{ratio:.1%}|{name!r}",
+        "{user.name} {items[0]}",
+        "{{literal}} {name}",
+        "{count:{width}}",
+    ],
+)
+def test_render_matches_format_map(app, text):
+    from i18n import compile_entry, render
+
+    class User:
+        name = "Ana"
+
+    values = {
+        "name": "Ana",
+        "count": 3,
+        "total": 10,
+        "ratio": 0.25,
+        "user": User(),
+        "items": ["x"],
+        "width": 4,
+    }
+    _, parts = compile_entry(text)
+
+    assert render(parts, values) == text.format_map(values)
+
+
+def test_text_without_fields_is_not_parsed(app):
+    from i18n import compile_entry
+
+    assert compile_entry("Plain {{text}}") == ("Plain {{text}}", None)
+
+
+def test_translate_formats_and_falls_back(app, monkeypatch):
+    from i18n import I18N, compile_entry
+
+    texts = {"greet": "Hi {name}", "raw": "{{x}}"}
+    table = {key: compile_entry(text) for key, text in texts.items()}
+    monkeypatch.setitem(I18N._translations, "xx", table)
+
+    assert I18N.translate("greet", locale="xx", name="Ana") == "Hi Ana"
+    assert I18N.translate("greet", locale="xx") == "Hi {name}"
+    assert I18N.translate("greet", locale="xx", other=1) == "Hi {name}"
+    assert I18N.translate("raw", locale="xx", x=1) == "{{x}}"
+
+
+def test_missing_keys_are_capped(app, monkeypatch):
+    import i18n
+    from i18n import I18N
+
+    monkeypatch.setattr(i18n, "MAX_MISSING_KEYS", 5)
+    monkeypatch.setitem(I18N._translations, "xx", {})
+    monkeypatch.setitem(I18N._missing, "xx", set())
+
+    for n in range(20):
+        assert I18N.translate(f"status.{n}", locale="xx") == f"status.{n}"
+
+    assert len(I18N._missing["xx"]) == 5
+
+
+def test_datatables_language_comes_from_grid_keys(app):
+    from i18n import I18N
+
+    language = I18N.datatables_language("es")
+
+    assert language["search"] == "Buscar:"
+    assert language["paginate"]["last"] == "Último"
+    assert language["aria"]["sortAscending"] == ": activar para ordenar la columna ascendente"
+    assert I18N.datatables_language("es") is language
+    assert I18N.datatables_language("en")["search"] == "Search:"
+
+
+def test_grid_pages_embed_the_language_without_fetching_it(app, client):
+    from pathlib import Path
+
+    html = client.get("/admin/cars/").get_data(as_text=True)
+
+    assert "GRID_LANGUAGE = {" in html
+    assert "plug-ins" not in html
+    assert "plug-ins" not in (Path(app.static_folder) / "js/tabgrid.js").read_text()
@@ -0,0 +1,30 @@
+import dataclasses
+
+
+def menu_hrefs(menu: dict) -> set:
+    items = menu["nav_links"] + [item for items in menu["dropdowns"].values() for item in items]
+    return {item["href"] for item in items}
+
+
+def test_menu_is_built_once_per_level_and_locale(ctx):
+    from menu import get_cached_menu
+
+    assert get_cached_menu("A", "en") is get_cached_menu("A", "en")
+    assert get_cached_menu("A", "en") is not get_cached_menu("A", "es")
+    assert get_cached_menu("A", "en") is not get_cached_menu("U", "en")
+
+
+def test_menu_follows_rights_and_config_reloads(ctx, monkeypatch):
+    from engine import EntityConfigManager
+    from menu import get_cached_menu
+
+    assert "/admin/contactos/" in menu_hrefs(get_cached_menu("A", "en"))
+
+    # A reload that takes the entity away from level A rebuilds the cached menu
+    cfg = EntityConfigManager.get("contactos")
+    configs = {**EntityConfigManager._configs, "contactos": dataclasses.replace(cfg, rights=["S"])}
+    monkeypatch.setattr(EntityConfigManager, "_configs", configs)
+    monkeypatch.setattr(EntityConfigManager, "_version", EntityConfigManager.get_version() + 1)
+
+    assert "/admin/contactos/" not in menu_hrefs(get_cached_menu("A", "en"))
+    assert "/admin/contactos/" in menu_hrefs(get_cached_menu("S", "en"))
@@ -0,0 +1,26 @@
+import importlib.util
+
+
+def load_manage(project):
+    spec = importlib.util.spec_from_file_location("demo_manage", project / "manage.py")
+    manage = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(manage)
+    return manage
+
+
+def test_postgres_serial_keys_become_integer_columns(project, tmp_path, monkeypatch):
+    manage = load_manage(project)
+    (tmp_path / "models.py").write_text("@login_manager.user_loader\n")
+    extra = tmp_path / "900-events.postgresql.up.sql"
+    extra.write_text("CREATE TABLE events (\n  id BIGSERIAL PRIMARY KEY,\n  name TEXT\n);")
+    migrations = sorted((project / "resources/migrations").glob("*.postgresql.up.sql")) + [extra]
+    monkeypatch.chdir(tmp_path)
+
+    manage.generate_models_from_migrations(migrations)
+
+    models = (tmp_path / "models.py").read_text()
+    # users and row_tombstones
+    assert models.count("id = db.Column(db.Integer, primary_key=True)") == 2
+    assert "id = db.Column(db.BigInteger, primary_key=True)" in models
+    assert "name = db.Column(db.String(80), primary_key=True)" in models
+    assert "db.String(255), primary_key=True" not in models
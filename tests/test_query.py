@@ -0,0 +1,36 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("SELECT * FROM cars", "SELECT * FROM cars WHERE a = 1"),
+        ("SELECT * FROM cars ORDER BY id", "SELECT * FROM cars WHERE a = 1 ORDER BY id"),
+        (
+            "SELECT * FROM cars WHERE x = 2 ORDER BY id",
+            "SELECT * FROM cars WHERE x = 2 AND a = 1 ORDER BY id",
+        ),
+        (
+            "SELECT *\nFROM cars\nWHERE x = 2\nORDER BY id",
+            "SELECT *\nFROM cars\nWHERE x = 2 AND a = 1 ORDER BY id",
+        ),
+        (
+            "select * from cars where x = 2 order\n  by id",
+            "select * from cars where x = 2 AND a = 1 order\n  by id",
+        ),
+        ("SELECT * FROM nowhere_else", "SELECT * FROM nowhere_else WHERE a = 1"),
+    ],
+)
+def test_filter_query(app, query, expected):
+    from engine.query import filter_query
+
+    assert filter_query(query, ["a = 1"]) == expected
+
+
+def test_csv_export_has_header_without_rows(client):
+    response = client.get("/admin/cars/export.csv?parent_id=999999&foreign_key=contacto_id")
+
+    assert response.status_code == 200
+    header = response.get_data(as_text=True).splitlines()
+    assert len(header) == 1
+    assert header[0].split(",")[:2] == ["id", "company"]
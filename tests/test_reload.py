@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def watcher(ctx):
+    from engine.watcher import ReloadWatcher
+
+    watcher = ReloadWatcher()
+    originals = {}
+
+    def edit(path: str, old: str, new: str) -> None:
+        file_path = Path(path)
+        text = originals.setdefault(file_path, file_path.read_text())
+        assert old in text
+        file_path.write_text(text.replace(old, new))
+        touch(file_path)
+
+    yield watcher, edit
+
+    for file_path, text in originals.items():
+        file_path.write_text(text)
+        touch(file_path)
+    watcher.check()
+
+
+def touch(file_path: Path) -> None:
+    # Coarse filesystem clocks could otherwise hide a rewrite within the same tick
+    stamp = file_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(file_path, ns=(stamp, stamp))
+
+
+def test_changed_entity_file_is_swapped_in(watcher):
+    from engine import EntityConfigManager
+
+    watcher, edit = watcher
+    before, version = EntityConfigManager.get("contactos"), EntityConfigManager.get_version()
+
+    edit("resources/entities/contactos.yaml", "title: Contactos", "title: Reloaded")
+    watcher.check()
+
+    assert EntityConfigManager.get("contactos").title == "Reloaded"
+    assert before.title == "Contactos"
+    assert EntityConfigManager.get_version() == version + 1
+
+
+def test_unparsable_entity_file_keeps_the_previous_config(watcher):
+    from engine import EntityConfigManager
+
+    watcher, edit = watcher
+    before, version = EntityConfigManager.get("contactos"), EntityConfigManager.get_version()
+
+    edit("resources/entities/contactos.yaml", "title: Contactos", "title: [Broken")
+    watcher.check()
+
+    assert EntityConfigManager.get("contactos") is before
+    assert EntityConfigManager.get_version() == version
+
+
+def test_changed_translations_are_reloaded(watcher):
+    from i18n import I18N
+
+    watcher, edit = watcher
+    version = I18N.get_version()
+
+    edit("resources/i18n/en.yaml", 'save: "Save"', 'save: "Store"')
+    watcher.check()
+
+    assert I18N.translate("common.save", locale="en") == "Store"
+    assert I18N.get_version() > version
@@ -0,0 +1,57 @@
+import shutil
+
+import pytest
+
+
+@pytest.fixture
+def sources(ctx, tmp_path, monkeypatch):
+    """Copies of the project's entity and locale files, watched by the snapshot module."""
+    from engine import snapshot
+
+    for name in ("entities", "i18n"):
+        shutil.copytree(f"resources/{name}", tmp_path / name)
+    monkeypatch.setattr(snapshot, "ENTITIES_PATH", tmp_path / "entities")
+    monkeypatch.setattr(snapshot, "I18N_PATH", tmp_path / "i18n")
+    return tmp_path
+
+
+def test_snapshot_round_trips_parsed_configs(sources):
+    from engine.snapshot import read_snapshot, write_snapshot
+
+    written = write_snapshot(sources / "config.snapshot")
+
+    assert read_snapshot(sources / "config.snapshot") == written
+    entity_file = str(sources / "entities" / "contactos.yaml")
+    assert written["entities"][entity_file]["entity"] == "contactos"
+    assert set(written["i18n"]) == {"en", "es"}
+
+
+def test_snapshot_is_ignored_once_a_source_changes(sources):
+    from engine.snapshot import read_snapshot, write_snapshot
+
+    write_snapshot(sources / "config.snapshot")
+    entity_file = sources / "entities" / "contactos.yaml"
+    entity_file.write_text(entity_file.read_text().replace("title: Contactos", "title: Edited"))
+
+    assert read_snapshot(sources / "config.snapshot") is None
+
+
+def test_snapshot_from_another_format_is_ignored(sources, monkeypatch):
+    from engine import snapshot
+
+    snapshot.write_snapshot(sources / "config.snapshot")
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FORMAT", snapshot.SNAPSHOT_FORMAT + 1)
+
+    assert snapshot.read_snapshot(sources / "config.snapshot") is None
+
+
+def test_hooks_are_imported_on_first_use(ctx, monkeypatch):
+    from engine import EntityConfigManager
+
+    hooks = {"after_load": "hooks.contactos.after_load"}
+    monkeypatch.setitem(EntityConfigManager._hooks, "contactos", hooks)
+
+    hook = EntityConfigManager.get_hook("contactos", "after_load")
+
+    assert callable(hook) and hook.__module__ == "hooks.contactos"
+    assert hooks["after_load"] is hook
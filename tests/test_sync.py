@@ -0,0 +1,60 @@
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+
+
+def save(client, entity: str, **data) -> int:
+    response = client.post(f"/admin/{entity}/save", data=data, headers=XHR)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()["id"]
+
+
+def subgrid(client, entity: str, parent: int, **params) -> dict:
+    query = {"entity": entity, "parent_id": parent, "foreign_key": "contacto_id", **params}
+    response = client.get("/admin/subgrid", query_string=query)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def test_delta_returns_changed_rows_and_tombstones(client, settings):
+    settings("sync.skew_seconds", 0)
+    parent = save(client, "contactos", name="Sync Owner")
+    kept, changed, deleted = (
+        save(client, "cars", company="Acme", model=model, year="2020", contacto_id=str(parent))
+        for model in ("Kept", "Changed", "Deleted")
+    )
+
+    full = subgrid(client, "cars", parent)
+    assert "delta" not in full
+    assert {row["id"] for row in full["rows"]} == {kept, changed, deleted}
+
+    car = {"company": "Acme", "model": "Changed", "year": "2024", "contacto_id": str(parent)}
+    save(client, "cars", id=str(changed), **car)
+    assert client.get(f"/admin/cars/delete/{deleted}", headers=XHR).status_code == 200
+
+    delta = subgrid(client, "cars", parent, since=full["version"])
+    assert delta["delta"] is True
+    assert [row["id"] for row in delta["rows"]] == [changed]
+    assert delta["rows"][0]["year"] == 2024
+    assert delta["deleted"] == [deleted]
+    assert delta["version"] >= full["version"]
+
+    assert subgrid(client, "cars", parent, since=delta["version"])["rows"] == []
+
+
+def test_since_is_ignored_without_version_column(client):
+    parent = save(client, "contactos", name="Sibling Owner")
+    sibling = save(client, "siblings", name="Only", contacto_id=str(parent))
+
+    data = subgrid(client, "siblings", parent, since=1)
+
+    assert "delta" not in data and "version" not in data
+    assert [row["id"] for row in data["rows"]] == [sibling]
+
+
+def test_expired_since_gets_a_full_reload(client):
+    parent = save(client, "contactos", name="Stale Owner")
+    car = save(client, "cars", company="Acme", model="Old", year="2020", contacto_id=str(parent))
+
+    data = subgrid(client, "cars", parent, since=1)
+
+    assert "delta" not in data
+    assert [row["id"] for row in data["rows"]] == [car]
@@ -0,0 +1,306 @@
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+XHR = {"X-Requested-With": "XMLHttpRequest"}
+DATA = bytes(range(256)) * 10
+
+
+def start(client, size: int = len(DATA)) -> dict:
+    response = client.post("/admin/uploads", json={"filename": "photo.png", "size": size})
+    assert response.status_code == 201, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def put(client, upload_id: str, offset: int, body: bytes):
+    return client.put(f"/admin/uploads/{upload_id}?offset={offset}", data=body)
+
+
+def test_chunked_upload_resumes_from_the_stored_offset(client, settings):
+    settings("chunked_uploads.chunk_mb", 1024 / (1024 * 1024))
+    upload = start(client)
+    assert (upload["offset"], upload["chunk_size"]) == (0, 1024)
+
+    assert put(client, upload["id"], 0, DATA[:1024]).get_json()["offset"] == 1024
+
+    # The client lost track after the first chunk and asks where to resume
+    status = client.get(f"/admin/uploads/{upload['id']}").get_json()
+    assert (status["offset"], status["complete"]) == (1024, False)
+
+    offset = status["offset"]
+    while offset < len(DATA):
+        response = put(client, upload["id"], offset, DATA[offset:offset + 1024])
+        assert response.status_code == 200, response.get_data(as_text=True)
+        offset = response.get_json()["offset"]
+    assert response.get_json()["complete"] is True
+
+    data = {"name": "Chunked", "imagen": f"upload:{upload['id']}"}
+    saved = client.post("/admin/contactos/save", data=data, headers=XHR)
+    assert saved.status_code == 200, saved.get_data(as_text=True)
+    url = saved.get_json()["row"]["imagen"]
+    assert url.startswith("/uploads/contactos_") and "?v=" in url
+    assert client.get(url).data == DATA
+
+
+def test_chunk_at_a_wrong_offset_is_rejected_with_the_stored_one(client, settings):
+    settings("chunked_uploads.chunk_mb", 1024 / (1024 * 1024))
+    upload = start(client)
+    put(client, upload["id"], 0, DATA[:1024])
+
+    for offset in (0, 2048):
+        response = put(client, upload["id"], offset, DATA[offset:offset + 1024])
+        assert response.status_code == 409
+        assert response.get_json()["offset"] == 1024
+
+    assert client.get(f"/admin/uploads/{upload['id']}").get_json()["offset"] == 1024
+
+
+def test_chunk_larger_than_the_chunk_size_is_dropped(client, settings):
+    settings("chunked_uploads.chunk_mb", 1024 / (1024 * 1024))
+    upload = start(client)
+
+    response = put(client, upload["id"], 0, DATA[:1500])
+
+    assert response.status_code == 413
+    assert client.get(f"/admin/uploads/{upload['id']}").get_json()["offset"] == 0
+
+
+def test_uploads_belong_to_their_user(app, client):
+    upload = start(client)
+    other = app.test_client()
+    login = {"username": "user@example.com", "password": "user"}
+    assert other.post("/login", data=login).status_code == 302
+
+    assert other.get(f"/admin/uploads/{upload['id']}").status_code == 404
+    assert put(other, upload["id"], 0, DATA[:10]).status_code == 404
+
+
+def query(sql: str, **params) -> list:
+    from sqlalchemy import text
+
+    from models import db
+
+    return db.session.execute(text(sql), params).all()
+
+
+def refs(digest: str):
+    rows = query("SELECT refs FROM upload_refs WHERE name = :name", name=digest)
+    return rows[0][0] if rows else None
+
+
+def sweep() -> int:
+    """Sweep as if every count had been at zero for longer than the grace period."""
+    from sqlalchemy import text
+
+    from engine.uploads import sweep_unreferenced
+    from models import db
+
+    db.session.execute(text("UPDATE upload_refs SET updated_at = 0"))
+    return sweep_unreferenced()
+
+
+def post_file(client, filename: str, data: bytes, entity: str = "contactos", **fields) -> dict:
+    response = client.post(
+        f"/admin/{entity}/save",
+        data={"name": f"CAS {filename}", **fields, "imagen": (io.BytesIO(data), filename)},
+        headers=XHR,
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def stored_name(saved: dict) -> str:
+    """The file name a saved record holds; its JSON row carries the /uploads URL."""
+    url = saved["row"]["imagen"]
+    assert url.startswith("/uploads/")
+    return url[len("/uploads/"):].split("?")[0]
+
+
+def test_every_payload_links_uploads_with_their_version(client):
+    parent = post_file(client, "owner.png", b"owner")
+    car = post_file(client, "car.png", b"versioned car", "cars", contacto_id=parent["id"])
+    url = car["row"]["imagen"]
+    assert "?v=" in url
+
+    query = {"entity": "cars", "parent_id": parent["id"], "foreign_key": "contacto_id"}
+    rows = client.get("/admin/subgrid", query_string=query).get_json()["rows"]
+    columnar = client.get("/admin/subgrid", query_string={**query, "format": "columns"}).get_json()
+
+    assert [row["imagen"] for row in rows] == [url]
+    assert [row[columnar["columns"].index("imagen")] for row in columnar["data"]] == [url]
+    assert client.get(url).data == b"versioned car"
+
+
+@pytest.fixture
+def content_mode(settings):
+    settings("upload_storage.mode", "content")
+    settings("thumbnails.enabled", False)
+
+
+def test_one_blob_and_one_count_per_digest(client, ctx, content_mode):
+    from engine.uploads import content_path
+
+    data = b"same bytes, two extensions"
+    digest = hashlib.sha256(data).hexdigest()
+    jpg = post_file(client, "a.jpg", data)
+    jpeg = post_file(client, "b.jpeg", data)
+
+    assert (stored_name(jpg), stored_name(jpeg)) == (f"{digest}.jpg", f"{digest}.jpeg")
+    assert os.listdir(os.path.dirname(content_path(digest))) == [digest]
+    assert refs(digest) == 2
+
+    response = client.get(f"/uploads/{digest}.jpeg")
+    assert (response.data, response.mimetype) == (data, "image/jpeg")
+    assert client.get(f"/uploads/{digest}.png").mimetype == "image/png"
+
+    # Dropping the .jpg record leaves the blob to the .jpeg one
+    assert client.get(f"/admin/contactos/delete/{jpg['id']}", headers=XHR).get_json()["success"]
+    assert refs(digest) == 1
+    assert sweep() == 0
+    assert client.get(f"/uploads/{digest}.jpeg").data == data
+
+    assert client.get(f"/admin/contactos/delete/{jpeg['id']}", headers=XHR).get_json()["success"]
+    assert refs(digest) == 0
+    assert sweep() == 1
+    assert refs(digest) is None
+    assert not os.path.exists(content_path(digest))
+    assert client.get(f"/uploads/{digest}.jpeg").status_code == 404
+
+
+def test_sweep_keeps_files_within_the_grace_period(client, ctx, content_mode):
+    from engine.uploads import content_path, sweep_unreferenced
+
+    saved = post_file(client, "grace.png", b"recently released")
+    digest = stored_name(saved).split(".")[0]
+    client.get(f"/admin/contactos/delete/{saved['id']}", headers=XHR)
+
+    assert refs(digest) == 0
+    assert sweep_unreferenced() == 0
+    assert os.path.exists(content_path(digest))
+
+
+def test_bulk_update_moves_references(client, ctx, content_mode):
+    old = [post_file(client, f"old{n}.png", b"old bytes") for n in range(2)]
+    new = post_file(client, "new.png", b"new bytes")
+    old_digest = stored_name(old[0]).split(".")[0]
+    new_digest = stored_name(new).split(".")[0]
+
+    response = client.post(
+        "/admin/contactos/bulk-update",
+        json={"ids": [row["id"] for row in old], "values": {"imagen": stored_name(new)}},
+    )
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert (refs(old_digest), refs(new_digest)) == (0, 3)
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_deleting_a_parent_releases_its_childrens_files(client, ctx, content_mode, bulk):
+    parent = post_file(client, "parent.png", f"parent {bulk}".encode())
+    car = post_file(client, "car.png", f"car {bulk}".encode(), "cars", contacto_id=parent["id"])
+    digests = [stored_name(saved).split(".")[0] for saved in (parent, car)]
+    assert [refs(digest) for digest in digests] == [1, 1]
+
+    if bulk:
+        response = client.post("/admin/contactos/bulk-delete", json={"ids": [parent["id"]]})
+    else:
+        response = client.get(f"/admin/contactos/delete/{parent['id']}", headers=XHR)
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert query("SELECT id FROM contactos WHERE id = :id", id=parent["id"]) == []
+    assert query("SELECT id FROM cars WHERE id = :id", id=car["id"]) == []
+    assert [refs(digest) for digest in digests] == [0, 0]
+
+
+def test_import_acquires_referenced_files(ctx, content_mode):
+    from engine.bulk import import_csv
+
+    digest = hashlib.sha256(b"imported").hexdigest()
+    source = io.StringIO(f"name,imagen\nImport A,{digest}.png\nImport B,{digest}.jpg\nImport C,\n")
+
+    result = import_csv("contactos", source)
+
+    assert result.inserted == 3
+    assert refs(digest) == 2
+
+
+def test_thumbnail_jobs_do_not_share_temp_files(tmp_path, settings):
+    from PIL import Image
+
+    from engine.thumbnails import generate_thumbnails
+
+    settings("thumbnails.sizes", [16, 32])
+    path = tmp_path / "photo.png"
+    Image.new("RGB", (64, 64), "red").save(path)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(generate_thumbnails, [str(path)] * 8))
+
+    assert all(len(written) == 2 for written in results)
+    assert sorted(os.listdir(tmp_path)) == ["photo.16.webp", "photo.32.webp", "photo.png"]
+
+
+def test_uploaded_images_are_served_as_lazy_thumbnails(client):
+    from PIL import Image
+
+    photo = io.BytesIO()
+    Image.new("RGB", (1600, 1200), "red").save(photo, "JPEG")
+    url = post_file(client, "camera.jpg", photo.getvalue())["row"]["imagen"]
+
+    # The thumbnails are written by a background worker
+    deadline = time.monotonic() + 10
+    response = client.get(f"{url}&w=60")
+    while response.mimetype != "image/webp" and time.monotonic() < deadline:
+        time.sleep(0.05)
+        response = client.get(f"{url}&w=60")
+
+    assert response.mimetype == "image/webp" and response.cache_control.immutable
+    with Image.open(io.BytesIO(response.data)) as thumb:
+        assert thumb.size == (120, 90)
+    html = client.get("/admin/contactos/").get_data(as_text=True)
+    assert f'src="{url}&w=60" loading="lazy"' in html
+
+
+@pytest.fixture
+def served(client, ctx, settings):
+    """Versioned URL and on-disk path of a freshly uploaded file."""
+    from engine.uploads import upload_path
+
+    settings("thumbnails.enabled", False)
+    saved = post_file(client, "served.png", DATA)
+    return saved["row"]["imagen"], upload_path(stored_name(saved))
+
+
+def test_app_mode_answers_range_requests(client, served):
+    url, _ = served
+
+    response = client.get(url, headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 100-199/{len(DATA)}"
+    assert response.data == DATA[100:200]
+
+
+@pytest.mark.parametrize(
+    "mode, header",
+    [("x-sendfile", "X-Sendfile"), ("x-accel-redirect", "X-Accel-Redirect")],
+)
+def test_offload_modes_leave_the_bytes_to_the_proxy(client, settings, served, mode, header):
+    url, path = served
+    settings("upload_serving.mode", mode)
+
+    response = client.get(url, headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 200 and response.data == b""
+    assert {name for name, _ in response.headers} & {"X-Sendfile", "X-Accel-Redirect"} == {header}
+    expected = {
+        "x-sendfile": path,
+        "x-accel-redirect": "/protected-uploads/" + os.path.basename(path),
+    }
+    assert response.headers[header] == expected[mode]
+    assert response.cache_control.immutable